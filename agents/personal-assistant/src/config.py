@@ -22,6 +22,9 @@ class Config(BaseSettings):
     agent_instruction: str = "You are a helpful assistant."
     a4s_api_url: str = "http://host.docker.internal:8000"
     agent_host: str = "localhost"
+    agent_port: int = 8000
+    agent_bind_host: str = "0.0.0.0"  # noqa: S104
+    agent_standby: bool = False
 
     google_api_key: SecretStr | None = None
     openai_api_key: SecretStr | None = None
@@ -35,3 +38,9 @@ class Config(BaseSettings):
 
 
 config = Config()
+
+
+def reload_config() -> None:
+    """Re-read settings from the environment into the shared config instance."""
+    for name, value in Config():
+        setattr(config, name, value)
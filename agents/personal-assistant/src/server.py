@@ -2,23 +2,38 @@ import logging
 
 import uvicorn
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
+from starlette.applications import Starlette
 
 from src.agent import create_agent
-from src.config import config
+from src.config import config, reload_config
+from src.standby import StandbyApp
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
+def create_app() -> Starlette:
     logger.info("Starting agent: %s", config.agent_name)
     logger.info("A4S API URL: %s", config.a4s_api_url)
     logger.info("Agent host: %s", config.agent_host)
 
     agent = create_agent()
-    app = to_a2a(agent, host=config.agent_host, port=8000)
+    return to_a2a(agent, host=config.agent_host, port=config.agent_port)
+
+
+def create_configured_app() -> Starlette:
+    reload_config()
+    return create_app()
+
+
+def main() -> None:
+    if config.agent_standby:
+        logger.info("Starting in standby mode, waiting for agent configuration")
+        app = StandbyApp(create_configured_app)
+    else:
+        app = create_app()
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)  # noqa: S104
+    uvicorn.run(app, host=config.agent_bind_host, port=config.agent_port)
 
 
 if __name__ == "__main__":
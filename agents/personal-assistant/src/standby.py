@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Awaitable, Callable, MutableMapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CONFIGURE_PATH = "/_a4s/configure"
+
+type Scope = MutableMapping[str, Any]
+type Message = MutableMapping[str, Any]
+type Receive = Callable[[], Awaitable[Message]]
+type Send = Callable[[Message], Awaitable[None]]
+type ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class _LifespanDriver:
+    """Runs the lifespan protocol of an ASGI app started after server boot."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+        self._to_app: asyncio.Queue[Message] = asyncio.Queue()
+        self._from_app: asyncio.Queue[Message] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    async def startup(self) -> None:
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._task = asyncio.create_task(self._app(scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "lifespan.startup"})
+        message = await self._from_app.get()
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(message.get("message", "Agent app startup failed"))
+
+    async def shutdown(self) -> None:
+        if self._task is None:
+            return
+        await self._to_app.put({"type": "lifespan.shutdown"})
+        await self._from_app.get()
+        await self._task
+
+
+class StandbyApp:
+    """ASGI app for a pre-booted warm pool container.
+
+    The interpreter, ADK and model client imports are paid at boot; until the
+    scheduler claims the container it only answers the configure endpoint.
+    ``POST /_a4s/configure`` carries the agent environment, after which the
+    agent app is built and all traffic is delegated to it.
+
+    Args:
+        app_factory: Builds the agent ASGI app once the environment is applied.
+    """
+
+    def __init__(self, app_factory: Callable[[], ASGIApp]) -> None:
+        self._app_factory = app_factory
+        self._app: ASGIApp | None = None
+        self._lifespan: _LifespanDriver | None = None
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+            return
+        if self._app is not None:
+            await self._app(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if scope["path"] == CONFIGURE_PATH and scope["method"] == "GET":
+            await _send_json(send, 200, {"status": "standby"})
+        elif scope["path"] == CONFIGURE_PATH and scope["method"] == "POST":
+            await self._handle_configure(receive, send)
+        else:
+            await _send_json(send, 503, {"detail": "Agent not configured"})
+
+    async def _handle_configure(self, receive: Receive, send: Send) -> None:
+        try:
+            environment = json.loads(await _read_body(receive))
+            await self._configure({str(k): str(v) for k, v in environment.items()})
+        except Exception as e:
+            logger.exception("Failed to configure standby agent")
+            await _send_json(send, 500, {"detail": str(e)})
+            return
+        await _send_json(send, 200, {"status": "configured"})
+
+    async def _configure(self, environment: dict[str, str]) -> None:
+        async with self._lock:
+            if self._app is not None:
+                raise RuntimeError("Agent already configured")
+            os.environ.update(environment)
+            app = self._app_factory()
+            lifespan = _LifespanDriver(app)
+            await lifespan.startup()
+            self._lifespan = lifespan
+            self._app = app
+            logger.info("Standby container configured as agent %s", environment.get("AGENT_ID", ""))
+
+    async def _handle_lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._lifespan is not None:
+                    await self._lifespan.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+async def _send_json(send: Send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -110,6 +110,36 @@ class QdrantAgentRegistry(AgentRegistry):
             logger.error("Failed to register agent %s: %s", agent.id, e)
             raise AgentRegistryConnectionError(f"Failed to register agent: {e}") from e
 
+    async def update_agent(self, agent: Agent) -> None:
+        """Replace the stored metadata of a registered agent, keeping its point.
+
+        Args:
+            agent: The agent with updated fields; its ID identifies the stored agent.
+
+        Raises:
+            AgentNotRegisteredError: If the agent does not exist.
+            AgentRegistryConnectionError: If the registry is unreachable.
+        """
+        await self._ensure_collection()
+        results, _ = await self._client.scroll(
+            collection_name=self._collection_name,
+            scroll_filter=Filter(must=[FieldCondition(key="id", match=MatchValue(value=agent.id))]),
+            limit=1,
+        )
+        if not results:
+            raise AgentNotRegisteredError(f"Agent {agent.id} not found")
+        try:
+            point = PointStruct(
+                id=results[0].id,
+                vector=self._embed(f"{agent.name} {agent.description}"),
+                payload=self._agent_to_payload(agent),
+            )
+            await self._client.upsert(collection_name=self._collection_name, points=[point])
+            logger.info("Updated agent %s", agent.id)
+        except UnexpectedResponse as e:
+            logger.error("Failed to update agent %s: %s", agent.id, e)
+            raise AgentRegistryConnectionError(f"Failed to update agent: {e}") from e
+
     async def unregister_agent(self, agent_id: str) -> None:
         """Unregister an agent from the registry.
 
@@ -10,6 +10,10 @@ class AgentRegistry(ABC):
     async def register_agent(self, agent: Agent) -> None:
         """Register an agent."""
 
+    @abstractmethod
+    async def update_agent(self, agent: Agent) -> None:
+        """Replace the stored metadata of a registered agent."""
+
     @abstractmethod
     async def unregister_agent(self, agent_id: str) -> None:
         """Unregister an agent."""
@@ -4,17 +4,23 @@ import asyncio
 import json
 import logging
 import sqlite3
+from collections import OrderedDict
 from datetime import UTC, datetime
 
 import aiosqlite
 
 from app.broker.channel_registry import ChannelRegistry
 from app.broker.exceptions import ChannelNotFoundError, ChannelRegistryConnectionError
+from app.metrics import metrics
 from app.models import Channel
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_DB_PATH = "channels.db"
+DEFAULT_CACHE_SIZE = 1024
+
+cache_requests = metrics.counter("channel_cache_requests_total", "Channel reads by cache result (hit or miss)")
+cache_hit_ratio = metrics.gauge("channel_cache_hit_ratio", "Fraction of channel reads served from the cache")
 
 
 def _init_schema_sync(connection: sqlite3.Connection) -> None:
@@ -44,17 +50,28 @@ async def _init_schema(db_path: str) -> None:
 
 
 class SqliteChannelRegistry(ChannelRegistry):
-    """Channel registry using SQLite."""
+    """Channel registry using SQLite.
+
+    Reads go through a bounded in-memory LRU cache that writes keep coherent,
+    so channel metadata is only loaded from the database once.
+    """
 
-    def __init__(self, db: aiosqlite.Connection) -> None:
+    def __init__(self, db: aiosqlite.Connection, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
         self._db = db
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, Channel] = OrderedDict()
+        # Bumped by every write, so a miss whose read raced with one does not cache the row it read
+        self._writes = 0
 
     @classmethod
-    async def create(cls, db_path: str = DEFAULT_DB_PATH) -> SqliteChannelRegistry:
+    async def create(
+        cls, db_path: str = DEFAULT_DB_PATH, cache_size: int = DEFAULT_CACHE_SIZE
+    ) -> SqliteChannelRegistry:
         """Create a new SqliteChannelRegistry instance.
 
         Args:
             db_path: Path to the SQLite database file.
+            cache_size: Maximum number of channels kept in the read cache.
 
         Returns:
             Initialized registry instance.
@@ -67,7 +84,7 @@ class SqliteChannelRegistry(ChannelRegistry):
             db = await aiosqlite.connect(db_path)
             db.row_factory = aiosqlite.Row
             logger.info("Connected to channels database at %s", db_path)
-            return cls(db)
+            return cls(db, cache_size=cache_size)
         except Exception as e:
             logger.exception("Failed to initialize channel registry: %s", e)
             raise ChannelRegistryConnectionError(f"Failed to initialize channel registry: {e}") from e
@@ -83,6 +100,24 @@ class SqliteChannelRegistry(ChannelRegistry):
             "updated_at": channel.updated_at.isoformat(),
         }
 
+    def _cache_get(self, channel_id: str) -> Channel | None:
+        channel = self._cache.get(channel_id)
+        cache_requests.inc(result="hit" if channel is not None else "miss")
+        hits = cache_requests.value(result="hit")
+        cache_hit_ratio.set(hits / (hits + cache_requests.value(result="miss")))
+        if channel is None:
+            return None
+        self._cache.move_to_end(channel_id)
+        return channel.model_copy(deep=True)
+
+    def _cache_put(self, channel: Channel) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[channel.id] = channel.model_copy(deep=True)
+        self._cache.move_to_end(channel.id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     def _row_to_channel(self, row: aiosqlite.Row) -> Channel:
         return Channel(
             id=row["id"],
@@ -105,18 +140,28 @@ class SqliteChannelRegistry(ChannelRegistry):
                 row,
             )
             await self._db.commit()
+            self._cache_put(channel)
+            self._writes += 1
             logger.info("Created channel %s", channel.id)
         except Exception as e:
             logger.exception("Failed to create channel: %s", e)
             raise ChannelRegistryConnectionError(f"Failed to create channel: {e}") from e
 
     async def get_channel(self, channel_id: str) -> Channel:
+        cached = self._cache_get(channel_id)
+        if cached is not None:
+            return cached
+        writes = self._writes
         async with self._db.execute("SELECT * FROM channel WHERE id = ?", (channel_id,)) as cursor:
             row = await cursor.fetchone()
         if not row:
             logger.error("Channel %s not found", channel_id)
             raise ChannelNotFoundError(f"Channel {channel_id} not found")
-        return self._row_to_channel(row)
+        channel = self._row_to_channel(row)
+        # A write that landed during the read has cached a newer version or removed the channel
+        if self._writes == writes:
+            self._cache_put(channel)
+        return channel
 
     async def list_channels(self, offset: int = 0, limit: int = 50) -> list[Channel]:
         async with self._db.execute(
@@ -158,6 +203,8 @@ class SqliteChannelRegistry(ChannelRegistry):
             ),
         )
         await self._db.commit()
+        self._cache_put(channel)
+        self._writes += 1
         logger.info("Updated channel %s", channel_id)
         return channel
 
@@ -165,9 +212,12 @@ class SqliteChannelRegistry(ChannelRegistry):
         await self.get_channel(channel_id)
         await self._db.execute("DELETE FROM channel WHERE id = ?", (channel_id,))
         await self._db.commit()
+        self._cache.pop(channel_id, None)
+        self._writes += 1
         logger.info("Deleted channel %s", channel_id)
 
     async def close(self) -> None:
+        self._cache.clear()
         if self._db:
             await self._db.close()
             logger.info("Closed channel database connection")
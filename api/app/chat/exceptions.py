@@ -0,0 +1,14 @@
+class ChatJobError(Exception):
+    """Base exception for chat job errors."""
+
+
+class ChatJobNotFoundError(ChatJobError):
+    """Chat job not found or already expired."""
+
+
+class ChatJobCapacityError(ChatJobError):
+    """Too many chat jobs are in flight to accept a new one."""
+
+
+class IdempotencyKeyConflictError(Exception):
+    """Idempotency key reused with a different request payload."""
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from app.chat.exceptions import IdempotencyKeyConflictError
+from app.metrics import metrics
+from app.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_MAX_ENTRIES = 1000
+
+idempotent_replays = metrics.counter(
+    "channel_chat_idempotent_replays_total",
+    "Channel chats served from an idempotency key instead of a new fan-out, by source",
+)
+
+
+@dataclass
+class _StoredResult:
+    fingerprint: str
+    result: BaseModel
+    expires_at: float
+
+
+def fingerprint_request(payload: dict) -> str:
+    """Return a stable hash of a request payload.
+
+    Args:
+        payload: JSON-serializable request payload.
+
+    Returns:
+        Hex digest identifying the payload.
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class IdempotencyStore:
+    """Deduplicates requests that carry the same idempotency key.
+
+    Duplicates arriving while the first request is still running attach to its
+    execution; completed results are replayed for ``ttl_seconds`` from a bounded
+    store. Failed executions are not stored, so a retry after an error runs again.
+
+    Args:
+        ttl_seconds: Seconds a completed result is replayed for.
+        max_entries: Maximum number of completed results kept.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._results: OrderedDict[str, _StoredResult] = OrderedDict()
+        self._in_flight_fingerprints: dict[str, str] = {}
+        self._flights = SingleFlight()
+
+    async def run(
+        self, key: str, fingerprint: str, factory: Callable[[], Awaitable[BaseModel]]
+    ) -> tuple[BaseModel, bool]:
+        """Run the request for a key once, replaying or joining duplicates.
+
+        Args:
+            key: Idempotency key, scoped by the caller.
+            fingerprint: Hash of the request payload sent with the key.
+            factory: Callable starting the request; only invoked for new keys.
+
+        Returns:
+            Tuple of (result, whether it was replayed from an earlier request).
+
+        Raises:
+            IdempotencyKeyConflictError: If the key was used with a different payload.
+        """
+        stored = self._lookup(key)
+        if stored is not None:
+            self._check_fingerprint(key, stored.fingerprint, fingerprint)
+            idempotent_replays.inc(source="completed")
+            return stored.result, True
+
+        if self._flights.in_flight(key):
+            self._check_fingerprint(key, self._in_flight_fingerprints.get(key, fingerprint), fingerprint)
+            idempotent_replays.inc(source="in_flight")
+            return await self._flights.do(key, factory), True
+
+        self._in_flight_fingerprints[key] = fingerprint
+        return await self._flights.do(key, lambda: self._execute(key, fingerprint, factory)), False
+
+    async def close(self) -> None:
+        """Cancel requests in flight and drop stored results."""
+        await self._flights.close()
+        self._results.clear()
+        self._in_flight_fingerprints.clear()
+
+    async def _execute(self, key: str, fingerprint: str, factory: Callable[[], Awaitable[BaseModel]]) -> BaseModel:
+        try:
+            result = await factory()
+        finally:
+            self._in_flight_fingerprints.pop(key, None)
+        self._store(key, _StoredResult(fingerprint, result, time.monotonic() + self._ttl_seconds))
+        return result
+
+    def _lookup(self, key: str) -> _StoredResult | None:
+        stored = self._results.get(key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.monotonic():
+            del self._results[key]
+            return None
+        return stored
+
+    def _store(self, key: str, stored: _StoredResult) -> None:
+        self._results[key] = stored
+        self._results.move_to_end(key)
+        while len(self._results) > self._max_entries:
+            self._results.popitem(last=False)
+
+    def _check_fingerprint(self, key: str, expected: str, actual: str) -> None:
+        if expected != actual:
+            logger.warning("Idempotency key %s reused with a different payload", key)
+            raise IdempotencyKeyConflictError("Idempotency key was already used with a different request")
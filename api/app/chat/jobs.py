@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
+
+from pydantic import BaseModel
+
+from app.chat.exceptions import ChatJobCapacityError, ChatJobNotFoundError
+from app.chat.models import ChatJob, ChatJobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_JOBS = 1000
+
+
+@dataclass
+class _JobEntry:
+    job: ChatJob
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+    expires_at: float | None = None
+
+
+class ChatJobStore:
+    """In-memory store for asynchronous channel chat jobs.
+
+    Jobs run as background tasks; finished jobs are kept for ``ttl_seconds`` so
+    clients can collect the result, then expire.
+
+    Args:
+        ttl_seconds: Seconds a finished job is retained before it expires.
+        max_jobs: Maximum number of jobs (running and finished) kept at once.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_jobs: int = DEFAULT_MAX_JOBS) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_jobs = max_jobs
+        self._jobs: OrderedDict[str, _JobEntry] = OrderedDict()
+
+    def submit(self, channel_id: str, work: Coroutine[Any, Any, BaseModel]) -> ChatJob:
+        """Start a chat job in the background.
+
+        Args:
+            channel_id: The channel the chat was sent to.
+            work: Coroutine producing the chat response.
+
+        Returns:
+            The newly created job.
+
+        Raises:
+            ChatJobCapacityError: If the store is full of unfinished jobs.
+        """
+        self._purge_expired()
+        if len(self._jobs) >= self._max_jobs and not self._evict_oldest_finished():
+            work.close()
+            raise ChatJobCapacityError(f"Too many chat jobs in flight (max {self._max_jobs})")
+
+        job = ChatJob(id=str(uuid4()), channel_id=channel_id)
+        entry = _JobEntry(job=job)
+        self._jobs[job.id] = entry
+        entry.task = asyncio.create_task(self._run(entry, work))
+        logger.info("Submitted chat job %s for channel %s", job.id, channel_id)
+        return job.model_copy()
+
+    def get(self, job_id: str) -> ChatJob:
+        """Get a job by ID.
+
+        Args:
+            job_id: The ID of the job.
+
+        Returns:
+            A snapshot of the job.
+
+        Raises:
+            ChatJobNotFoundError: If the job does not exist or has expired.
+        """
+        return self._get_entry(job_id).job.model_copy()
+
+    async def wait(self, job_id: str, wait_seconds: float) -> ChatJob:
+        """Wait up to ``wait_seconds`` seconds for a job to finish (long-poll).
+
+        Args:
+            job_id: The ID of the job.
+            wait_seconds: Maximum number of seconds to wait.
+
+        Returns:
+            A snapshot of the job, finished or not.
+
+        Raises:
+            ChatJobNotFoundError: If the job does not exist or has expired.
+        """
+        entry = self._get_entry(job_id)
+        if wait_seconds > 0 and not entry.job.done:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(entry.done.wait(), timeout=wait_seconds)
+        return entry.job.model_copy()
+
+    async def close(self) -> None:
+        """Cancel unfinished jobs and drop all state."""
+        tasks = [entry.task for entry in self._jobs.values() if entry.task is not None and not entry.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+
+    async def _run(self, entry: _JobEntry, work: Coroutine[Any, Any, BaseModel]) -> None:
+        job = entry.job
+        job.status = ChatJobStatus.RUNNING
+        try:
+            result = await work
+            job.result = result.model_dump(mode="json")
+            job.status = ChatJobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.error = "Job cancelled"
+            job.status = ChatJobStatus.FAILED
+            raise
+        except Exception as e:
+            logger.exception("Chat job %s failed", job.id)
+            job.error = str(e)
+            job.status = ChatJobStatus.FAILED
+        finally:
+            job.completed_at = datetime.now(UTC)
+            entry.expires_at = time.monotonic() + self._ttl_seconds
+            entry.done.set()
+
+    def _get_entry(self, job_id: str) -> _JobEntry:
+        self._purge_expired()
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            raise ChatJobNotFoundError(f"Chat job {job_id} not found")
+        return entry
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, entry in self._jobs.items() if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _evict_oldest_finished(self) -> bool:
+        for job_id, entry in self._jobs.items():
+            if entry.job.done:
+                del self._jobs[job_id]
+                return True
+        return False
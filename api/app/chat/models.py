@@ -0,0 +1,28 @@
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class ChatJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ChatJob(BaseModel):
+    """State of an asynchronous channel chat execution."""
+
+    id: str = Field(description="The unique identifier of the job.")
+    channel_id: str = Field(description="The channel the chat was sent to.")
+    status: ChatJobStatus = Field(default=ChatJobStatus.PENDING, description="Current status of the job.")
+    result: dict[str, Any] | None = Field(default=None, description="Chat response once the job succeeded.")
+    error: str | None = Field(default=None, description="Error message if the job failed.")
+    created_at: datetime = Field(description="Timestamp of job creation.", default_factory=lambda: datetime.now(UTC))
+    completed_at: datetime | None = Field(default=None, description="Timestamp of job completion.")
+
+    @property
+    def done(self) -> bool:
+        return self.status in (ChatJobStatus.SUCCEEDED, ChatJobStatus.FAILED)
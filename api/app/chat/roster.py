@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.broker.exceptions import AgentNotRegisteredError
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from app.broker.registry import AgentRegistry
+    from app.models import Agent, Channel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CHANNELS = 1024
+
+roster_builds = metrics.counter("channel_roster_builds_total", "Channel rosters rebuilt for the backbone prompt")
+
+type RosterStamp = tuple[tuple[str, int], ...]
+
+
+@dataclass
+class _CachedRoster:
+    stamp: RosterStamp
+    roster: str
+
+
+class ChannelRosterCache:
+    """Caches the compact agent roster rendered into the backbone routing prompt.
+
+    Each roster is stored with a stamp of the channel membership and the version
+    of every member; it is rebuilt only when membership changes or a member is
+    re-registered, which callers signal with ``invalidate_agent``.
+
+    Args:
+        registry: Agent registry used to resolve channel members.
+        excluded_agent_ids: Agent IDs never listed in a roster (e.g. the backbone).
+        max_channels: Maximum number of channel rosters kept.
+    """
+
+    def __init__(
+        self,
+        registry: AgentRegistry,
+        excluded_agent_ids: set[str] | None = None,
+        max_channels: int = DEFAULT_MAX_CHANNELS,
+    ) -> None:
+        self._registry = registry
+        self._excluded_agent_ids = excluded_agent_ids or set()
+        self._max_channels = max_channels
+        self._rosters: OrderedDict[str, _CachedRoster] = OrderedDict()
+        self._agent_versions: dict[str, int] = {}
+
+    async def get(self, channel: Channel) -> str:
+        """Return the roster of a channel as compact JSON.
+
+        Args:
+            channel: The channel whose members to list.
+
+        Returns:
+            JSON array of ``{"id", "name", "description"}`` objects.
+        """
+        stamp = self._stamp(channel)
+        cached = self._rosters.get(channel.id)
+        if cached is not None and cached.stamp == stamp:
+            self._rosters.move_to_end(channel.id)
+            return cached.roster
+
+        roster = await self._build(channel)
+        # Membership may have been invalidated while building; only cache a consistent roster.
+        if self._stamp(channel) == stamp:
+            self._rosters[channel.id] = _CachedRoster(stamp=stamp, roster=roster)
+            self._rosters.move_to_end(channel.id)
+            while len(self._rosters) > self._max_channels:
+                self._rosters.popitem(last=False)
+        return roster
+
+    def invalidate_agent(self, agent_id: str) -> None:
+        """Mark an agent as changed so rosters listing it are rebuilt.
+
+        Args:
+            agent_id: The agent that was registered, updated or unregistered.
+        """
+        self._agent_versions[agent_id] = self._agent_versions.get(agent_id, 0) + 1
+
+    def _stamp(self, channel: Channel) -> RosterStamp:
+        return tuple((aid, self._agent_versions.get(aid, 0)) for aid in channel.agent_ids)
+
+    async def _build(self, channel: Channel) -> str:
+        member_ids = [aid for aid in channel.agent_ids if aid not in self._excluded_agent_ids]
+        members = await asyncio.gather(*(self._lookup(aid) for aid in member_ids))
+        roster_builds.inc()
+        return json.dumps(
+            [{"id": a.id, "name": a.name, "description": a.description} for a in members if a is not None],
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+
+    async def _lookup(self, agent_id: str) -> Agent | None:
+        try:
+            return await self._registry.get_agent(agent_id)
+        except AgentNotRegisteredError:
+            logger.debug("Skipping unavailable agent %s", agent_id)
+            return None
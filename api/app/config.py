@@ -25,6 +25,11 @@ class VectorStoreProvider(str, Enum):
     QDRANT = "qdrant"
 
 
+class AgentRuntime(str, Enum):
+    DOCKER = "docker"
+    LOCAL = "local"
+
+
 class Config(BaseSettings):
     # Backend
     cors_origins: list[str] = Field(default_factory=list)
@@ -37,8 +42,50 @@ class Config(BaseSettings):
     backbone_agent_model_id: str = "gemini-3-flash-preview"
 
     # Agent runtime
+    agent_runtime: AgentRuntime = Field(default=AgentRuntime.DOCKER, description="Runtime agents are spawned on")
+    agent_local_command: list[str] = Field(
+        default_factory=list, description="Local agent command (default: src.server)"
+    )
+    agent_local_image_commands: dict[str, list[str]] = Field(
+        default_factory=dict, description="Local agent commands per image, overriding agent_local_command"
+    )
+    agent_local_workdir: str | None = Field(default=None, description="Working directory of local agent processes")
+    agent_local_host: str = Field(default="127.0.0.1", description="Interface local agent processes bind to")
+    agent_local_base_port: int = Field(default=19000, description="First port allocated to local agent processes")
+    agent_local_max_ports: int = Field(default=1000, description="Number of ports allocated to local agents")
     agent_idle_timeout: int = Field(default=300, description="Idle timeout in seconds")
-    agent_reaper_interval: int = Field(default=30, description="Reaper check interval")
+    agent_adaptive_idle_timeout: bool = Field(default=False, description="Adapt idle timeouts to request gaps")
+    agent_idle_timeout_min: int = Field(default=60, description="Lower bound of adaptive idle timeouts in seconds")
+    agent_idle_timeout_max: int = Field(default=1800, description="Upper bound of adaptive idle timeouts in seconds")
+    agent_pause_timeout: int = Field(default=0, description="Idle seconds before pausing an agent (0 disables)")
+    agent_max_request_duration: int = Field(
+        default=600, description="Seconds before a request whose end was never reported stops counting as in flight"
+    )
+    agent_reaper_interval: int = Field(default=30, description="Seconds before the reaper re-checks a deferred agent")
+    agent_reap_concurrency: int = Field(default=16, description="Maximum agents paused or stopped concurrently")
+    agent_state_reconcile_interval: int = Field(default=30, description="Container state cache reconcile interval")
+    agent_warm_pool_size: int = Field(default=0, description="Pre-booted standby containers per image (0 disables)")
+    agent_warm_pool_images: list[str] = Field(default_factory=list, description="Images kept in the warm pool")
+    agent_activity_db_path: str = Field(default="activity.db", description="SQLite file of hourly agent request counts")
+    agent_prewarm_max_agents: int = Field(default=0, description="Agents warmed ahead of predicted demand (0 disables)")
+    agent_prewarm_lead_time: int = Field(default=600, description="Seconds ahead of predicted demand to warm agents")
+    agent_prewarm_threshold: float = Field(default=0.5, description="Fraction of past weeks with activity to warm")
+    agent_max_running: int = Field(default=0, description="Maximum running serverless agents (0 for unlimited)")
+    agent_memory_budget_mb: int = Field(default=0, description="Memory budget of serverless agents in MiB (0 disables)")
+    agent_default_memory_mb: int = Field(default=512, description="MiB accounted for agents without a memory limit")
+    agent_supervise_interval: int = Field(default=30, description="Permanent agent health check interval (0 disables)")
+    agent_cold_start_concurrency: int = Field(default=8, description="Maximum cold starts in progress at once")
+    agent_gateway_enabled: bool = Field(default=False, description="Serve /agents/{id}/ from the API, not nginx")
+    agent_gateway_timeout: float = Field(default=300, description="Seconds the gateway waits for agent data")
+    agent_gateway_max_connections: int = Field(default=1000, description="Maximum gateway connections to agents")
+    agent_gateway_max_keepalive: int = Field(default=200, description="Maximum idle keepalive connections to agents")
+    agent_gateway_keepalive_expiry: float = Field(default=60, description="Seconds idle agent connections are kept")
+
+    # Channel chat jobs
+    chat_job_ttl: int = Field(default=3600, description="Seconds a finished chat job result is retained")
+    chat_job_max_jobs: int = Field(default=1000, description="Maximum number of chat jobs kept in memory")
+    chat_idempotency_ttl: int = Field(default=600, description="Seconds a chat result is replayed for its key")
+    chat_idempotency_max_entries: int = Field(default=1000, description="Maximum number of replayable chat results")
 
     # Qdrant
     qdrant_url: str = "http://localhost:6333"
@@ -52,6 +99,7 @@ class Config(BaseSettings):
 
     # Channels registry
     channel_db_path: str = "channels.db"
+    channel_cache_size: int = Field(default=1024, description="Maximum number of channels kept in the read cache")
 
     # Memory - LLM
     memory_llm_provider: LLMProvider = LLMProvider.OPENAI
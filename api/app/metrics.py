@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted(labels.items()))
+
+
+class Counter:
+    """Monotonically increasing value, optionally split by labels.
+
+    Args:
+        name: Metric name.
+        description: Human-readable description.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self._values: dict[tuple[tuple[str, str], ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter.
+
+        Args:
+            amount: Amount to add.
+            **labels: Label values identifying the series.
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current value of a series."""
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> list[dict]:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, optionally split by labels."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge to a value.
+
+        Args:
+            value: New value.
+            **labels: Label values identifying the series.
+        """
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrement the gauge.
+
+        Args:
+            amount: Amount to subtract.
+            **labels: Label values identifying the series.
+        """
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, optionally split by labels.
+
+    Args:
+        name: Metric name.
+        description: Human-readable description.
+        buckets: Sorted upper bounds of the buckets; values above the last one only count towards ``+Inf``.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        # Per series: observations per bucket (the last slot is +Inf), count and sum
+        self._values: dict[tuple[tuple[str, str], ...], tuple[list[int], int, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value.
+            **labels: Label values identifying the series.
+        """
+        key = _label_key(labels)
+        with self._lock:
+            counts, count, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0, 0.0)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, count + 1, total + value)
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations in a series."""
+        series = self._values.get(_label_key(labels))
+        return series[1] if series else 0
+
+    def sum(self, **labels: str) -> float:
+        """Return the sum of observations in a series."""
+        series = self._values.get(_label_key(labels))
+        return series[2] if series else 0.0
+
+    def quantile(self, q: float, **labels: str) -> float | None:
+        """Estimate a quantile of a series by interpolating within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1.
+            **labels: Label values identifying the series.
+
+        Returns:
+            The estimate, capped at the last bucket bound, or None if the series is empty.
+        """
+        with self._lock:
+            series = self._values.get(_label_key(labels))
+            if not series:
+                return None
+            counts, count, _ = series
+            rank = q * count
+            seen = 0
+            for i, bucket_count in enumerate(counts[:-1]):
+                if bucket_count and seen + bucket_count >= rank:
+                    lower = self.buckets[i - 1] if i > 0 else 0.0
+                    return lower + (self.buckets[i] - lower) * (rank - seen) / bucket_count
+                seen += bucket_count
+            return self.buckets[-1]
+
+    def samples(self) -> list[dict]:
+        with self._lock:
+            samples = []
+            for key, (counts, count, total) in self._values.items():
+                cumulative, buckets = 0, {}
+                for bound, bucket_count in zip((*map(str, self.buckets), "+Inf"), counts, strict=True):
+                    cumulative += bucket_count
+                    buckets[bound] = cumulative
+                samples.append({"labels": dict(key), "count": count, "sum": total, "buckets": buckets})
+            return samples
+
+
+class MetricsRegistry:
+    """Process-local registry of metrics exposed via the /metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Get or create a counter.
+
+        Args:
+            name: Metric name.
+            description: Human-readable description.
+
+        Returns:
+            The registered counter.
+        """
+        metric = self._metrics.setdefault(name, Counter(name, description))
+        if type(metric) is not Counter:
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        """Get or create a gauge.
+
+        Args:
+            name: Metric name.
+            description: Human-readable description.
+
+        Returns:
+            The registered gauge.
+        """
+        metric = self._metrics.setdefault(name, Gauge(name, description))
+        if not isinstance(metric, Gauge):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def histogram(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram.
+
+        Args:
+            name: Metric name.
+            description: Human-readable description.
+            buckets: Sorted upper bounds of the buckets.
+
+        Returns:
+            The registered histogram.
+        """
+        metric = self._metrics.setdefault(name, Histogram(name, description, buckets))
+        if not isinstance(metric, Histogram):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return the current value of every registered metric."""
+        return {
+            name: {"type": metric.kind, "description": metric.description, "samples": metric.samples()}
+            for name, metric in sorted(self._metrics.items())
+        }
+
+
+metrics = MetricsRegistry()
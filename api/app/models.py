@@ -43,6 +43,7 @@ class AgentModel(BaseModel):
 class AgentStatus(str, Enum):
     PENDING = "pending"
     RUNNING = "running"
+    PAUSED = "paused"
     STOPPED = "stopped"
     ERROR = "error"
 
@@ -60,6 +61,18 @@ class SpawnConfig(BaseModel):
     instruction: str = Field(default="", description="Instruction for the agent.")
     tools: list[str] = Field(default_factory=list, description="Enabled tools for the agent.")
     mcp_tool_filter: str = Field(default="", description="Comma-separated MCP tool names to expose.")
+    cpu_limit: float | None = Field(default=None, gt=0, description="CPU cores the agent container may use.")
+    memory_limit_mb: int | None = Field(default=None, gt=0, description="Memory limit of the agent container in MiB.")
+    min_replicas: int = Field(default=1, ge=1, description="Replicas started whenever the agent runs.")
+    max_replicas: int = Field(default=1, ge=1, description="Maximum replicas the agent is scaled out to under load.")
+    replica_concurrency: int = Field(
+        default=4, ge=1, description="Requests in flight per replica before another replica is started."
+    )
+    idle_timeout: int | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds of inactivity before the agent is stopped. Overrides the global timeout.",
+    )
 
 
 # Removed owner_id field from Agent model to simplify ownership management.
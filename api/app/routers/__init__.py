@@ -1,4 +1,5 @@
+from app.routers.gateway import router as gateway_router
 from app.routers.health import router as health_router
 from app.routers.v1 import router as v1_router
 
-__all__ = ["health_router", "v1_router"]
+__all__ = ["gateway_router", "health_router", "v1_router"]
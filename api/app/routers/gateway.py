@@ -0,0 +1,176 @@
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import httpx
+from fastapi import APIRouter, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import Receive, Scope, Send
+
+from app.metrics import metrics
+from app.models import AgentMode
+
+if TYPE_CHECKING:
+    from app.broker.registry import AgentRegistry
+    from app.runtime.agent_scheduler import AgentScheduler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/agents", tags=["gateway"])
+
+PROXY_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+# Connection-scoped headers are not forwarded in either direction (RFC 9110 section 7.6.1)
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+# Set by the gateway itself, replacing any values sent by the client
+FORWARDED_HEADERS = frozenset({"x-real-ip", "x-forwarded-for", "x-forwarded-proto"})
+
+upstream_errors = metrics.counter(
+    "agent_gateway_upstream_errors_total", "Gateway requests that failed to reach an agent"
+)
+
+
+def create_gateway_client(
+    timeout: float, max_connections: int, max_keepalive_connections: int, keepalive_expiry: float
+) -> httpx.AsyncClient:
+    """Create the client the gateway forwards agent requests with.
+
+    The client keeps a pool of keepalive connections per agent runtime, so
+    requests skip the TCP handshake to agents that served a recent request.
+
+    Args:
+        timeout: Seconds to wait for an agent to accept a connection or send data.
+        max_connections: Maximum open connections to all agents.
+        max_keepalive_connections: Maximum idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection is kept open.
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+
+@router.api_route("/{agent_id}", methods=PROXY_METHODS, include_in_schema=False)
+@router.api_route("/{agent_id}/{path:path}", methods=PROXY_METHODS, include_in_schema=False)
+async def proxy_agent_request(request: Request, agent_id: str, path: str = "") -> Response:
+    """Forward a request to an agent, starting it first if needed (replaces the nginx gateway).
+
+    Does what the nginx gateway does with ensure-running and request-done in
+    process: the request is routed to the least loaded replica and tracked as
+    in flight until the response body has been streamed to the client. Request
+    and response bodies are streamed without buffering.
+
+    Args:
+        request: FastAPI request object.
+        agent_id: ID of the agent to forward to.
+        path: Path below the agent's base URL.
+
+    Returns:
+        The agent's streamed response, with a ``Server-Timing`` header breaking down the cold start if one ran,
+        or 502 if the agent cannot be reached.
+    """
+    scheduler: AgentScheduler = request.app.state.agent_scheduler
+    registry: AgentRegistry = request.app.state.registry
+    client: httpx.AsyncClient = request.app.state.gateway_client
+
+    agent = await registry.get_agent(agent_id)
+    serverless = agent.mode == AgentMode.SERVERLESS
+    cold_start_ms = None
+    if serverless:
+        _, cold_start_ms = await scheduler.ensure_running(agent_id)
+    token = scheduler.begin_request(agent_id, idle=serverless, expires=False)
+    try:
+        upstream = await scheduler.request_endpoint(agent_id, token)
+        upstream_request = client.build_request(
+            request.method,
+            f"{upstream.rstrip('/')}/{path}",
+            params=request.url.query,
+            headers=_forwarded_headers(request),
+            # Bodiless requests are not sent chunked
+            content=request.stream() if _has_body(request) else None,
+        )
+        upstream_response = await client.send(upstream_request, stream=True)
+    except httpx.RequestError as e:
+        scheduler.end_request(agent_id, token)
+        upstream_errors.inc()
+        logger.warning("Failed to forward request to agent %s: %s", agent_id, e)
+        return Response(status_code=502)
+    except BaseException:
+        scheduler.end_request(agent_id, token)
+        raise
+
+    # Repeated headers such as Set-Cookie are kept as separate lines
+    headers = MutableHeaders(
+        raw=[
+            (key.lower(), value)
+            for key, value in upstream_response.headers.raw
+            if key.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+        ]
+    )
+    breakdown = scheduler.last_cold_start(agent_id)
+    if cold_start_ms is not None and breakdown is not None:
+        headers["Server-Timing"] = ", ".join(
+            [f"{name};dur={ms}" for name, ms in breakdown.phases.items()] + [f"cold-start;dur={breakdown.total_ms}"]
+        )
+    return _RelayResponse(
+        upstream_response,
+        on_close=lambda: scheduler.end_request(agent_id, token),
+        status_code=upstream_response.status_code,
+        headers=headers,
+    )
+
+
+class _RelayResponse(StreamingResponse):
+    """Streams the raw body of an agent response.
+
+    The agent response is closed and the request ended once the response is
+    sent, the client goes away, or sending fails before the body is read.
+    """
+
+    def __init__(
+        self, upstream: httpx.Response, on_close: Callable[[], None], status_code: int, headers: MutableHeaders
+    ) -> None:
+        super().__init__(upstream.aiter_raw(), status_code=status_code, headers=headers)
+        self._upstream = upstream
+        self._on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._upstream.aclose()
+            self._on_close()
+
+
+def _has_body(request: Request) -> bool:
+    return "transfer-encoding" in request.headers or request.headers.get("content-length", "0") != "0"
+
+
+def _forwarded_headers(request: Request) -> list[tuple[str, str]]:
+    # Host is kept, as with the nginx gateway
+    headers = [
+        (key, value)
+        for key, value in request.headers.items()
+        if key not in HOP_BY_HOP_HEADERS and key not in FORWARDED_HEADERS
+    ]
+    client_ip = request.client.host if request.client is not None else ""
+    forwarded_for = request.headers.get("x-forwarded-for")
+    headers.append(("X-Real-IP", client_ip))
+    headers.append(("X-Forwarded-For", f"{forwarded_for}, {client_ip}" if forwarded_for else client_ip))
+    headers.append(("X-Forwarded-Proto", request.url.scheme))
+    return headers
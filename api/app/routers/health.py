@@ -5,6 +5,8 @@ from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from qdrant_client.http.exceptions import UnexpectedResponse
 
+from app.metrics import metrics
+
 if TYPE_CHECKING:
     from app.broker.registry import AgentRegistry
     from app.runtime.manager import RuntimeManager
@@ -25,6 +27,16 @@ async def liveness() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@router.get("/metrics")
+async def get_metrics() -> dict[str, dict]:
+    """Metrics snapshot.
+
+    Returns:
+        Current value of every process-local metric, keyed by metric name.
+    """
+    return metrics.snapshot()
+
+
 @router.get("/readyz")
 async def readiness(request: Request) -> JSONResponse:
     """Readiness check.
@@ -62,7 +74,7 @@ async def readiness(request: Request) -> JSONResponse:
         logger.warning("Skills registry health check failed: %s", e)
 
     try:
-        runtime_manager.list_agents()
+        await runtime_manager.list_agents()
         checks["runtime_manager"] = True
     except Exception as e:
         checks["runtime_manager"] = False
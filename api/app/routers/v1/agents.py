@@ -2,20 +2,27 @@ from typing import TYPE_CHECKING, Annotated
 
 from fastapi import APIRouter, Query, Request
 from fastapi.responses import Response
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.config import config as app_config
 from app.models import Agent, AgentMode, AgentStatus, SpawnConfig
-from app.runtime.models import SpawnAgentRequest
+from app.runtime.cold_start import agent_phase_stats
+from app.runtime.manager import runtime_name
+from app.runtime.models import ColdStartBreakdown, ColdStartPhaseStats, ImagePullStatus
 from app.utils import generate_agent_id
 
 if TYPE_CHECKING:
     from app.broker.registry import AgentRegistry
+    from app.chat.roster import ChannelRosterCache
     from app.runtime.agent_scheduler import AgentScheduler
+    from app.runtime.images import ImagePrefetcher
     from app.runtime.manager import RuntimeManager
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
+REQUEST_HEADER = "X-A4S-Request"
+UPSTREAM_HEADER = "X-A4S-Upstream"
+
 
 class RegisterAgentRequest(BaseModel):
     """Request body for registering an agent."""
@@ -32,6 +39,23 @@ class RegisterAgentRequest(BaseModel):
     spawn_config: SpawnConfig = Field(description="Configuration for spawning agent containers.")
 
 
+class UpdateAgentRequest(BaseModel):
+    """Request body for updating an agent; omitted fields keep their current value."""
+
+    name: str | None = Field(default=None, description="Name of the agent.")
+    description: str | None = Field(default=None, description="Description of the agent capabilities.")
+    version: str | None = Field(default=None, description="Version of the agent.")
+    spawn_config: SpawnConfig | None = Field(default=None, description="Configuration for spawning agent containers.")
+
+    @field_validator("name", "description", "version", "spawn_config")
+    @classmethod
+    def reject_null(cls, v: object) -> object:
+        # Defaults are not validated, so only explicit nulls reach this
+        if v is None:
+            raise ValueError("must not be null; omit the field to keep its current value")
+        return v
+
+
 class AgentListResponse(BaseModel):
     """Response for listing agents."""
 
@@ -56,6 +80,23 @@ class AgentStatusResponse(BaseModel):
     status: AgentStatus
 
 
+class AgentImageStatusResponse(BaseModel):
+    """Response for the pull state of an agent image."""
+
+    agent_id: str
+    image: str
+    status: ImagePullStatus
+    error: str | None = None
+
+
+class AgentColdStartResponse(BaseModel):
+    """Response for the cold start telemetry of an agent."""
+
+    agent_id: str
+    last: ColdStartBreakdown | None
+    phases: dict[str, ColdStartPhaseStats]
+
+
 @router.post("", status_code=201)
 async def register_agent(request: Request, body: RegisterAgentRequest) -> Agent:
     """Register an agent in the registry.
@@ -84,9 +125,43 @@ async def register_agent(request: Request, body: RegisterAgentRequest) -> Agent:
         spawn_config=body.spawn_config,
     )
     await registry.register_agent(agent)
+    roster_cache: ChannelRosterCache = request.app.state.roster_cache
+    roster_cache.invalidate_agent(agent.id)
+    image_prefetcher: ImagePrefetcher = request.app.state.image_prefetcher
+    image_prefetcher.prefetch(agent.spawn_config.image)
     return agent
 
 
+@router.put("/{agent_id}")
+async def update_agent(request: Request, agent_id: str, body: UpdateAgentRequest) -> Agent:
+    """Update an agent, rolling a running agent over to its new spawn config without downtime.
+
+    A runtime with the new config starts next to the running one and takes
+    over new requests once it is ready; the old runtime is stopped after its
+    requests in flight complete. Returns once traffic has switched.
+
+    Args:
+        request: FastAPI request object.
+        agent_id: ID of the agent to update.
+        body: Fields to update.
+
+    Returns:
+        The updated agent.
+    """
+    registry: AgentRegistry = request.app.state.registry
+    scheduler: AgentScheduler = request.app.state.agent_scheduler
+
+    agent = await registry.get_agent(agent_id)
+    updated = agent.model_copy(update={field: getattr(body, field) for field in body.model_fields_set})
+    if updated.spawn_config is not None:
+        image_prefetcher: ImagePrefetcher = request.app.state.image_prefetcher
+        image_prefetcher.prefetch(updated.spawn_config.image)
+    await scheduler.update_agent(updated)
+    roster_cache: ChannelRosterCache = request.app.state.roster_cache
+    roster_cache.invalidate_agent(agent_id)
+    return updated
+
+
 @router.delete("/{agent_id}", status_code=204)
 async def unregister_agent(request: Request, agent_id: str) -> None:
     """Unregister an agent from the registry.
@@ -96,7 +171,9 @@ async def unregister_agent(request: Request, agent_id: str) -> None:
         agent_id: ID of the agent to unregister.
     """
     registry: AgentRegistry = request.app.state.registry
+    roster_cache: ChannelRosterCache = request.app.state.roster_cache
     await registry.unregister_agent(agent_id)
+    roster_cache.invalidate_agent(agent_id)
 
 
 @router.get("")
@@ -168,6 +245,11 @@ async def get_agent(request: Request, agent_id: str) -> Agent:
 async def start_agent(request: Request, agent_id: str) -> AgentStatusResponse:
     """Start an agent container using spawn_config from registry.
 
+    Serverless agents are started through the scheduler, within the capacity
+    budget, and stopped again once idle. Starting an agent that is already
+    running returns its status; a permanent agent whose spawn config changed
+    is replaced.
+
     Args:
         request: FastAPI request object.
         agent_id: ID of the agent to start.
@@ -177,32 +259,19 @@ async def start_agent(request: Request, agent_id: str) -> AgentStatusResponse:
     """
     registry: AgentRegistry = request.app.state.registry
     runtime_manager: RuntimeManager = request.app.state.runtime_manager
+    scheduler: AgentScheduler = request.app.state.agent_scheduler
 
     agent = await registry.get_agent(agent_id)
-
-    spawn_request = SpawnAgentRequest(
-        agent_id=agent.id,
-        name=agent.name,
-        image=agent.spawn_config.image,
-        version=agent.version,
-        port=agent.port,
-        model=agent.spawn_config.model,
-        description=agent.description,
-        instruction=agent.spawn_config.instruction,
-        tools=agent.spawn_config.tools,
-        mcp_tool_filter=agent.spawn_config.mcp_tool_filter,
-    )
-
-    runtime_manager.spawn_agent(spawn_request)
-    container_name = f"a4s-agent-{agent.id}"
-    status = runtime_manager.get_agent_status(container_name)
+    await scheduler.start_agent(agent)
+    container_name = runtime_name(agent.id)
+    status = await runtime_manager.get_agent_status(container_name)
 
     return AgentStatusResponse(agent_id=agent.id, status=status)
 
 
 @router.post("/{agent_id}/stop")
 async def stop_agent(request: Request, agent_id: str) -> AgentStatusResponse:
-    """Stop an agent container.
+    """Stop an agent container, releasing its capacity and stopping its extra replicas.
 
     Args:
         request: FastAPI request object.
@@ -212,12 +281,10 @@ async def stop_agent(request: Request, agent_id: str) -> AgentStatusResponse:
         Status of the stopped agent.
     """
     registry: AgentRegistry = request.app.state.registry
-    runtime_manager: RuntimeManager = request.app.state.runtime_manager
+    scheduler: AgentScheduler = request.app.state.agent_scheduler
 
     agent = await registry.get_agent(agent_id)
-    container_name = f"a4s-agent-{agent.id}"
-
-    runtime_manager.stop_agent(container_name)
+    await scheduler.stop_agent(agent.id)
 
     return AgentStatusResponse(agent_id=agent_id, status=AgentStatus.STOPPED)
 
@@ -237,17 +304,62 @@ async def get_agent_status(request: Request, agent_id: str) -> AgentStatusRespon
     runtime_manager: RuntimeManager = request.app.state.runtime_manager
 
     agent = await registry.get_agent(agent_id)
-    container_name = f"a4s-agent-{agent.id}"
-    status = runtime_manager.get_agent_status(container_name)
+    container_name = runtime_name(agent.id)
+    status = await runtime_manager.get_agent_status(container_name)
 
     return AgentStatusResponse(agent_id=agent_id, status=status)
 
 
+@router.get("/{agent_id}/image")
+async def get_agent_image_status(request: Request, agent_id: str) -> AgentImageStatusResponse:
+    """Get the pull state of an agent's image.
+
+    Args:
+        request: FastAPI request object.
+        agent_id: ID of the agent.
+
+    Returns:
+        Whether the image is pending, pulling, ready, or failed to pull.
+    """
+    registry: AgentRegistry = request.app.state.registry
+    image_prefetcher: ImagePrefetcher = request.app.state.image_prefetcher
+
+    agent = await registry.get_agent(agent_id)
+    state = image_prefetcher.state(agent.spawn_config.image)
+
+    return AgentImageStatusResponse(agent_id=agent_id, image=state.image, status=state.status, error=state.error)
+
+
+@router.get("/{agent_id}/cold-starts")
+async def get_agent_cold_starts(request: Request, agent_id: str) -> AgentColdStartResponse:
+    """Get the cold start phase breakdown of an agent.
+
+    Args:
+        request: FastAPI request object.
+        agent_id: ID of the agent.
+
+    Returns:
+        The last cold start and per-phase statistics of all cold starts since the API started.
+    """
+    registry: AgentRegistry = request.app.state.registry
+    scheduler: AgentScheduler = request.app.state.agent_scheduler
+
+    await registry.get_agent(agent_id)
+
+    return AgentColdStartResponse(
+        agent_id=agent_id, last=scheduler.last_cold_start(agent_id), phases=agent_phase_stats(agent_id)
+    )
+
+
 @router.api_route("/{agent_id}/ensure-running", methods=["GET", "POST"])
 async def ensure_running(request: Request, agent_id: str) -> Response:
     """Ensure agent is running (for nginx auth_request).
 
-    Triggers cold start if needed, records activity.
+    Triggers cold start if needed and records the start of a request, which
+    keeps the agent from being paused, stopped or replaced by an update until
+    request-done is called with the token returned in the ``X-A4S-Request``
+    header. The request is routed to the least loaded replica, whose base URL
+    is returned in the ``X-A4S-Upstream`` header.
     Accepts both GET (for nginx auth_request) and POST.
 
     Args:
@@ -255,15 +367,44 @@ async def ensure_running(request: Request, agent_id: str) -> Response:
         agent_id: ID of the agent to ensure is running.
 
     Returns:
-        Empty 200 response on success.
+        Empty 200 response on success, with ``X-A4S-Upstream`` and ``X-A4S-Request`` headers and a
+        ``Server-Timing`` header breaking down the cold start if one ran.
     """
     scheduler: AgentScheduler = request.app.state.agent_scheduler
     registry: AgentRegistry = request.app.state.registry
 
     agent = await registry.get_agent(agent_id)
+    serverless = agent.mode == AgentMode.SERVERLESS
+
+    headers = {}
+    cold_start_ms = None
+    if serverless:
+        _, cold_start_ms = await scheduler.ensure_running(agent_id)
+    token = scheduler.begin_request(agent_id, idle=serverless)
+    headers[REQUEST_HEADER] = token
+    headers[UPSTREAM_HEADER] = await scheduler.request_endpoint(agent_id, token)
+    breakdown = scheduler.last_cold_start(agent_id)
+    if cold_start_ms is not None and breakdown is not None:
+        headers["Server-Timing"] = ", ".join(
+            [f"{name};dur={ms}" for name, ms in breakdown.phases.items()] + [f"cold-start;dur={breakdown.total_ms}"]
+        )
 
-    if agent.mode == AgentMode.SERVERLESS:
-        await scheduler.ensure_running(agent_id)
-        scheduler.record_activity(agent_id)
+    return Response(status_code=200, headers=headers)
 
-    return Response(status_code=200)
+
+@router.api_route("/{agent_id}/request-done", methods=["GET", "POST"])
+async def request_done(request: Request, agent_id: str) -> Response:
+    """Record the completion of a request started by ensure-running (for nginx post_action).
+
+    Args:
+        request: FastAPI request object.
+        agent_id: ID of the agent the request was for.
+
+    Returns:
+        Empty 204 response; requests without or with an unknown ``X-A4S-Request`` token are ignored.
+    """
+    scheduler: AgentScheduler = request.app.state.agent_scheduler
+    token = request.headers.get(REQUEST_HEADER)
+    if token:
+        scheduler.end_request(agent_id, token)
+    return Response(status_code=204)
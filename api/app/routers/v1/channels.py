@@ -1,27 +1,46 @@
 import asyncio
+import contextlib
 import json
 import logging
 import re
+from collections.abc import Awaitable, Callable, Coroutine
+from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 from uuid import uuid4
 
 import httpx
-from fastapi import APIRouter, Query, Request
+from fastapi import APIRouter, Query, Request, Response
 from pydantic import BaseModel, Field
 
-from app.broker.exceptions import AgentNotRegisteredError
+from app.chat.exceptions import ChatJobNotFoundError
+from app.chat.idempotency import fingerprint_request
+from app.chat.models import ChatJob, ChatJobStatus
 from app.config import config as app_config
+from app.metrics import metrics
 from app.models import Agent, AgentMode, Channel
 
 if TYPE_CHECKING:
     from app.broker.channel_registry import ChannelRegistry
     from app.broker.registry import AgentRegistry
+    from app.chat.idempotency import IdempotencyStore
+    from app.chat.jobs import ChatJobStore
+    from app.chat.roster import ChannelRosterCache
     from app.runtime.agent_scheduler import AgentScheduler
 
 logger = logging.getLogger(__name__)
 
 PROXY_TIMEOUT = httpx.Timeout(timeout=300.0, connect=30.0)
+MAX_JOB_WAIT_SECONDS = 60
+DISCONNECT_POLL_INTERVAL = 0.5
+CLIENT_CLOSED_REQUEST = 499
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+chat_cancellations = metrics.counter(
+    "channel_chat_cancellations_total",
+    "Channel chats cancelled because the client disconnected, by phase",
+)
 
 router = APIRouter(prefix="/channels", tags=["channels"])
 
@@ -106,6 +125,30 @@ class ChannelChatResponse(BaseModel):
     results: list[AgentChatResult] | None = None
 
 
+class ChannelChatJobResponse(BaseModel):
+    """Response for an asynchronous channel chat job."""
+
+    job_id: str
+    channel_id: str
+    status: ChatJobStatus
+    result: ChannelChatResponse | None = None
+    error: str | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+
+    @classmethod
+    def from_job(cls, job: ChatJob) -> "ChannelChatJobResponse":
+        return cls(
+            job_id=job.id,
+            channel_id=job.channel_id,
+            status=job.status,
+            result=ChannelChatResponse.model_validate(job.result) if job.result is not None else None,
+            error=job.error,
+            created_at=job.created_at,
+            completed_at=job.completed_at,
+        )
+
+
 @router.post("", status_code=201)
 async def create_channel(request: Request, body: CreateChannelRequest) -> Channel:
     """Create a new channel.
@@ -265,30 +308,141 @@ async def search_relevant_agents(
 
 
 @router.post("/{channel_id}/chat")
-async def channel_chat(request: Request, channel_id: str, body: ChannelChatRequest) -> ChannelChatResponse:
+async def channel_chat(
+    request: Request,
+    response: Response,
+    channel_id: str,
+    body: ChannelChatRequest,
+    run_async: Annotated[
+        bool, Query(alias="async", description="Run the chat as a background job and return its ID immediately.")
+    ] = False,
+) -> ChannelChatResponse | ChannelChatJobResponse:
     """Send a message to agents in a channel.
 
     When agent_ids is None (Phase 1): routes through backbone agent for candidate selection.
     When agent_ids is provided (Phase 2): forwards message to approved agents.
 
+    With async=true the chat runs as a background job; poll its result via
+    GET /channels/{channel_id}/chat/jobs/{job_id}.
+
+    Requests carrying an Idempotency-Key header run at most once per key: retries
+    attach to the execution in flight or replay its stored result.
+
     Args:
         request: FastAPI request object.
+        response: FastAPI response object.
         channel_id: ID of the channel.
         body: Chat request with message and optional agent IDs.
+        run_async: Whether to run the chat as a background job.
 
     Returns:
-        Response with candidates, direct answer, or agent results.
+        Response with candidates, direct answer, or agent results, or the accepted job.
     """
     channel_registry: ChannelRegistry = request.app.state.channel_registry
     agent_registry: AgentRegistry = request.app.state.registry
     scheduler: AgentScheduler = request.app.state.agent_scheduler
+    roster_cache: ChannelRosterCache = request.app.state.roster_cache
 
     channel = await channel_registry.get_channel(channel_id)
+    phase = "routing" if body.agent_ids is None else "forwarding"
+
+    def start_chat() -> Coroutine[Any, Any, ChannelChatResponse]:
+        if body.agent_ids is None:
+            return _backbone_route(channel, body.message, agent_registry, scheduler, roster_cache, channel_id)
+        return _forward_to_agents(channel, body.message, body.agent_ids, agent_registry, scheduler)
+
+    if run_async:
+        job_store: ChatJobStore = request.app.state.chat_job_store
+
+        async def submit_job() -> ChannelChatJobResponse:
+            return ChannelChatJobResponse.from_job(job_store.submit(channel_id, start_chat()))
+
+        job_response, replayed = await _run_idempotent(request, channel_id, body, run_async, submit_job)
+        if replayed:
+            response.headers[IDEMPOTENT_REPLAYED_HEADER] = "true"
+            # Report the job's current status; once it has been evicted, replay the stored acceptance as is
+            with contextlib.suppress(ChatJobNotFoundError):
+                job_response = ChannelChatJobResponse.from_job(job_store.get(job_response.job_id))
+        response.status_code = 202
+        return job_response
+
+    try:
+        chat_response, replayed = await _cancel_on_disconnect(
+            request, _run_idempotent(request, channel_id, body, run_async, start_chat)
+        )
+    except ClientDisconnectedError:
+        chat_cancellations.inc(phase=phase)
+        logger.info("Client disconnected, cancelled %s chat in channel %s", phase, channel_id)
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    if replayed:
+        response.headers[IDEMPOTENT_REPLAYED_HEADER] = "true"
+    return chat_response
+
+
+@router.get("/{channel_id}/chat/jobs/{job_id}")
+async def get_channel_chat_job(
+    request: Request,
+    channel_id: str,
+    job_id: str,
+    wait: Annotated[
+        float,
+        Query(ge=0, le=MAX_JOB_WAIT_SECONDS, description="Seconds to wait for the job to finish (long-poll)."),
+    ] = 0,
+) -> ChannelChatJobResponse:
+    """Get the status and result of an asynchronous channel chat job.
+
+    Args:
+        request: FastAPI request object.
+        channel_id: ID of the channel.
+        job_id: ID of the chat job.
+        wait: Seconds to wait for the job to finish before returning.
+
+    Returns:
+        The job status, with the chat response once it has finished.
+    """
+    job_store: ChatJobStore = request.app.state.chat_job_store
+    job = await job_store.wait(job_id, wait_seconds=wait)
+    if job.channel_id != channel_id:
+        raise ChatJobNotFoundError(f"Chat job {job_id} not found")
+    return ChannelChatJobResponse.from_job(job)
+
+
+async def _run_idempotent[T](
+    request: Request,
+    channel_id: str,
+    body: ChannelChatRequest,
+    run_async: bool,
+    factory: Callable[[], Awaitable[T]],
+) -> tuple[T, bool]:
+    """Run a chat once per Idempotency-Key, returning (result, replayed)."""
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if not key:
+        return await factory(), False
+
+    idempotency_store: IdempotencyStore = request.app.state.idempotency_store
+    fingerprint = fingerprint_request({"body": body.model_dump(mode="json"), "async": run_async})
+    return await idempotency_store.run(f"{channel_id}:{key}", fingerprint, factory)
 
-    if body.agent_ids is None:
-        return await _backbone_route(channel, body.message, agent_registry, scheduler, channel_id)
 
-    return await _forward_to_agents(channel, body.message, body.agent_ids, agent_registry, scheduler)
+class ClientDisconnectedError(Exception):
+    """The client went away before the chat finished."""
+
+
+async def _cancel_on_disconnect[T](request: Request, work: Coroutine[Any, Any, T]) -> T:
+    """Run work, cancelling it (and its A2A calls and cold starts) if the client disconnects."""
+    task = asyncio.create_task(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnectedError
+    finally:
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
 
 
 async def _backbone_route(
@@ -296,6 +450,7 @@ async def _backbone_route(
     message: str,
     agent_registry: "AgentRegistry",
     scheduler: "AgentScheduler",
+    roster_cache: "ChannelRosterCache",
     channel_id: str,
 ) -> ChannelChatResponse:
     """Phase 1: Route through backbone agent for candidate selection."""
@@ -310,32 +465,18 @@ async def _backbone_route(
         return await _fallback_search(channel, message, agent_registry)
 
     try:
-        if backbone.mode == AgentMode.SERVERLESS:
-            await scheduler.ensure_running(backbone_id)
-            scheduler.record_activity(backbone_id)
+        scope = await _agent_scope(backbone, scheduler)
     except Exception:
         logger.warning("Failed to start backbone agent, falling back to search")
         return await _fallback_search(channel, message, agent_registry)
 
-    channel_agents = []
-    for aid in channel.agent_ids:
-        if aid == backbone_id:
-            continue
-        try:
-            a = await agent_registry.get_agent(aid)
-            channel_agents.append({"id": a.id, "name": a.name, "description": a.description})
-        except AgentNotRegisteredError:
-            logger.debug("Skipping unavailable agent %s", aid)
-            continue
-
+    roster = await roster_cache.get(channel)
     context_message = (
-        f"Channel: {channel.name} (id: {channel_id})\n"
-        f"Available agents:\n{json.dumps(channel_agents, indent=2)}\n\n"
-        f"User message: {message}"
+        f"Channel: {channel.name} (id: {channel_id})\nAvailable agents:\n{roster}\n\nUser message: {message}"
     )
 
-    async with httpx.AsyncClient(timeout=PROXY_TIMEOUT) as client:
-        response_text = await _send_a2a_to_agent(backbone, context_message, client=client, depth=1)
+    async with httpx.AsyncClient(timeout=PROXY_TIMEOUT) as client, scope as url:
+        response_text = await _send_a2a_to_agent(backbone, context_message, client=client, depth=1, url=url)
     if response_text is None:
         logger.warning("Backbone agent returned no response, falling back to search")
         return await _fallback_search(channel, message, agent_registry)
@@ -380,11 +521,8 @@ async def _forward_to_agents(
         try:
             agent = await agent_registry.get_agent(aid)
             agent_name = agent.name
-            if agent.mode == AgentMode.SERVERLESS:
-                await scheduler.ensure_running(aid)
-                scheduler.record_activity(aid)
-
-            response_text = await _send_a2a_to_agent(agent, message, client=client, depth=1)
+            async with await _agent_scope(agent, scheduler) as url:
+                response_text = await _send_a2a_to_agent(agent, message, client=client, depth=1, url=url)
             if response_text is None:
                 return AgentChatResult(agent_id=aid, agent_name=agent_name, error="No response from agent")
             return AgentChatResult(agent_id=aid, agent_name=agent_name, response=response_text)
@@ -401,6 +539,21 @@ async def _forward_to_agents(
     return ChannelChatResponse(type=ChannelChatResponseType.RESULTS, results=list(results))
 
 
+async def _agent_scope(agent: Agent, scheduler: "AgentScheduler") -> contextlib.AbstractAsyncContextManager[str]:
+    """Return a scope tracking a request to an agent, yielding the URL to send it to.
+
+    Managed agents are routed and tracked by the scheduler as the agent gateway
+    does, so their requests are drained by updates; serverless agents are
+    started first. External agents are sent to their own URL.
+    """
+    if agent.mode == AgentMode.SERVERLESS:
+        await scheduler.ensure_running(agent.id)
+        return scheduler.request_scope(agent.id)
+    if agent.url == f"{app_config.agent_gateway_url}/agents/{agent.id}/":
+        return scheduler.request_scope(agent.id, idle=False)
+    return contextlib.nullcontext(agent.url)
+
+
 async def _fallback_search(
     channel: Channel,
     message: str,
@@ -416,8 +569,10 @@ async def _fallback_search(
     return ChannelChatResponse(type=ChannelChatResponseType.CANDIDATES, candidates=candidates)
 
 
-async def _send_a2a_to_agent(agent: Agent, message: str, *, client: httpx.AsyncClient, depth: int = 1) -> str | None:
-    """Send an A2A message to an agent and extract the text response."""
+async def _send_a2a_to_agent(
+    agent: Agent, message: str, *, client: httpx.AsyncClient, depth: int = 1, url: str | None = None
+) -> str | None:
+    """Send an A2A message to an agent, or the replica at ``url``, and extract the text response."""
     request_id = str(uuid4())
     a2a_request = {
         "jsonrpc": "2.0",
@@ -433,10 +588,11 @@ async def _send_a2a_to_agent(agent: Agent, message: str, *, client: httpx.AsyncC
         },
     }
 
-    resp = await client.post(f"{agent.url}/", json=a2a_request)
+    url = url or agent.url
+    resp = await client.post(f"{url}/", json=a2a_request)
 
     if resp.status_code != 200:
-        logger.warning("A2A request to %s returned HTTP %s", agent.url, resp.status_code)
+        logger.warning("A2A request to %s returned HTTP %s", url, resp.status_code)
         return None
 
     return _extract_text_from_a2a_response(resp.json())
@@ -22,7 +22,7 @@ class TemplateAgentListResponse(BaseModel):
     total: int
 
 
-def _get_hardcoded_templates() -> list[TemplateAgent]:
+def get_template_agents() -> list[TemplateAgent]:
     return [
         TemplateAgent(
             template_id="personal-assistant",
@@ -42,7 +42,7 @@ async def list_template_agents() -> TemplateAgentListResponse:
     Returns:
         List of agent templates with metadata.
     """
-    templates = _get_hardcoded_templates()
+    templates = get_template_agents()
 
     return TemplateAgentListResponse(
         templates=templates,
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import sqlite3
+import time
+from collections import Counter
+
+import aiosqlite
+
+from app.runtime.exceptions import AgentRuntimeError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "activity.db"
+DEFAULT_FLUSH_INTERVAL = 60.0
+DEFAULT_HISTORY_WEEKS = 4
+BUCKET_SECONDS = 3600
+BUCKETS_PER_WEEK = 7 * 24
+
+
+def bucket_of(timestamp: float) -> int:
+    """Return the hourly bucket (hours since the epoch) containing a Unix timestamp."""
+    return int(timestamp // BUCKET_SECONDS)
+
+
+def _init_schema_sync(connection: sqlite3.Connection) -> None:
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS agent_activity (
+            agent_id TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            requests INTEGER NOT NULL,
+            PRIMARY KEY (agent_id, bucket)
+        )
+    """)
+    connection.execute("CREATE INDEX IF NOT EXISTS idx_agent_activity_bucket ON agent_activity (bucket)")
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS agent_last_activity (
+            agent_id TEXT PRIMARY KEY,
+            last_activity REAL NOT NULL
+        )
+    """)
+
+
+async def _init_schema(db_path: str) -> None:
+    def init_sync() -> None:
+        conn = sqlite3.connect(db_path)
+        try:
+            _init_schema_sync(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    await asyncio.to_thread(init_sync)
+
+
+class SqliteActivityHistory:
+    """Hourly request counts per agent, persisted in SQLite.
+
+    Requests are counted in memory and flushed in batches, so recording stays
+    off the database on the request path. Buckets older than ``history_weeks``
+    are pruned on flush. The time of each agent's last request is kept as well,
+    so idle tracking can resume after a restart.
+
+    Args:
+        db: Open database connection.
+        history_weeks: Weeks of history kept and used for predictions.
+        flush_interval: Seconds between flushes of the in-memory counts.
+    """
+
+    def __init__(
+        self,
+        db: aiosqlite.Connection,
+        history_weeks: int = DEFAULT_HISTORY_WEEKS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self._db = db
+        self._history_weeks = history_weeks
+        self._flush_interval = flush_interval
+        self._pending: Counter[tuple[str, int]] = Counter()
+        self._pending_last: dict[str, float] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    @classmethod
+    async def create(
+        cls,
+        db_path: str = DEFAULT_DB_PATH,
+        history_weeks: int = DEFAULT_HISTORY_WEEKS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> SqliteActivityHistory:
+        """Create a new SqliteActivityHistory instance.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            history_weeks: Weeks of history kept and used for predictions.
+            flush_interval: Seconds between flushes of the in-memory counts.
+
+        Returns:
+            Initialized history instance.
+
+        Raises:
+            AgentRuntimeError: If database connection fails.
+        """
+        try:
+            await _init_schema(db_path)
+            db = await aiosqlite.connect(db_path)
+            logger.info("Connected to activity history database at %s", db_path)
+            return cls(db, history_weeks=history_weeks, flush_interval=flush_interval)
+        except Exception as e:
+            logger.exception("Failed to initialize activity history: %s", e)
+            raise AgentRuntimeError(f"Failed to initialize activity history: {e}") from e
+
+    def start(self) -> None:
+        """Start flushing recorded activity in the background."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def record(self, agent_id: str, timestamp: float | None = None) -> None:
+        """Count one request for an agent.
+
+        Args:
+            agent_id: The agent that received the request.
+            timestamp: Unix time of the request. Defaults to now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self._pending[(agent_id, bucket_of(timestamp))] += 1
+        self._pending_last[agent_id] = max(timestamp, self._pending_last.get(agent_id, 0.0))
+
+    async def flush(self) -> None:
+        """Write the in-memory counts to the database and prune old buckets."""
+        pending, self._pending = self._pending, Counter()
+        pending_last, self._pending_last = self._pending_last, {}
+        if pending_last:
+            await self._db.executemany(
+                """
+                INSERT INTO agent_last_activity (agent_id, last_activity) VALUES (?, ?)
+                ON CONFLICT (agent_id) DO UPDATE SET last_activity = MAX(last_activity, excluded.last_activity)
+                """,
+                list(pending_last.items()),
+            )
+        if pending:
+            await self._db.executemany(
+                """
+                INSERT INTO agent_activity (agent_id, bucket, requests) VALUES (?, ?, ?)
+                ON CONFLICT (agent_id, bucket) DO UPDATE SET requests = requests + excluded.requests
+                """,
+                [(agent_id, bucket, count) for (agent_id, bucket), count in pending.items()],
+            )
+        oldest = bucket_of(time.time()) - self._history_weeks * BUCKETS_PER_WEEK
+        await self._db.execute("DELETE FROM agent_activity WHERE bucket < ?", (oldest,))
+        await self._db.execute("DELETE FROM agent_last_activity WHERE last_activity < ?", (oldest * BUCKET_SECONDS,))
+        await self._db.commit()
+
+    async def demand_scores(self, bucket: int) -> dict[str, float]:
+        """Score how likely each agent is to be used in an hourly bucket.
+
+        The score is the fraction of the past ``history_weeks`` weeks in which
+        the agent received requests in the same hour of the week.
+
+        Args:
+            bucket: The hourly bucket to predict.
+
+        Returns:
+            Mapping of agent ID to a score between 0 and 1, for agents with any matching activity.
+        """
+        async with self._db.execute(
+            """
+            SELECT agent_id, COUNT(*) FROM agent_activity
+            WHERE bucket >= ? AND bucket < ? AND bucket % ? = ?
+            GROUP BY agent_id
+            """,
+            (bucket - self._history_weeks * BUCKETS_PER_WEEK, bucket, BUCKETS_PER_WEEK, bucket % BUCKETS_PER_WEEK),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return {agent_id: weeks / self._history_weeks for agent_id, weeks in rows}
+
+    async def last_activity(self) -> dict[str, float]:
+        """Return the Unix time of each agent's last recorded request, including unflushed ones.
+
+        Returns:
+            Mapping of agent ID to the time of its last request.
+        """
+        async with self._db.execute("SELECT agent_id, last_activity FROM agent_last_activity") as cursor:
+            rows = await cursor.fetchall()
+        last = dict(rows)
+        for agent_id, timestamp in self._pending_last.items():
+            last[agent_id] = max(timestamp, last.get(agent_id, 0.0))
+        return last
+
+    async def close(self) -> None:
+        """Flush pending counts and close the database connection."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        try:
+            await self.flush()
+        finally:
+            await self._db.close()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush agent activity history")
@@ -1,33 +1,169 @@
+import heapq
+import math
 import time
+from uuid import uuid4
+
+# Requests whose completion was never reported stop counting as in flight after this many seconds
+MAX_REQUEST_DURATION = 600.0
 
 
 class AgentActivityMonitor:
-    """Tracks last activity timestamp per agent."""
+    """Tracks last activity timestamp and in-flight requests per agent.
+
+    Also keeps a deadline heap with at most one live entry per agent, so the
+    reaper can sleep until the next agent is due instead of scanning all of them.
+
+    Args:
+        max_request_duration: Seconds after which a request whose completion was never reported
+            stops counting as in flight.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, max_request_duration: float = MAX_REQUEST_DURATION) -> None:
+        self._max_request_duration = max_request_duration
         self._activity: dict[str, float] = {}
+        # agent_id -> request token -> (monotonic expiry, replica serving the request)
+        self._requests: dict[str, dict[str, tuple[float, int]]] = {}
+        self._deadlines: list[tuple[float, str]] = []
+        self._scheduled: dict[str, float] = {}
 
-    def record(self, agent_id: str) -> None:
+    def record(self, agent_id: str, at: float | None = None) -> None:
         """Record activity for an agent.
 
         Args:
             agent_id: The agent ID to record activity for.
+            at: Monotonic time of the activity. Defaults to now.
         """
-        self._activity[agent_id] = time.monotonic()
+        self._activity[agent_id] = time.monotonic() if at is None else at
 
-    def get_idle_agents(self, threshold_seconds: int) -> list[str]:
-        """Return agent IDs idle longer than threshold.
+    def last_activity(self, agent_id: str) -> float | None:
+        """Return the monotonic time of an agent's last activity, or None if untracked.
 
         Args:
-            threshold_seconds: Number of seconds before an agent is considered idle.
+            agent_id: The agent ID to look up.
+        """
+        return self._activity.get(agent_id)
+
+    def begin_request(self, agent_id: str, replica: int = 0, *, expires: bool = True) -> str:
+        """Record the start of a request to an agent.
+
+        Args:
+            agent_id: The agent ID the request is for.
+            replica: Index of the replica serving the request.
+            expires: Stop counting the request after the maximum request duration. Callers that always
+                end their requests pass False, so long requests are not reaped mid-flight.
 
         Returns:
-            List of agent IDs that have been idle longer than the threshold.
+            A token identifying the request, to be passed to end_request.
+        """
+        token = uuid4().hex
+        expiry = time.monotonic() + self._max_request_duration if expires else math.inf
+        self._requests.setdefault(agent_id, {})[token] = (expiry, replica)
+        return token
+
+    def request_replica(self, agent_id: str, token: str) -> int | None:
+        """Return the replica serving a request in flight, or None for unknown tokens.
+
+        Args:
+            agent_id: The agent ID the request is for.
+            token: Token returned by begin_request.
+        """
+        request = self._requests.get(agent_id, {}).get(token)
+        return None if request is None else request[1]
+
+    def end_request(self, agent_id: str, token: str) -> bool:
+        """Record the completion of a request; unknown tokens are ignored.
+
+        Args:
+            agent_id: The agent ID the request was for.
+            token: Token returned by begin_request.
+
+        Returns:
+            True if the request was in flight.
+        """
+        requests = self._requests.get(agent_id)
+        if requests is None or requests.pop(token, None) is None:
+            return False
+        if not requests:
+            del self._requests[agent_id]
+        return True
+
+    def in_flight(self, agent_id: str) -> int:
+        """Return the number of requests in flight to an agent, dropping expired ones.
+
+        Args:
+            agent_id: The agent ID to look up.
         """
+        requests = self._requests.get(agent_id)
+        if not requests:
+            return 0
         now = time.monotonic()
-        return [
-            agent_id for agent_id, last_activity in self._activity.items() if now - last_activity > threshold_seconds
-        ]
+        for token in [t for t, (expiry, _) in requests.items() if expiry <= now]:
+            del requests[token]
+        if not requests:
+            del self._requests[agent_id]
+        return len(requests)
+
+    def replica_load(self, agent_id: str) -> dict[int, int]:
+        """Return the number of requests in flight on each replica of an agent.
+
+        Args:
+            agent_id: The agent ID to look up.
+
+        Returns:
+            In-flight requests by replica index; replicas without requests are omitted.
+        """
+        self.in_flight(agent_id)
+        load: dict[int, int] = {}
+        for _, replica in self._requests.get(agent_id, {}).values():
+            load[replica] = load.get(replica, 0) + 1
+        return load
+
+    def total_in_flight(self) -> int:
+        """Return the number of requests in flight to all agents."""
+        return sum(len(requests) for requests in self._requests.values())
+
+    def schedule(self, agent_id: str, due: float, *, replace: bool = False) -> bool:
+        """Schedule an agent to be checked at a monotonic time.
+
+        An earlier pending deadline is kept unless ``replace`` is set; it is
+        re-evaluated when due, which keeps recording activity O(1).
+
+        Args:
+            agent_id: The agent ID to schedule.
+            due: Monotonic time at which to check the agent.
+            replace: Replace a pending deadline even if it is earlier.
+
+        Returns:
+            True if the deadline became the earliest one, so a waiting reaper should wake up.
+        """
+        pending = self._scheduled.get(agent_id)
+        if pending is not None and pending <= due and not replace:
+            return False
+        self._scheduled[agent_id] = due
+        heapq.heappush(self._deadlines, (due, agent_id))
+        return self._deadlines[0] == (due, agent_id)
+
+    def next_due(self) -> float | None:
+        """Return the earliest pending deadline, or None if nothing is scheduled."""
+        while self._deadlines and self._scheduled.get(self._deadlines[0][1]) != self._deadlines[0][0]:
+            heapq.heappop(self._deadlines)
+        return self._deadlines[0][0] if self._deadlines else None
+
+    def pop_due(self, now: float) -> list[str]:
+        """Remove and return the agents whose deadline has passed.
+
+        Args:
+            now: Current monotonic time.
+
+        Returns:
+            Agent IDs that are due; they stay tracked but are no longer scheduled.
+        """
+        due = []
+        while (next_due := self.next_due()) is not None and next_due <= now:
+            _, agent_id = heapq.heappop(self._deadlines)
+            del self._scheduled[agent_id]
+            due.append(agent_id)
+        return due
 
     def remove(self, agent_id: str) -> None:
         """Remove agent from tracking.
@@ -36,3 +172,6 @@ class AgentActivityMonitor:
             agent_id: The agent ID to remove from tracking.
         """
         self._activity.pop(agent_id, None)
+        self._requests.pop(agent_id, None)
+        # The heap entry becomes stale and is dropped lazily
+        self._scheduled.pop(agent_id, None)
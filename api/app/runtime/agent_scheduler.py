@@ -4,23 +4,67 @@ import asyncio
 import contextlib
 import logging
 import time
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterator, Coroutine
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
+from app.broker.exceptions import AgentNotRegisteredError
+from app.metrics import metrics
 from app.models import Agent, AgentMode, AgentStatus
-from app.runtime.activity_monitor import AgentActivityMonitor
-from app.runtime.exceptions import AgentNotFoundError
-from app.runtime.models import SpawnAgentRequest
+from app.runtime.activity_monitor import MAX_REQUEST_DURATION, AgentActivityMonitor
+from app.runtime.capacity import CapacityBudget
+from app.runtime.cold_start import ColdStartTrace, cold_start_phase
+from app.runtime.exceptions import (
+    AgentNotFoundError,
+    AgentRuntimeError,
+    AgentStartupError,
+    AgentUpdateInProgressError,
+    CapacityExceededError,
+    ImageNotReadyError,
+)
+from app.runtime.idle_timeout import IdleTimeoutPolicy
+from app.runtime.manager import CONTAINER_NAME_PREFIX, parse_runtime_name, runtime_name
+from app.runtime.models import ColdStartBreakdown, SpawnAgentRequest
+from app.runtime.prewarm import DEFAULT_LEAD_TIME, DEFAULT_THRESHOLD, Prewarmer, WarmResult
+from app.runtime.replicas import SCALE_DOWN_DELAY, ReplicaSet, replica_scaling
+from app.runtime.supervisor import DEFAULT_CHECK_INTERVAL, PermanentAgentSupervisor
+from app.singleflight import SingleFlight
 
 if TYPE_CHECKING:
     from app.broker.registry import AgentRegistry
+    from app.runtime.activity_history import SqliteActivityHistory
+    from app.runtime.images import ImagePrefetcher
     from app.runtime.manager import RuntimeManager
+    from app.runtime.warm_pool import WarmPool
 
 logger = logging.getLogger(__name__)
 
 READINESS_TIMEOUT = 30.0
-READINESS_POLL_INTERVAL = 0.5
+READINESS_PROBE_TIMEOUT = 2.0
+# Refused connections fail fast, so probing starts almost immediately and backs off to a short cap;
+# the cap bounds how long a ready agent can go unnoticed.
+READINESS_INITIAL_DELAY = 0.005
+READINESS_MAX_DELAY = 0.02
+READINESS_BACKOFF = 2.0
+DEFAULT_REAP_CONCURRENCY = 16
+DEFAULT_COLD_START_CONCURRENCY = 8
+# Seconds a replaced runtime is given to finish its requests in flight before it is stopped anyway
+DRAIN_TIMEOUT = 300.0
+DRAIN_POLL_INTERVAL = 0.1
+# Attempts to replace the primary runtime after a rollout; the updated runtime keeps serving meanwhile
+PRIMARY_START_ATTEMPTS = 3
+PRIMARY_RETRY_DELAY = 1.0
+
+reconciled = metrics.counter("agent_reconciled_total", "Runtimes adopted or removed at startup by action")
+evictions = metrics.counter("agent_evictions_total", "Serverless agents stopped to free capacity for a cold start")
+requests_in_flight = metrics.gauge("agent_requests_in_flight", "Requests to agents that have not completed")
+rollouts = metrics.counter("agent_rollouts_total", "Blue/green updates of running agents by result")
+
+
+def _capacity_key(agent_id: str, replica: int) -> str:
+    """Return the key a replica's capacity is reserved under: the agent ID for the primary, else its runtime name."""
+    return agent_id if replica == 0 else runtime_name(agent_id, replica)
 
 
 class AgentScheduler:
@@ -29,83 +73,726 @@ class AgentScheduler:
     Args:
         runtime_manager: Runtime manager for spawning/stopping agents.
         registry: Agent registry for looking up agent metadata.
-        idle_timeout: Seconds of inactivity before stopping an agent.
-        reaper_interval: Seconds between idle reaper checks.
+        idle_timeouts: Seconds of inactivity before stopping each agent; a fixed 300s when omitted.
+        pause_timeout: Seconds of inactivity before pausing an agent (0 disables pausing).
+        reaper_interval: Seconds before the reaper re-checks an agent it deferred (kept warm, busy or failed to stop).
+        reap_concurrency: Maximum number of agents paused or stopped at the same time.
+        warm_pool: Pool of pre-booted standby runtimes claimed by cold starts.
+        activity_history: Hourly request history recorded with every activity; enables predictive warming.
+        prewarm_max_agents: Agents kept warm ahead of predicted demand (0 disables predictive warming).
+        prewarm_lead_time: Seconds ahead of a predicted demand window to warm agents.
+        prewarm_threshold: Minimum demand score (fraction of past weeks with activity) to warm an agent.
+        image_prefetcher: Tracks pulled images; cold starts fail fast with a retryable error until the image is ready.
+        capacity: Container and memory budget for serverless agents; least recently used agents are evicted to fit
+            a cold start. Unlimited by default.
+        cold_start_concurrency: Maximum number of cold starts in progress at once; others queue.
+        supervise_interval: Seconds between health checks of permanent agents, which are booted at start
+            and restarted when down (0 disables supervision).
+        max_request_duration: Seconds after which a request whose end was never reported stops counting
+            as in flight, so the agent can be reaped again.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         runtime_manager: RuntimeManager,
         registry: AgentRegistry,
-        idle_timeout: int = 300,
+        idle_timeouts: IdleTimeoutPolicy | None = None,
+        pause_timeout: int = 0,
         reaper_interval: int = 30,
+        reap_concurrency: int = DEFAULT_REAP_CONCURRENCY,
+        warm_pool: WarmPool | None = None,
+        activity_history: SqliteActivityHistory | None = None,
+        prewarm_max_agents: int = 0,
+        prewarm_lead_time: int = DEFAULT_LEAD_TIME,
+        prewarm_threshold: float = DEFAULT_THRESHOLD,
+        image_prefetcher: ImagePrefetcher | None = None,
+        capacity: CapacityBudget | None = None,
+        cold_start_concurrency: int = DEFAULT_COLD_START_CONCURRENCY,
+        supervise_interval: float = DEFAULT_CHECK_INTERVAL,
+        max_request_duration: float = MAX_REQUEST_DURATION,
     ) -> None:
         self._runtime = runtime_manager
         self._registry = registry
-        self._monitor = AgentActivityMonitor()
-        self._idle_timeout = idle_timeout
+        self._monitor = AgentActivityMonitor(max_request_duration)
+        self._idle_timeouts = idle_timeouts or IdleTimeoutPolicy()
+        self._pause_timeout = pause_timeout
         self._reaper_interval = reaper_interval
         self._reaper_task: asyncio.Task | None = None
+        self._reaper_wakeup = asyncio.Event()
+        self._reap_concurrency = reap_concurrency
+        self._reap_slots = asyncio.Semaphore(reap_concurrency)
+        self._reap_tasks: set[asyncio.Task] = set()
+        self._expiring: set[str] = set()
+        self._cold_starts = SingleFlight()
+        self._resumes = SingleFlight()
+        self._paused: set[str] = set()
+        self._http = httpx.AsyncClient(timeout=READINESS_PROBE_TIMEOUT)
+        self._warm_pool = warm_pool
+        self._history = activity_history
+        self._images = image_prefetcher
+        self._capacity = capacity or CapacityBudget()
+        self._cold_start_slots = asyncio.Semaphore(cold_start_concurrency)
+        self._admission = asyncio.Lock()
+        self._last_cold_starts: dict[str, ColdStartBreakdown] = {}
+        self._replicas: dict[str, ReplicaSet] = {}
+        self._replica_tasks: set[asyncio.Task] = set()
+        # Agents being updated, and agents whose traffic moved to the replica with their new runtime while
+        # the primary is replaced, with that replica
+        self._updating: set[str] = set()
+        self._handed_over: dict[str, int] = {}
+        self._prewarmer = (
+            Prewarmer(
+                activity_history,
+                self._prewarm,
+                max_agents=prewarm_max_agents,
+                lead_time=prewarm_lead_time,
+                threshold=prewarm_threshold,
+            )
+            if activity_history is not None and prewarm_max_agents > 0
+            else None
+        )
+        self._supervisor = (
+            PermanentAgentSupervisor(
+                runtime_manager,
+                registry,
+                self._boot_permanent,
+                interval=supervise_interval,
+                skip=self._updating.__contains__,
+            )
+            if supervise_interval > 0
+            else None
+        )
 
     async def ensure_running(self, agent_id: str) -> tuple[Agent, int | None]:
-        """Ensure agent is running, spawning if needed.
+        """Ensure agent is running, spawning or unpausing it if needed.
+
+        Concurrent calls for the same stopped agent share a single cold start;
+        a spawn failure is raised to every caller. A paused agent is resumed
+        without a cold start.
 
         Args:
             agent_id: The agent ID to ensure is running.
 
         Returns:
-            Tuple of (agent, cold_start_ms or None if already running).
+            Tuple of (agent, cold_start_ms or None if already running or resumed).
 
         Raises:
             AgentNotRegisteredError: If the agent is not in the registry.
+            AgentStartupError: If the spawned agent exits or does not become ready in time.
+            ImageNotReadyError: If the agent image is still being pulled.
+            CapacityExceededError: If the capacity budget is full and no agent can be evicted.
         """
-        agent = await self._registry.get_agent(agent_id)
+        trace = ColdStartTrace(agent_id)
+        with trace.phase("registry"):
+            agent = await self._registry.get_agent(agent_id)
 
-        if agent.mode != AgentMode.SERVERLESS:
+        if agent.mode != AgentMode.SERVERLESS or agent_id in self._handed_over:
+            # Mid-update, requests go to the new runtime while the primary is replaced
             return agent, None
+        self._idle_timeouts.set_override(agent_id, agent.spawn_config.idle_timeout)
+        self._configure_replicas(agent)
+
+        # Join a cold start already in flight instead of checking status: the container
+        # may report running before it is ready to serve.
+        if not self._cold_starts.in_flight(agent_id):
+            container_name = runtime_name(agent_id)
+            try:
+                status = await self._runtime.get_agent_status(container_name)
+                if status in (AgentStatus.RUNNING, AgentStatus.PAUSED) and not self._capacity.holds(agent_id):
+                    # Started before this process or outside the scheduler; account for it from now on
+                    self._capacity.reserve(agent_id, self._capacity.memory_of(agent.spawn_config.memory_limit_mb))
+                if status == AgentStatus.RUNNING:
+                    return agent, None
+                if status == AgentStatus.PAUSED:
+                    await self._resumes.do(agent_id, lambda: self._resume(agent_id))
+                    return agent, None
+            except AgentNotFoundError:
+                pass
+
+        cold_start_ms = await self._cold_starts.do(agent_id, lambda: self._cold_start(agent, trace))
+        return agent, cold_start_ms
+
+    async def start_agent(self, agent: Agent) -> None:
+        """Start an agent outside of a request.
+
+        A serverless agent is cold started as on its first request, within the
+        capacity budget, and stopped again once idle; a running one is left as
+        is. A permanent agent is spawned, reusing a runtime with the same spawn
+        config.
+
+        Args:
+            agent: The agent to start.
+
+        Raises:
+            AgentStartupError: If a spawned serverless agent exits or does not become ready in time.
+            ImageNotReadyError: If the agent image is still being pulled.
+            CapacityExceededError: If the capacity budget is full and no agent can be evicted.
+        """
+        if agent.mode == AgentMode.SERVERLESS:
+            await self.ensure_running(agent.id)
+            return
+        spawn_request = SpawnAgentRequest.from_agent(agent)
+        if self._images is not None:
+            self._images.ensure_ready(spawn_request.image)
+        await self._runtime.spawn_agent(spawn_request)
+
+    async def stop_agent(self, agent_id: str) -> None:
+        """Stop an agent's runtimes and release its capacity.
+
+        Args:
+            agent_id: The agent ID to stop.
+
+        Raises:
+            AgentNotFoundError: If the agent has no runtime.
+            AgentRuntimeError: If the runtime cannot be stopped; the agent keeps its capacity.
+            AgentUpdateInProgressError: If an update of the agent is rolling out.
+        """
+        if agent_id in self._updating:
+            raise AgentUpdateInProgressError(f"Agent {agent_id} is being updated, retry shortly")
+        # Keeps the reaper and eviction off the agent while it stops
+        self._expiring.add(agent_id)
+        try:
+            try:
+                await self._runtime.stop_agent(runtime_name(agent_id))
+            except AgentNotFoundError:
+                self._forget(agent_id)
+                raise
+            self._forget(agent_id)
+        finally:
+            self._expiring.discard(agent_id)
+        logger.info("Stopped agent %s", agent_id)
+
+    def last_cold_start(self, agent_id: str) -> ColdStartBreakdown | None:
+        """Return the phase breakdown of the last successful cold start of an agent.
+
+        Args:
+            agent_id: The agent ID to look up.
+
+        Returns:
+            The breakdown, or None if the agent was not cold started by this process.
+        """
+        return self._last_cold_starts.get(agent_id)
+
+    async def _cold_start(self, agent: Agent, trace: ColdStartTrace) -> int:
+        """Spawn an agent and wait until it is ready; shared by all concurrent callers."""
+        with trace.activate():
+            return await self._traced_cold_start(agent, trace)
+
+    async def _traced_cold_start(self, agent: Agent, trace: ColdStartTrace) -> int:
+        spawn_request = SpawnAgentRequest.from_agent(agent)
+        if self._images is not None:
+            with trace.phase("image"):
+                self._images.ensure_ready(spawn_request.image)
+        with trace.phase("admission"):
+            await self._cold_start_slots.acquire()
+        try:
+            with trace.phase("admission"):
+                await self._admit(agent.id, self._capacity.memory_of(spawn_request.memory_limit_mb))
+            try:
+                await self._spawn(spawn_request)
+            except ImageNotReadyError:
+                # The image was removed from the host after it was pulled; pull it again
+                self._capacity.release(agent.id)
+                if self._images is not None:
+                    self._images.invalidate(spawn_request.image)
+                raise
+            except BaseException:
+                # The runtime may exist already, also when every caller gave up and the spawn was cancelled;
+                # shielded so that cancelling again cannot leave it running untracked
+                await asyncio.shield(self._remove_failed_start(agent.id))
+                raise
+            # Track the container right away so it is reaped even if every caller gives up.
+            self._touch(agent.id)
+            self._paused.discard(agent.id)
+            try:
+                with trace.phase("readiness"):
+                    url = await self._runtime.get_agent_endpoint(runtime_name(agent.id))
+                    await self._wait_for_ready(agent.id, url)
+            except AgentStartupError:
+                # Remove the failed container so the next request can spawn a fresh one
+                await self._remove_failed_start(agent.id)
+                raise
+        finally:
+            self._cold_start_slots.release()
+
+        breakdown = trace.finish(spawn_request.image)
+        self._last_cold_starts[agent.id] = breakdown
+        logger.info(
+            "Cold started agent %s in %dms (%s)",
+            agent.id,
+            breakdown.total_ms,
+            ", ".join(f"{name}={ms:.0f}ms" for name, ms in breakdown.phases.items()),
+        )
+        return int(breakdown.total_ms)
+
+    async def _remove_failed_start(self, agent_id: str) -> None:
+        """Remove the runtime of a cold start that failed or was cancelled and release its capacity.
 
-        container_name = f"a4s-agent-{agent_id}"
+        A runtime that cannot be stopped keeps its capacity and is tracked as idle, so the reaper retries.
+        """
         try:
-            status = self._runtime.get_agent_status(container_name)
-            if status == AgentStatus.RUNNING:
-                return agent, None
+            await self._runtime.stop_agent(runtime_name(agent_id))
         except AgentNotFoundError:
             pass
+        except AgentRuntimeError as e:
+            logger.warning("Failed to remove runtime of agent %s after a failed start: %s", agent_id, e)
+            self._touch(agent_id)
+            return
+        self._forget(agent_id)
 
+    async def _resume(self, agent_id: str) -> None:
+        """Unpause a paused agent; shared by all concurrent callers."""
         start_time = time.monotonic()
-        spawn_request = SpawnAgentRequest(
-            agent_id=agent.id,
-            name=agent.name,
-            image=agent.spawn_config.image,
-            version=agent.version,
-            port=agent.port,
-            model=agent.spawn_config.model,
-            description=agent.description,
-            instruction=agent.spawn_config.instruction,
-            tools=agent.spawn_config.tools,
-            mcp_tool_filter=agent.spawn_config.mcp_tool_filter,
-        )
-        self._runtime.spawn_agent(spawn_request)
-        direct_url = f"http://{container_name}:{agent.port}"
-        await self._wait_for_ready(direct_url)
-        cold_start_ms = int((time.monotonic() - start_time) * 1000)
+        await self._runtime.unpause_agent(runtime_name(agent_id))
+        self._paused.discard(agent_id)
+        self._touch(agent_id)
+        logger.info("Resumed paused agent %s in %dms", agent_id, int((time.monotonic() - start_time) * 1000))
 
-        logger.info("Cold started agent %s in %dms", agent_id, cold_start_ms)
-        return agent, cold_start_ms
+    async def _prewarm(self, agent_id: str) -> WarmResult:
+        """Warm an agent predicted to be needed; returns whether it was cold started, already running or skipped.
 
-    async def _wait_for_ready(self, agent_url: str) -> None:
-        """Poll agent until it responds or timeout."""
-        deadline = time.monotonic() + READINESS_TIMEOUT
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            while time.monotonic() < deadline:
-                try:
-                    resp = await client.get(agent_url)
-                    if resp.status_code < 500:
+        Predicted demand never evicts running agents, so agents that do not fit the budget are skipped.
+        """
+        if not self._capacity.holds(agent_id):
+            agent = await self._registry.get_agent(agent_id)
+            if agent.spawn_config is not None and not self._capacity.fits(
+                self._capacity.memory_of(agent.spawn_config.memory_limit_mb)
+            ):
+                return WarmResult.SKIPPED_CAPACITY
+        _, cold_start_ms = await self.ensure_running(agent_id)
+        return WarmResult.STARTED if cold_start_ms is not None else WarmResult.ALREADY_RUNNING
+
+    async def _admit(self, agent_id: str, memory_mb: int) -> None:
+        """Reserve capacity for a cold start, evicting least recently used agents if over budget."""
+        async with self._admission:
+            self._capacity.release(agent_id)
+            failed: set[str] = set()
+            while not self._capacity.fits(memory_mb):
+                victim = self._eviction_candidate(agent_id, exclude=failed)
+                if victim is None:
+                    raise CapacityExceededError(f"No capacity to start agent {agent_id}, retry shortly")
+                if not await self._evict(victim):
+                    failed.add(victim)
+            self._capacity.reserve(agent_id, memory_mb)
+
+    def _eviction_candidate(self, agent_id: str, exclude: set[str]) -> str | None:
+        """Pick the least recently used agent that is neither starting nor serving, preferring ones outside a demand window."""
+        expected = self._prewarmer.expected_agents if self._prewarmer is not None else frozenset()
+        candidates = [
+            a
+            for a in self._capacity.agents()
+            if a != agent_id
+            and a not in exclude
+            # Replica reservations are released with their agent
+            and not a.startswith(CONTAINER_NAME_PREFIX)
+            and not self._cold_starts.in_flight(a)
+            and a not in self._expiring
+            and a not in self._updating
+            and not self._monitor.in_flight(a)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda a: (a in expected, self._monitor.last_activity(a) or 0.0))
+
+    async def _evict(self, agent_id: str) -> bool:
+        """Stop an agent to free its capacity; returns False if its runtime could not be stopped, keeping it."""
+        self._expiring.add(agent_id)
+        try:
+            try:
+                await self._runtime.stop_agent(runtime_name(agent_id))
+            except AgentNotFoundError:
+                pass
+            except AgentRuntimeError as e:
+                logger.warning("Failed to evict agent %s: %s", agent_id, e)
+                return False
+            self._forget(agent_id)
+            evictions.inc()
+            logger.info("Evicted least recently used agent %s to free capacity", agent_id)
+            return True
+        finally:
+            self._expiring.discard(agent_id)
+
+    def _forget(self, agent_id: str) -> None:
+        """Drop all tracking of an agent whose runtime is gone, and stop its extra replicas."""
+        self._monitor.remove(agent_id)
+        self._paused.discard(agent_id)
+        self._handed_over.pop(agent_id, None)
+        self._capacity.release(agent_id)
+        replicas = self._replicas.pop(agent_id, None)
+        if replicas is not None:
+            self._stop_replicas(replicas, sorted(replicas.ready - {0}))
+
+    def _configure_replicas(self, agent: Agent) -> None:
+        """Track the replicas of an agent that may scale out, applying its current bounds."""
+        replicas = self._replicas.get(agent.id)
+        if replicas is not None:
+            replicas.configure(agent.spawn_config)
+        elif agent.spawn_config.max_replicas > 1 or agent.spawn_config.min_replicas > 1:
+            self._replicas[agent.id] = ReplicaSet(agent.id, agent.spawn_config)
+
+    def _autoscale(self, agent_id: str) -> None:
+        """Start or stop extra replicas of an agent to match its requests in flight."""
+        replicas = self._replicas.get(agent_id)
+        if replicas is None or agent_id in self._paused or agent_id in self._updating:
+            return
+        load = self._monitor.replica_load(agent_id)
+        desired = replicas.desired(sum(load.values()))
+        active = len((replicas.ready - replicas.stopping) | replicas.starting)
+        for _ in range(desired - active):
+            replica = replicas.next_index()
+            replicas.starting.add(replica)
+            self._track_replica_task(self._run_replica(replicas, replica))
+
+        surplus = replicas.surplus(desired, load)
+        now = time.monotonic()
+        if not surplus:
+            replicas.low_since = None
+        elif replicas.low_since is None:
+            replicas.low_since = now
+        elif now - replicas.low_since >= SCALE_DOWN_DELAY:
+            self._stop_replicas(replicas, surplus)
+            replicas.low_since = None
+
+    def _track_replica_task(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._replica_tasks.add(task)
+        task.add_done_callback(self._replica_tasks.discard)
+
+    def _stop_replicas(self, replicas: ReplicaSet, indices: list[int]) -> None:
+        """Stop extra replicas in the background; they stop receiving requests right away."""
+        for replica in indices:
+            replicas.stopping.add(replica)
+            # Released now so admission sees the capacity; the replica's task releases it again when it exits
+            self._capacity.release(_capacity_key(replicas.agent_id, replica))
+            self._track_replica_task(self._stop_replica(runtime_name(replicas.agent_id, replica)))
+
+    async def _stop_replica(self, name: str) -> None:
+        try:
+            await self._runtime.stop_agent(name)
+        except AgentRuntimeError as e:
+            logger.warning("Failed to stop replica %s: %s", name, e)
+            replica_scaling.inc(direction="down", result="failed")
+            return
+        replica_scaling.inc(direction="down", result="stopped")
+        logger.info("Stopped replica %s", name)
+
+    async def _run_replica(self, replicas: ReplicaSet, replica: int) -> None:
+        """Start an extra replica, keep it routable until its runtime exits, then release it.
+
+        Scaling out never evicts other agents; a replica that does not fit the capacity budget is skipped.
+        """
+        agent_id = replicas.agent_id
+        name = runtime_name(agent_id, replica)
+        try:
+            agent = await self._registry.get_agent(agent_id)
+            memory_mb = self._capacity.memory_of(agent.spawn_config.memory_limit_mb)
+            async with self._admission:
+                if not self._capacity.fits(memory_mb):
+                    replica_scaling.inc(direction="up", result="no_capacity")
+                    return
+                self._capacity.reserve(name, memory_mb)
+            await self._start_replica(agent, replica)
+        except Exception as e:
+            replica_scaling.inc(direction="up", result="failed")
+            logger.warning("Failed to start replica %s: %s", name, e)
+            return
+        finally:
+            replicas.starting.discard(replica)
+
+        if self._replicas.get(agent_id) is not replicas or agent_id in self._updating:
+            # The agent was stopped, or an update began, while the replica started
+            self._capacity.release(name)
+            await self._stop_replica(name)
+            return
+        replica_scaling.inc(direction="up", result="started")
+        logger.info("Scaled agent %s out to replica %d", agent_id, replica)
+        await self._serve_replica(replicas, replica)
+
+    async def _start_replica(self, agent: Agent, replica: int) -> None:
+        """Spawn a replica of an agent and wait until it is ready, removing it again if it fails to start."""
+        name = runtime_name(agent.id, replica)
+        request = SpawnAgentRequest.from_agent(agent, replica=replica)
+        try:
+            async with self._cold_start_slots:
+                if self._images is not None:
+                    self._images.ensure_ready(request.image)
+                await self._spawn(request)
+                await self._wait_for_ready(agent.id, await self._runtime.get_agent_endpoint(name), replica)
+        except Exception:
+            self._capacity.release(_capacity_key(agent.id, replica))
+            with contextlib.suppress(AgentRuntimeError):
+                await self._runtime.stop_agent(name)
+            raise
+
+    async def _serve_replica(self, replicas: ReplicaSet, replica: int) -> None:
+        """Keep a started replica routable until its runtime exits, then release it."""
+        name = runtime_name(replicas.agent_id, replica)
+        replicas.ready.add(replica)
+        replicas.report()
+        try:
+            await self._runtime.wait_for_exit(name)
+        finally:
+            replicas.ready.discard(replica)
+            replicas.stopping.discard(replica)
+            self._capacity.release(_capacity_key(replicas.agent_id, replica))
+            replicas.report()
+
+    async def update_agent(self, agent: Agent) -> None:
+        """Update a registered agent, rolling a running agent over to its new spawn config blue/green.
+
+        A runtime with the new config starts next to the running one. Once it is
+        ready, the registry is updated and new requests are routed to it; the old
+        runtimes are stopped after their requests in flight complete. The primary
+        runtime is then replaced in the background and traffic moves back to it
+        the same way. Agents that are not running, or whose runtimes would not
+        change, are only updated in the registry.
+
+        Args:
+            agent: The agent with its updated fields.
+
+        Raises:
+            AgentUpdateInProgressError: If a previous update of the agent is still rolling out.
+            AgentNotRegisteredError: If the agent is not in the registry.
+            AgentStartupError: If the new runtime exits or does not become ready in time; the old one keeps serving.
+            ImageNotReadyError: If the new image is still being pulled.
+        """
+        if agent.id in self._updating:
+            raise AgentUpdateInProgressError(f"Agent {agent.id} is already being updated, retry shortly")
+        # Claimed before the first await so concurrent updates of the agent are rejected
+        self._updating.add(agent.id)
+        rollout = False
+        try:
+            current = await self._registry.get_agent(agent.id)
+            rollout = await self._needs_rollout(current, agent)
+            if not rollout:
+                await self._registry.update_agent(agent)
+                return
+        finally:
+            if not rollout:
+                self._updating.discard(agent.id)
+
+        replicas = self._replicas.get(agent.id)
+        if replicas is None:
+            replicas = self._replicas[agent.id] = ReplicaSet(agent.id, current.spawn_config)
+        green = replicas.next_index()
+        name = runtime_name(agent.id, green)
+        replicas.starting.add(green)
+        try:
+            if agent.mode == AgentMode.SERVERLESS:
+                # The old runtimes keep their capacity until they drain, so the budget may be exceeded by one
+                self._capacity.reserve(name, self._capacity.memory_of(agent.spawn_config.memory_limit_mb))
+            await self._start_replica(agent, green)
+            try:
+                await self._registry.update_agent(agent)
+            except Exception:
+                self._capacity.release(name)
+                await self._stop_replica(name)
+                raise
+        except Exception:
+            self._updating.discard(agent.id)
+            self._release_rollout_replicas(current, replicas)
+            rollouts.inc(result="failed")
+            raise
+        finally:
+            replicas.starting.discard(green)
+
+        old = sorted(replicas.ready - replicas.stopping)
+        replicas.ready.add(green)
+        replicas.stopping.update(old)
+        self._handed_over[agent.id] = green
+        self._paused.discard(agent.id)
+        self._track_replica_task(self._serve_replica(replicas, green))
+        self._track_replica_task(self._finish_rollout(agent, replicas, green, old))
+        logger.info("Switched agent %s to its updated runtime %s", agent.id, name)
+
+    async def _needs_rollout(self, current: Agent, updated: Agent) -> bool:
+        """Return whether the agent is running and its runtimes would change with the update."""
+        if current.spawn_config is None or updated.spawn_config is None:
+            return False
+        if SpawnAgentRequest.from_agent(current).config_hash() == SpawnAgentRequest.from_agent(updated).config_hash():
+            return False
+        try:
+            status = await self._runtime.get_agent_status(runtime_name(current.id))
+        except AgentNotFoundError:
+            return False
+        return status in (AgentStatus.RUNNING, AgentStatus.PAUSED)
+
+    async def _finish_rollout(self, agent: Agent, replicas: ReplicaSet, green: int, old: list[int]) -> None:
+        """Stop the old runtimes once drained, replace the primary and move traffic back to it.
+
+        If the primary cannot be replaced, the new runtime keeps serving in its place: a serverless agent
+        returns to a primary once it is stopped, a permanent agent once the supervisor restarts the primary.
+        """
+        try:
+            for replica in old:
+                await self._drain(agent.id, replica)
+                if replica == 0:
+                    # The serverless primary keeps its capacity reservation for its replacement
+                    try:
+                        await self._runtime.stop_agent(runtime_name(agent.id))
+                    except AgentNotFoundError:
+                        pass
+                    except AgentRuntimeError as e:
+                        logger.warning("Failed to stop the old primary runtime of agent %s: %s", agent.id, e)
+                else:
+                    self._stop_replicas(replicas, [replica])
+            if not await self._replace_primary(agent):
+                rollouts.inc(result="primary_failed")
+                logger.error("Agent %s is served by its updated runtime %s", agent.id, runtime_name(agent.id, green))
+                return
+            rollouts.inc(result="completed")
+            await self._hand_back(agent.id, replicas, green)
+            logger.info("Finished updating agent %s", agent.id)
+        finally:
+            self._updating.discard(agent.id)
+            if agent.id not in self._handed_over:
+                self._release_rollout_replicas(agent, replicas)
+            if agent.mode == AgentMode.SERVERLESS and self._monitor.last_activity(agent.id) is not None:
+                self._touch(agent.id)
+
+    async def _replace_primary(self, agent: Agent) -> bool:
+        """Start the primary runtime with the agent's new config, retrying with backoff; returns whether it started."""
+        delay = PRIMARY_RETRY_DELAY
+        for attempt in range(1, PRIMARY_START_ATTEMPTS + 1):
+            if agent.mode == AgentMode.SERVERLESS:
+                # A failed attempt releases the reservation
+                self._capacity.reserve(agent.id, self._capacity.memory_of(agent.spawn_config.memory_limit_mb))
+            try:
+                await self._start_replica(agent, 0)
+            except Exception as e:
+                logger.warning(
+                    "Failed to replace the primary runtime of agent %s (attempt %d/%d): %s",
+                    agent.id,
+                    attempt,
+                    PRIMARY_START_ATTEMPTS,
+                    e,
+                )
+            else:
+                return True
+            if attempt < PRIMARY_START_ATTEMPTS:
+                await asyncio.sleep(delay)
+                delay *= 2
+        return False
+
+    async def _hand_back(self, agent_id: str, replicas: ReplicaSet, green: int) -> None:
+        """Move traffic from the replica that served during an update back to the primary, then stop the replica."""
+        replicas.stopping.discard(0)
+        replicas.stopping.add(green)
+        self._handed_over.pop(agent_id, None)
+        await self._drain(agent_id, green)
+        self._stop_replicas(replicas, [green])
+
+    async def _return_to_primary(self, agent: Agent) -> None:
+        """Move traffic back to a permanent agent's primary restarted after its replacement in an update failed."""
+        green = self._handed_over.get(agent.id)
+        replicas = self._replicas.get(agent.id)
+        if green is None or replicas is None:
+            return
+        await self._hand_back(agent.id, replicas, green)
+        self._release_rollout_replicas(agent, replicas)
+        logger.info("Agent %s is served by its primary runtime again", agent.id)
+
+    async def _drain(self, agent_id: str, replica: int) -> None:
+        """Wait until a replica that no longer receives requests has none in flight, at most DRAIN_TIMEOUT seconds."""
+        deadline = time.monotonic() + DRAIN_TIMEOUT
+        while True:
+            if not self._monitor.replica_load(agent_id).get(replica):
+                return
+            if time.monotonic() >= deadline:
+                logger.warning("Replica %d of agent %s did not drain within %gs", replica, agent_id, DRAIN_TIMEOUT)
+                return
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+
+    def _release_rollout_replicas(self, agent: Agent, replicas: ReplicaSet) -> None:
+        """Stop tracking replicas that were only tracked to route requests during an update."""
+        if self._replicas.get(agent.id) is not replicas:
+            return
+        if agent.mode == AgentMode.SERVERLESS and (
+            agent.spawn_config.max_replicas > 1 or agent.spawn_config.min_replicas > 1
+        ):
+            replicas.configure(agent.spawn_config)
+        else:
+            del self._replicas[agent.id]
+
+    async def _boot_permanent(self, agent: Agent) -> None:
+        """Start a permanent agent once its image is pulled, replacing a live but unhealthy runtime, and wait until it is ready."""
+        container_name = runtime_name(agent.id)
+        spawn_request = SpawnAgentRequest.from_agent(agent)
+        if self._images is not None:
+            await self._images.wait_ready(spawn_request.image)
+        with contextlib.suppress(AgentNotFoundError):
+            # Spawning restarts an exited runtime in place but would keep a live one
+            if await self._runtime.get_agent_status(container_name) in (AgentStatus.RUNNING, AgentStatus.PAUSED):
+                await self._runtime.stop_agent(container_name)
+        await self._spawn(spawn_request)
+        try:
+            await self._wait_for_ready(agent.id, await self._runtime.get_agent_endpoint(container_name))
+        except AgentStartupError:
+            with contextlib.suppress(AgentRuntimeError):
+                await self._runtime.stop_agent(container_name)
+            raise
+        if agent.id in self._handed_over:
+            self._track_replica_task(self._return_to_primary(agent))
+
+    async def _spawn(self, request: SpawnAgentRequest) -> None:
+        """Claim a warm pool container for the agent, falling back to a fresh container."""
+        standby_id = self._warm_pool.claim(request.image) if self._warm_pool is not None else None
+        if standby_id is not None:
+            try:
+                with cold_start_phase("claim"):
+                    if await self._runtime.claim_standby(standby_id, request) is not None:
                         return
-                except httpx.RequestError:
-                    pass
-                await asyncio.sleep(READINESS_POLL_INTERVAL)
-        logger.warning("Agent at %s did not become ready in time", agent_url)
+                raise AgentRuntimeError("Runtime does not support standby runtimes")
+            except AgentRuntimeError:
+                logger.warning("Failed to claim standby %s for agent %s, spawning", standby_id, request.agent_id)
+                with contextlib.suppress(AgentRuntimeError):
+                    await self._runtime.stop_agent(standby_id)
+        await self._runtime.spawn_agent(request)
+
+    async def _wait_for_ready(self, agent_id: str, agent_url: str, replica: int = 0) -> None:
+        """Wait until the agent answers HTTP, failing fast if its runtime exits first.
+
+        Raises:
+            AgentStartupError: If the runtime exits, cannot be probed or is not ready within READINESS_TIMEOUT.
+        """
+        probe = asyncio.create_task(self._probe_until_ready(agent_url))
+        exited = asyncio.create_task(self._runtime.wait_for_exit(runtime_name(agent_id, replica)))
+        deadline = time.monotonic() + READINESS_TIMEOUT
+        try:
+            pending = {probe, exited}
+            while probe in pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if probe in done:
+                    if probe.exception() is not None:
+                        raise AgentStartupError(
+                            f"Cannot probe agent {agent_id}: {probe.exception()}"
+                        ) from probe.exception()
+                    return
+                if exited in done:
+                    if exited.exception() is None:
+                        raise AgentStartupError(f"Agent {agent_id} exited before becoming ready")
+                    logger.warning("Cannot watch agent %s for exit: %s", agent_id, exited.exception())
+        finally:
+            for task in (probe, exited):
+                task.cancel()
+            await asyncio.gather(probe, exited, return_exceptions=True)
+        raise AgentStartupError(f"Agent {agent_id} did not become ready within {READINESS_TIMEOUT:g}s")
+
+    async def _probe_until_ready(self, agent_url: str) -> None:
+        """Probe the agent with exponential backoff until it responds without a server error."""
+        delay = READINESS_INITIAL_DELAY
+        while True:
+            try:
+                resp = await self._http.get(agent_url)
+                if resp.status_code < 500:
+                    return
+            except httpx.RequestError:
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * READINESS_BACKOFF, READINESS_MAX_DELAY)
 
     def record_activity(self, agent_id: str) -> None:
         """Record activity for idle tracking.
@@ -113,41 +800,253 @@ class AgentScheduler:
         Args:
             agent_id: The agent ID to record activity for.
         """
-        self._monitor.record(agent_id)
+        self._touch(agent_id)
+        if self._history is not None:
+            self._history.record(agent_id)
+
+    def begin_request(self, agent_id: str, *, idle: bool = True, expires: bool = True) -> str:
+        """Record activity and the start of a request; the agent is not paused or stopped until it ends.
+
+        Args:
+            agent_id: The agent ID the request is for.
+            idle: Count the request as activity of an agent that is stopped when idle. Requests to permanent
+                agents are only tracked for routing and draining.
+            expires: Stop counting the request as in flight after ``max_request_duration`` in case its end is
+                never reported. Callers that always end their requests pass False.
+
+        Returns:
+            A token identifying the request, to be passed to end_request.
+        """
+        if idle:
+            self._idle_timeouts.request_started(agent_id, concurrent=self._monitor.in_flight(agent_id) > 0)
+            self.record_activity(agent_id)
+        replicas = self._replicas.get(agent_id)
+        replica = replicas.pick(self._monitor.replica_load(agent_id)) if replicas is not None else 0
+        token = self._monitor.begin_request(agent_id, replica, expires=expires)
+        requests_in_flight.set(self._monitor.total_in_flight())
+        self._autoscale(agent_id)
+        return token
+
+    async def request_endpoint(self, agent_id: str, token: str) -> str:
+        """Return the base URL of the replica a request started by begin_request is routed to.
+
+        Args:
+            agent_id: The agent ID the request is for.
+            token: Token returned by begin_request.
+        """
+        replica = self._monitor.request_replica(agent_id, token) or 0
+        return await self._runtime.get_agent_endpoint(runtime_name(agent_id, replica))
+
+    def end_request(self, agent_id: str, token: str) -> None:
+        """Record the completion of a request; the idle timeout counts from the end of the last request.
+
+        Args:
+            agent_id: The agent ID the request was for.
+            token: Token returned by begin_request. Unknown tokens are ignored.
+        """
+        if self._monitor.end_request(agent_id, token) and self._monitor.last_activity(agent_id) is not None:
+            self._idle_timeouts.request_ended(agent_id)
+            self._touch(agent_id)
+            self._autoscale(agent_id)
+        requests_in_flight.set(self._monitor.total_in_flight())
+
+    @contextlib.asynccontextmanager
+    async def request_scope(self, agent_id: str, *, idle: bool = True) -> AsyncIterator[str]:
+        """Track a request to an agent as in flight for the duration of the block.
+
+        Args:
+            agent_id: The agent ID the request is for.
+            idle: Count the request as activity of an agent that is stopped when idle; see begin_request.
+
+        Yields:
+            Base URL of the least loaded replica, to send the request to.
+        """
+        token = self.begin_request(agent_id, idle=idle, expires=False)
+        try:
+            yield await self.request_endpoint(agent_id, token)
+        finally:
+            self.end_request(agent_id, token)
+
+    def _touch(self, agent_id: str, at: float | None = None) -> None:
+        """Record activity, now or at a past monotonic time, and make sure the agent has an idle deadline."""
+        at = time.monotonic() if at is None else at
+        self._monitor.record(agent_id, at)
+        idle_timeout = self._idle_timeouts.timeout(agent_id)
+        first_timeout = min(self._pause_timeout, idle_timeout) if self._pause_timeout > 0 else idle_timeout
+        self._schedule(agent_id, at + first_timeout)
+
+    def _schedule(self, agent_id: str, due: float, *, replace: bool = False) -> None:
+        if self._monitor.schedule(agent_id, due, replace=replace):
+            self._reaper_wakeup.set()
+
+    async def reconcile(self) -> None:
+        """Adopt or remove runtimes left behind by a previous API process.
+
+        Running and paused runtimes of registered serverless agents are tracked
+        again, idle since their last persisted request or their start, whichever
+        is later. Exited runtimes of registered agents are kept, so the agent's
+        next spawn restarts them in place if its spawn config is unchanged.
+        Runtimes of unregistered agents, extra replicas and unclaimed standbys
+        are removed. Permanent agents are left alone.
+        """
+        runtimes = await self._runtime.list_runtimes()
+        last_seen = await self._history.last_activity() if self._history is not None else {}
+        for runtime in runtimes:
+            # Extra replicas are started again under load
+            if runtime.agent_id is None or parse_runtime_name(runtime.name)[1] > 0:
+                await self._remove_orphan(runtime.name)
+                continue
+            try:
+                agent = await self._registry.get_agent(runtime.agent_id)
+            except AgentNotRegisteredError:
+                await self._remove_orphan(runtime.name)
+                continue
+            if (
+                agent.mode != AgentMode.SERVERLESS
+                or runtime.status not in (AgentStatus.RUNNING, AgentStatus.PAUSED)
+                or self._monitor.last_activity(agent.id) is not None
+            ):
+                continue
+
+            started = runtime.started_at.timestamp() if runtime.started_at is not None else 0.0
+            last_activity = max(started, last_seen.get(agent.id, 0.0)) or time.time()
+            idle_for = max(0.0, time.time() - last_activity)
+            self._capacity.reserve(agent.id, self._capacity.memory_of(agent.spawn_config.memory_limit_mb))
+            self._idle_timeouts.set_override(agent.id, agent.spawn_config.idle_timeout)
+            self._configure_replicas(agent)
+            if runtime.status == AgentStatus.PAUSED:
+                self._paused.add(agent.id)
+            self._touch(agent.id, at=time.monotonic() - idle_for)
+            reconciled.inc(action="adopted")
+            logger.info("Adopted agent %s, idle for %ds", agent.id, idle_for)
+
+    async def _remove_orphan(self, name: str) -> None:
+        try:
+            await self._runtime.stop_agent(name)
+        except AgentRuntimeError as e:
+            logger.warning("Failed to remove orphaned runtime %s: %s", name, e)
+            return
+        reconciled.inc(action="removed")
+        logger.info("Removed orphaned runtime %s", name)
 
     async def start(self) -> None:
-        """Start the idle reaper background task."""
+        """Reconcile leftover runtimes, then start the idle reaper background task and fill the warm pool."""
         if self._reaper_task is not None:
             return
+        try:
+            await self.reconcile()
+        except Exception:
+            # Leftovers are adopted lazily by ensure_running; startup must not depend on them
+            logger.exception("Failed to reconcile runtimes at startup")
+        if self._warm_pool is not None:
+            self._warm_pool.start()
+        if self._prewarmer is not None:
+            self._prewarmer.start()
+        if self._supervisor is not None:
+            self._supervisor.start()
         self._reaper_task = asyncio.create_task(self._reaper_loop())
-        logger.info("Started agent reaper (timeout=%ds, interval=%ds)", self._idle_timeout, self._reaper_interval)
+        logger.info(
+            "Started agent reaper (pause=%ds, timeout=%ds, concurrency=%d)",
+            self._pause_timeout,
+            self._idle_timeouts.default,
+            self._reap_concurrency,
+        )
 
     async def stop(self) -> None:
         """Stop the idle reaper and cleanup."""
+        if self._prewarmer is not None:
+            await self._prewarmer.stop()
+        if self._supervisor is not None:
+            await self._supervisor.stop()
+        await self._cold_starts.close()
+        await self._resumes.close()
+        await self._http.aclose()
+        for task in self._replica_tasks:
+            task.cancel()
+        await asyncio.gather(*self._replica_tasks, return_exceptions=True)
+        if self._warm_pool is not None:
+            await self._warm_pool.stop()
         if self._reaper_task is not None:
             self._reaper_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._reaper_task
             self._reaper_task = None
+            for task in self._reap_tasks:
+                task.cancel()
+            await asyncio.gather(*self._reap_tasks, return_exceptions=True)
             logger.info("Stopped agent reaper")
 
     async def _reaper_loop(self) -> None:
-        """Background task that terminates idle agents."""
+        """Background task that sleeps until the next idle deadline and expires due agents."""
         while True:
             try:
-                await asyncio.sleep(self._reaper_interval)
-                idle_agents = self._monitor.get_idle_agents(self._idle_timeout)
-                for agent_id in idle_agents:
-                    try:
-                        container_name = f"a4s-agent-{agent_id}"
-                        self._runtime.stop_agent(container_name)
-                        self._monitor.remove(agent_id)
-                        logger.info("Reaped idle agent %s", agent_id)
-                    except AgentNotFoundError:
-                        self._monitor.remove(agent_id)
-                    except Exception:
-                        logger.exception("Failed to reap agent %s", agent_id)
+                self._reaper_wakeup.clear()
+                next_due = self._monitor.next_due()
+                delay = None if next_due is None else max(0.0, next_due - time.monotonic())
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._reaper_wakeup.wait(), delay)
+                for agent_id in self._monitor.pop_due(time.monotonic()):
+                    task = asyncio.create_task(self._expire(agent_id))
+                    self._reap_tasks.add(task)
+                    task.add_done_callback(self._reap_tasks.discard)
             except asyncio.CancelledError:
                 raise
             except Exception:
                 logger.exception("Error in reaper loop")
+
+    async def _expire(self, agent_id: str) -> None:
+        """Pause or stop an agent whose deadline passed, or schedule its next deadline."""
+        if agent_id in self._expiring:
+            self._schedule(agent_id, time.monotonic() + self._reaper_interval)
+            return
+        self._expiring.add(agent_id)
+        try:
+            async with self._reap_slots:
+                # Re-read activity after waiting for a slot; a request may have arrived meanwhile
+                last_activity = self._monitor.last_activity(agent_id)
+                if last_activity is None:
+                    return
+                now = time.monotonic()
+                expected = self._prewarmer.expected_agents if self._prewarmer is not None else frozenset()
+                if agent_id in expected or agent_id in self._updating or self._monitor.in_flight(agent_id):
+                    self._schedule(agent_id, now + self._reaper_interval)
+                elif now - last_activity >= self._idle_timeouts.timeout(agent_id):
+                    await self._stop_idle(agent_id)
+                elif self._pause_timeout > 0 and agent_id not in self._paused:
+                    if now - last_activity < self._pause_timeout:
+                        self._schedule(agent_id, last_activity + self._pause_timeout)
+                    elif not self._resumes.in_flight(agent_id):
+                        await self._pause_idle(agent_id)
+                else:
+                    self._schedule(agent_id, last_activity + self._idle_timeouts.timeout(agent_id))
+        except Exception:
+            logger.exception("Failed to expire agent %s", agent_id)
+            self._schedule(agent_id, time.monotonic() + self._reaper_interval)
+        finally:
+            self._expiring.discard(agent_id)
+
+    async def _stop_idle(self, agent_id: str) -> None:
+        try:
+            await self._runtime.stop_agent(runtime_name(agent_id))
+            logger.info("Reaped idle agent %s", agent_id)
+        except AgentNotFoundError:
+            pass
+        self._forget(agent_id)
+
+    async def _pause_idle(self, agent_id: str) -> None:
+        try:
+            await self._runtime.pause_agent(runtime_name(agent_id))
+        except AgentNotFoundError:
+            self._forget(agent_id)
+            return
+        self._paused.add(agent_id)
+        logger.info("Paused idle agent %s", agent_id)
+        replicas = self._replicas.get(agent_id)
+        if replicas is not None:
+            self._stop_replicas(replicas, sorted(replicas.ready - replicas.stopping - {0}))
+        last_activity = self._monitor.last_activity(agent_id) or 0.0
+        if time.monotonic() - last_activity < self._pause_timeout:
+            # A request may have routed to the agent while it was being paused; resume it.
+            await self._resumes.do(agent_id, lambda: self._resume(agent_id))
+        else:
+            self._schedule(agent_id, last_activity + self._idle_timeouts.timeout(agent_id))
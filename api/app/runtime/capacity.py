@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from app.metrics import metrics
+
+DEFAULT_MEMORY_MB = 512
+
+running_agents = metrics.gauge("agent_capacity_running", "Serverless agents holding a capacity reservation")
+reserved_memory = metrics.gauge("agent_capacity_memory_mb", "Memory reserved by running serverless agents in MiB")
+
+
+class CapacityBudget:
+    """Accounts running serverless agents against a container and memory budget.
+
+    Agents without a memory limit are accounted at ``default_memory_mb``. A
+    budget of 0 is unlimited.
+
+    Args:
+        max_agents: Maximum number of running agents (0 for unlimited).
+        memory_budget_mb: Maximum total memory of running agents in MiB (0 for unlimited).
+        default_memory_mb: Memory accounted for agents without a memory limit.
+    """
+
+    def __init__(
+        self, max_agents: int = 0, memory_budget_mb: int = 0, default_memory_mb: int = DEFAULT_MEMORY_MB
+    ) -> None:
+        self._max_agents = max_agents
+        self._memory_budget_mb = memory_budget_mb
+        self._default_memory_mb = default_memory_mb
+        self._reservations: dict[str, int] = {}
+
+    def memory_of(self, memory_limit_mb: int | None) -> int:
+        """Return the memory accounted for an agent with the given limit."""
+        return memory_limit_mb or self._default_memory_mb
+
+    def fits(self, memory_mb: int) -> bool:
+        """Return whether one more agent with ``memory_mb`` fits the budget."""
+        if self._max_agents > 0 and len(self._reservations) + 1 > self._max_agents:
+            return False
+        return self._memory_budget_mb <= 0 or self.reserved_mb + memory_mb <= self._memory_budget_mb
+
+    @property
+    def reserved_mb(self) -> int:
+        """Total memory currently reserved."""
+        return sum(self._reservations.values())
+
+    def holds(self, agent_id: str) -> bool:
+        """Return whether an agent holds a reservation."""
+        return agent_id in self._reservations
+
+    def agents(self) -> list[str]:
+        """Return the agents holding a reservation."""
+        return list(self._reservations)
+
+    def reserve(self, agent_id: str, memory_mb: int) -> None:
+        """Reserve capacity for an agent, replacing an earlier reservation."""
+        self._reservations[agent_id] = memory_mb
+        self._report()
+
+    def release(self, agent_id: str) -> None:
+        """Release the reservation of an agent, if any."""
+        if self._reservations.pop(agent_id, None) is not None:
+            self._report()
+
+    def _report(self) -> None:
+        running_agents.set(len(self._reservations))
+        reserved_memory.set(self.reserved_mb)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.metrics import metrics
+from app.runtime.models import ColdStartBreakdown, ColdStartPhaseStats
+
+# Phases of a cold start, in order; claim replaces create and start when a warm pool container is used
+PHASES = ("registry", "image", "admission", "claim", "create", "start", "readiness")
+
+# Phases range from sub-millisecond lookups to image-bound boots of tens of seconds
+PHASE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+phase_seconds = metrics.histogram(
+    "cold_start_phase_seconds", "Cold start phase durations by phase and image", PHASE_BUCKETS
+)
+agent_phase_seconds = metrics.histogram(
+    "agent_cold_start_phase_seconds", "Cold start phase durations by phase and agent", PHASE_BUCKETS
+)
+
+_current: ContextVar[ColdStartTrace | None] = ContextVar("cold_start_trace", default=None)
+
+
+class ColdStartTrace:
+    """Times the phases of one cold start.
+
+    Phases running in the runtime manager are timed through ``cold_start_phase``,
+    which finds the trace activated for the current context, so the runtime
+    interface does not change.
+
+    Args:
+        agent_id: The agent being started.
+    """
+
+    def __init__(self, agent_id: str) -> None:
+        self.agent_id = agent_id
+        self._phases: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._finished = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase; repeated phases are added up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if not self._finished:
+                self._phases[name] = self._phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def activate(self) -> Iterator[None]:
+        """Make this the trace timed by ``cold_start_phase`` in the current context."""
+        token = _current.set(self)
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def finish(self, image: str) -> ColdStartBreakdown:
+        """Stop timing, record the phases in the histograms and return the breakdown.
+
+        Args:
+            image: The docker image the agent was started from.
+
+        Returns:
+            The durations of the cold start and each of its phases.
+        """
+        # Tasks spawned during the cold start inherit the trace; ignore them from now on
+        self._finished = True
+        for name, ms in self._phases.items():
+            phase_seconds.observe(ms / 1000, phase=name, image=image)
+            agent_phase_seconds.observe(ms / 1000, phase=name, agent_id=self.agent_id)
+        return ColdStartBreakdown(
+            agent_id=self.agent_id,
+            image=image,
+            total_ms=round((time.perf_counter() - self._started) * 1000, 3),
+            phases={name: round(ms, 3) for name, ms in self._phases.items()},
+        )
+
+
+@contextmanager
+def cold_start_phase(name: str) -> Iterator[None]:
+    """Time a phase of the cold start running in the current context, if any.
+
+    Args:
+        name: Phase name, one of ``PHASES``.
+    """
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.phase(name):
+        yield
+
+
+def agent_phase_stats(agent_id: str) -> dict[str, ColdStartPhaseStats]:
+    """Summarize the recorded cold start phases of an agent.
+
+    Args:
+        agent_id: The agent to summarize.
+
+    Returns:
+        Mapping of phase to its statistics, for phases with observations.
+    """
+    stats = {}
+    for name in PHASES:
+        count = agent_phase_seconds.count(phase=name, agent_id=agent_id)
+        if count == 0:
+            continue
+        stats[name] = ColdStartPhaseStats(
+            count=count,
+            mean_ms=round(agent_phase_seconds.sum(phase=name, agent_id=agent_id) / count * 1000, 3),
+            p50_ms=round((agent_phase_seconds.quantile(0.5, phase=name, agent_id=agent_id) or 0.0) * 1000, 3),
+            p95_ms=round((agent_phase_seconds.quantile(0.95, phase=name, agent_id=agent_id) or 0.0) * 1000, 3),
+        )
+    return stats
@@ -1,17 +1,39 @@
+import asyncio
+import contextlib
 import logging
 import os
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
 
+import httpx
 from docker import DockerClient
 from docker.errors import DockerException, ImageNotFound, NotFound
+from docker.models.containers import Container
 
+from app.metrics import metrics
 from app.models import Agent, AgentStatus
+from app.runtime.cold_start import cold_start_phase
+from app.runtime.docker_state import DEFAULT_RECONCILE_INTERVAL, DockerStateCache
 from app.runtime.exceptions import (
     AgentNotFoundError,
+    AgentRuntimeError,
     AgentSpawnError,
     ImageNotFoundError,
+    ImageNotReadyError,
 )
-from app.runtime.manager import RuntimeManager
-from app.runtime.models import SpawnAgentRequest
+from app.runtime.manager import (
+    PASSTHROUGH_ENV_KEYS,
+    POOL_CONTAINER_PREFIX,
+    STANDBY_BOOT_TIMEOUT,
+    STANDBY_CONFIGURE_PATH,
+    STANDBY_CONFIGURE_TIMEOUT,
+    STANDBY_POLL_INTERVAL,
+    RuntimeManager,
+    parse_runtime_name,
+    runtime_name,
+)
+from app.runtime.models import ManagedRuntime, SpawnAgentRequest
 
 logger = logging.getLogger(__name__)
 
@@ -21,17 +43,38 @@ DEFAULT_AGENT_GATEWAY_URL = "http://host.docker.internal:8080"
 DEFAULT_NETWORK = "a4s-network"
 LABEL_PREFIX = "a4s"
 CONTAINER_PORT = 8000
-PASSTHROUGH_ENV_KEYS = ("GOOGLE_API_KEY", "OPENAI_API_KEY", "OPENROUTER_API_KEY", "GITHUB_TOKEN", "LINEAR_API_KEY")
+LISTED_STATUSES = frozenset({"running", "paused", "restarting"})
+REUSABLE_STATUSES = frozenset({"created", "running", "paused", "exited"})
+NANO_CPUS = 1_000_000_000
+CPU_PERIOD = 100_000
+
+status_lookups = metrics.counter(
+    "runtime_status_lookups_total", "Container status lookups by source (state cache or Docker daemon)"
+)
+
+
+def _parse_docker_time(value: str | None) -> datetime | None:
+    """Parse a Docker timestamp, which has nanosecond precision; zero times mean never."""
+    if not value or value.startswith("0001-"):
+        return None
+    seconds, _, fraction = value.removesuffix("Z").partition(".")
+    return datetime.fromisoformat(seconds).replace(microsecond=int(fraction[:6].ljust(6, "0")), tzinfo=UTC)
 
 
 class DockerRuntimeManager(RuntimeManager):
     """Runtime manager implementation using Docker.
 
+    The Docker SDK is synchronous, so every daemon call runs in a worker thread.
+    Status and listing queries are answered from a state cache fed by the Docker
+    events stream, so the daemon only sees reads for unmanaged containers and
+    while the stream is down.
+
     Args:
         base_url: Docker daemon URL. Defaults to unix socket.
         network_name: Docker network name.
         api_base_url: Base URL of the A4S API.
         agent_gateway_url: Gateway URL for agent routing.
+        reconcile_interval: Seconds between full reconciliations of the state cache.
     """
 
     def __init__(
@@ -40,15 +83,48 @@ class DockerRuntimeManager(RuntimeManager):
         network_name: str = DEFAULT_NETWORK,
         api_base_url: str = DEFAULT_API_BASE_URL,
         agent_gateway_url: str = DEFAULT_AGENT_GATEWAY_URL,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL,
     ) -> None:
         self._client = DockerClient(base_url=base_url or DEFAULT_BASE_URL)
         self._network_name = network_name
         self._ensure_network()
         self._api_base_url = api_base_url
         self._agent_gateway_url = agent_gateway_url
+        self._states = DockerStateCache(self._client, f"{LABEL_PREFIX}.managed=true", reconcile_interval)
+        # Labels cannot be changed after creation, so the config hash of claimed standbys is kept here
+        self._claimed_hashes: dict[str, str] = {}
 
-    def _container_name(self, agent_id: str) -> str:
-        return f"a4s-agent-{agent_id}"
+    async def start(self) -> None:
+        """Start watching Docker events for the container state cache."""
+        self._states.start()
+
+    def _base_environment(self) -> dict[str, str]:
+        environment = {"A4S_API_URL": self._api_base_url}
+        for key in PASSTHROUGH_ENV_KEYS:
+            if os.environ.get(key):
+                environment[key] = os.environ[key]
+        return environment
+
+    def _agent_environment(self, request: SpawnAgentRequest) -> dict[str, str]:
+        return {
+            "AGENT_NAME": request.name,
+            "AGENT_ID": request.agent_id,
+            "AGENT_HOST": runtime_name(request.agent_id, request.replica),
+            "AGENT_MODEL_PROVIDER": request.model.provider.value,
+            "AGENT_MODEL_ID": request.model.model_id,
+            "AGENT_INSTRUCTION": request.instruction,
+            "AGENT_TOOLS": ",".join(request.tools),
+            "AGENT_MCP_TOOL_FILTER": request.mcp_tool_filter,
+            "A4S_AGENT_URL": f"{self._agent_gateway_url}/agents/{request.agent_id}/",
+        }
+
+    def _resource_limits(self, request: SpawnAgentRequest) -> dict[str, object]:
+        limits: dict[str, object] = {}
+        if request.cpu_limit is not None:
+            limits["nano_cpus"] = int(request.cpu_limit * NANO_CPUS)
+        if request.memory_limit_mb is not None:
+            limits["mem_limit"] = f"{request.memory_limit_mb}m"
+        return limits
 
     def _ensure_network(self) -> None:
         try:
@@ -57,7 +133,18 @@ class DockerRuntimeManager(RuntimeManager):
             self._client.networks.create(self._network_name, driver="bridge")
             logger.info("Created network %s", self._network_name)
 
-    def _ensure_image(self, image: str) -> None:
+    async def pull_image(self, image: str) -> None:
+        """Make an image available locally, pulling it if it is missing.
+
+        Args:
+            image: Docker image reference.
+
+        Raises:
+            ImageNotFoundError: If the image cannot be pulled.
+        """
+        await asyncio.to_thread(self._pull_image, image)
+
+    def _pull_image(self, image: str) -> None:
         try:
             self._client.images.get(image)
         except ImageNotFound:
@@ -66,9 +153,36 @@ class DockerRuntimeManager(RuntimeManager):
                 self._client.images.pull(image)
             except DockerException as e:
                 raise ImageNotFoundError(f"Failed to pull image {image}: {e}") from e
+            logger.info("Pulled image %s", image)
+        except DockerException as e:
+            raise ImageNotFoundError(f"Failed to inspect image {image}: {e}") from e
+
+    def _run_container(self, image: str, **kwargs: object) -> Container:
+        """Create and start a container without the implicit pull of ``containers.run``.
 
-    def spawn_agent(self, request: SpawnAgentRequest) -> Agent:
-        """Spawn a new agent container.
+        Raises:
+            ImageNotReadyError: If the image is not available locally.
+        """
+        try:
+            with cold_start_phase("create"):
+                container = self._client.containers.create(image, **kwargs)
+        except ImageNotFound as e:
+            raise ImageNotReadyError(f"Image {image} is not pulled yet") from e
+        try:
+            with cold_start_phase("start"):
+                container.start()
+        except DockerException:
+            with contextlib.suppress(DockerException):
+                container.remove(force=True)
+            raise
+        return container
+
+    async def spawn_agent(self, request: SpawnAgentRequest) -> Agent:
+        """Spawn an agent container, reusing an existing one with the same spawn config.
+
+        An existing container whose config hash matches is started or unpaused as
+        needed, and returned as is if it is already running. One with a different
+        config is replaced.
 
         Args:
             request: Agent spawn configuration.
@@ -77,44 +191,37 @@ class DockerRuntimeManager(RuntimeManager):
             Agent metadata for the spawned container.
 
         Raises:
-            ImageNotFoundError: If the image cannot be pulled.
+            ImageNotReadyError: If the image is not pulled yet; spawns never pull.
             AgentSpawnError: If the container fails to start.
         """
-        container_name = self._container_name(request.agent_id)
-        self._ensure_image(request.image)
+        agent = await asyncio.to_thread(self._spawn_agent, request)
+        await self._states.refresh(runtime_name(request.agent_id, request.replica))
+        return agent
+
+    def _spawn_agent(self, request: SpawnAgentRequest) -> Agent:
+        container_name = runtime_name(request.agent_id, request.replica)
+        config_hash = request.config_hash()
         try:
-            labels = {
-                f"{LABEL_PREFIX}.managed": "true",
-                f"{LABEL_PREFIX}.agent_id": request.agent_id,
-                f"{LABEL_PREFIX}.name": request.name,
-                f"{LABEL_PREFIX}.description": request.description,
-                f"{LABEL_PREFIX}.version": request.version,
-            }
-            environment = {
-                "AGENT_NAME": request.name,
-                "AGENT_ID": request.agent_id,
-                "AGENT_HOST": container_name,
-                "AGENT_MODEL_PROVIDER": request.model.provider.value,
-                "AGENT_MODEL_ID": request.model.model_id,
-                "AGENT_INSTRUCTION": request.instruction,
-                "AGENT_TOOLS": ",".join(request.tools),
-                "AGENT_MCP_TOOL_FILTER": request.mcp_tool_filter,
-                "A4S_API_URL": self._api_base_url,
-                "A4S_AGENT_URL": f"{self._agent_gateway_url}/agents/{request.agent_id}/",
-            }
-            for key in PASSTHROUGH_ENV_KEYS:
-                if os.environ.get(key):
-                    environment[key] = os.environ[key]
-
-            container = self._client.containers.run(
-                request.image,
-                detach=True,
-                name=container_name,
-                network=self._network_name,
-                labels=labels,
-                environment=environment,
-            )
-            logger.info("Spawned agent %s (container %s)", request.name, container.id)
+            if not self._reuse_container(container_name, config_hash):
+                labels = {
+                    f"{LABEL_PREFIX}.managed": "true",
+                    f"{LABEL_PREFIX}.agent_id": request.agent_id,
+                    f"{LABEL_PREFIX}.name": request.name,
+                    f"{LABEL_PREFIX}.description": request.description,
+                    f"{LABEL_PREFIX}.version": request.version,
+                    f"{LABEL_PREFIX}.replica": str(request.replica),
+                    f"{LABEL_PREFIX}.config_hash": config_hash,
+                }
+                environment = self._base_environment() | self._agent_environment(request)
+                container = self._run_container(
+                    request.image,
+                    name=container_name,
+                    network=self._network_name,
+                    labels=labels,
+                    environment=environment,
+                    **self._resource_limits(request),
+                )
+                logger.info("Spawned agent %s (container %s)", request.name, container.id)
             return Agent(
                 id=request.agent_id,
                 name=request.name,
@@ -128,7 +235,142 @@ class DockerRuntimeManager(RuntimeManager):
             logger.error("Failed to spawn agent %s: %s", request.name, e)
             raise AgentSpawnError(f"Failed to spawn agent {request.name}: {e}") from e
 
-    def stop_agent(self, agent_id: str) -> Agent:
+    def _reuse_container(self, name: str, config_hash: str) -> bool:
+        """Bring up an existing container spawned with the same config, removing any other one holding the name.
+
+        Returns:
+            Whether an existing container is now running.
+        """
+        try:
+            container = self._client.containers.get(name)
+        except NotFound:
+            return False
+        labelled_hash = container.labels.get(f"{LABEL_PREFIX}.config_hash")
+        if labelled_hash is not None:
+            reusable = labelled_hash == config_hash and container.status in REUSABLE_STATUSES
+        else:
+            # A claimed standby carries no hash label. It is reused while it serves if this process claimed it
+            # with the same config, and replaced otherwise; once stopped it was configured over HTTP and would
+            # boot as a standby again.
+            reusable = container.status in ("running", "paused") and self._claimed_hashes.get(name) == config_hash
+        if not reusable:
+            self._claimed_hashes.pop(name, None)
+            logger.info(
+                "Replacing container %s (%s), its spawn config changed or it is unusable", name, container.status
+            )
+            container.remove(force=True)
+            return False
+        if container.status == "paused":
+            container.unpause()
+        elif container.status != "running":
+            with cold_start_phase("start"):
+                container.start()
+            logger.info("Restarted existing container %s", name)
+        return True
+
+    async def create_standby(self, image: str) -> str:
+        """Start a pre-booted pool container for an image and wait until it is booted.
+
+        Args:
+            image: Docker image of the container.
+
+        Returns:
+            Name of the standby container.
+
+        Raises:
+            ImageNotReadyError: If the image is not pulled yet.
+            AgentSpawnError: If the container fails to start or boot.
+        """
+        standby_id = await asyncio.to_thread(self._run_standby, image)
+        deadline = time.monotonic() + STANDBY_BOOT_TIMEOUT
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            while time.monotonic() < deadline:
+                try:
+                    resp = await client.get(f"http://{standby_id}:{CONTAINER_PORT}{STANDBY_CONFIGURE_PATH}")
+                    if resp.status_code == 200:
+                        logger.info("Standby container %s booted for image %s", standby_id, image)
+                        return standby_id
+                except httpx.RequestError:
+                    pass
+                await asyncio.sleep(STANDBY_POLL_INTERVAL)
+
+        await self.stop_agent(standby_id)
+        raise AgentSpawnError(f"Standby container for image {image} did not boot in time")
+
+    def _run_standby(self, image: str) -> str:
+        standby_id = f"{POOL_CONTAINER_PREFIX}{uuid4().hex[:12]}"
+        try:
+            self._run_container(
+                image,
+                name=standby_id,
+                network=self._network_name,
+                labels={f"{LABEL_PREFIX}.managed": "true", f"{LABEL_PREFIX}.pool_image": image},
+                environment=self._base_environment() | {"AGENT_STANDBY": "true"},
+            )
+        except DockerException as e:
+            logger.error("Failed to start standby container for image %s: %s", image, e)
+            raise AgentSpawnError(f"Failed to start standby container for image {image}: {e}") from e
+        return standby_id
+
+    async def claim_standby(self, standby_id: str, request: SpawnAgentRequest) -> Agent:
+        """Configure a standby container as the given agent and give it the agent's name.
+
+        Args:
+            standby_id: Name of the standby container returned by create_standby.
+            request: Agent spawn configuration.
+
+        Returns:
+            Agent metadata for the claimed container.
+
+        Raises:
+            AgentSpawnError: If the container rejects the configuration.
+        """
+        url = f"http://{standby_id}:{CONTAINER_PORT}{STANDBY_CONFIGURE_PATH}"
+        try:
+            async with httpx.AsyncClient(timeout=STANDBY_CONFIGURE_TIMEOUT) as client:
+                resp = await client.post(url, json=self._agent_environment(request))
+                resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("Failed to configure standby %s as agent %s: %s", standby_id, request.agent_id, e)
+            raise AgentSpawnError(f"Failed to configure standby container for agent {request.name}: {e}") from e
+
+        container_name = runtime_name(request.agent_id, request.replica)
+        await asyncio.to_thread(self._bind_container, standby_id, container_name, request)
+        self._claimed_hashes[container_name] = request.config_hash()
+        await self._states.refresh(container_name)
+        logger.info("Claimed standby container %s for agent %s", standby_id, request.name)
+        return Agent(
+            id=request.agent_id,
+            name=request.name,
+            description=request.description,
+            version=request.version,
+            url=f"http://{container_name}:{CONTAINER_PORT}",
+            port=CONTAINER_PORT,
+            status=AgentStatus.RUNNING,
+        )
+
+    def _bind_container(self, container_id: str, name: str, request: SpawnAgentRequest) -> None:
+        """Apply the agent's resource limits to a standby container and rename it."""
+        try:
+            with contextlib.suppress(NotFound):
+                leftover = self._client.containers.get(name)
+                if leftover.status not in ("running", "paused"):
+                    # A stopped container of the agent holds the name; the booted standby replaces it
+                    leftover.remove(force=True)
+            container = self._client.containers.get(container_id)
+            if request.cpu_limit is not None or request.memory_limit_mb is not None:
+                # Standby containers start unlimited; update() takes the CFS quota instead of nano_cpus
+                limits: dict[str, object] = {}
+                if request.cpu_limit is not None:
+                    limits |= {"cpu_period": CPU_PERIOD, "cpu_quota": int(request.cpu_limit * CPU_PERIOD)}
+                if request.memory_limit_mb is not None:
+                    limits |= {"mem_limit": f"{request.memory_limit_mb}m", "memswap_limit": -1}
+                container.update(**limits)
+            container.rename(name)
+        except DockerException as e:
+            raise AgentSpawnError(f"Failed to bind container {container_id} as {name}: {e}") from e
+
+    async def stop_agent(self, agent_id: str) -> Agent:
         """Stop and remove an agent container.
 
         Args:
@@ -139,10 +381,19 @@ class DockerRuntimeManager(RuntimeManager):
 
         Raises:
             AgentNotFoundError: If the container does not exist.
+            AgentRuntimeError: If the container cannot be stopped or removed.
         """
+        agent = await asyncio.to_thread(self._stop_agent, agent_id)
+        self._claimed_hashes.pop(agent_id, None)
+        await self._states.refresh(agent_id)
+        return agent
+
+    def _stop_agent(self, agent_id: str) -> Agent:
         try:
             container = self._client.containers.get(agent_id)
             labels = container.labels
+            if container.status == "paused":
+                container.unpause()
             container.stop()
             container.remove()
             logger.info("Stopped agent %s", agent_id)
@@ -160,32 +411,141 @@ class DockerRuntimeManager(RuntimeManager):
             raise AgentNotFoundError(f"Agent {agent_id} not found") from e
         except DockerException as e:
             logger.error("Failed to stop agent %s: %s", agent_id, e)
-            raise AgentNotFoundError(f"Failed to stop agent {agent_id}: {e}") from e
+            raise AgentRuntimeError(f"Failed to stop agent {agent_id}: {e}") from e
+
+    async def pause_agent(self, agent_id: str) -> None:
+        """Freeze an agent container; it keeps its memory but uses no CPU.
+
+        Args:
+            agent_id: Container ID or name.
+
+        Raises:
+            AgentNotFoundError: If the container does not exist.
+            AgentRuntimeError: If the container cannot be paused.
+        """
+        await asyncio.to_thread(self._pause_agent, agent_id)
+        await self._states.refresh(agent_id)
+
+    def _pause_agent(self, agent_id: str) -> None:
+        try:
+            self._client.containers.get(agent_id).pause()
+            logger.info("Paused agent %s", agent_id)
+        except NotFound as e:
+            raise AgentNotFoundError(f"Agent {agent_id} not found") from e
+        except DockerException as e:
+            raise AgentRuntimeError(f"Failed to pause agent {agent_id}: {e}") from e
+
+    async def unpause_agent(self, agent_id: str) -> None:
+        """Resume a paused agent container.
+
+        Args:
+            agent_id: Container ID or name.
+
+        Raises:
+            AgentNotFoundError: If the container does not exist.
+            AgentRuntimeError: If the container cannot be resumed.
+        """
+        await asyncio.to_thread(self._unpause_agent, agent_id)
+        await self._states.refresh(agent_id)
+
+    def _unpause_agent(self, agent_id: str) -> None:
+        try:
+            container = self._client.containers.get(agent_id)
+            if container.status == "paused":
+                container.unpause()
+                logger.info("Unpaused agent %s", agent_id)
+        except NotFound as e:
+            raise AgentNotFoundError(f"Agent {agent_id} not found") from e
+        except DockerException as e:
+            raise AgentRuntimeError(f"Failed to unpause agent {agent_id}: {e}") from e
+
+    async def wait_for_exit(self, agent_id: str) -> None:
+        """Return once an agent container dies or is removed, driven by Docker events.
 
-    def list_agents(self) -> list[Agent]:
+        Args:
+            agent_id: Container ID or name.
+        """
+        if self._states.synced and self._states.get(agent_id) is not None:
+            await self._states.wait_for_exit(agent_id)
+        else:
+            await super().wait_for_exit(agent_id)
+
+    async def get_agent_endpoint(self, agent_id: str) -> str:
+        """Return the URL of an agent container on the agent network.
+
+        Args:
+            agent_id: Container name.
+
+        Returns:
+            Base URL of the agent server.
+        """
+        return f"http://{agent_id}:{CONTAINER_PORT}"
+
+    async def list_agents(self) -> list[Agent]:
         """List all managed agent containers.
 
         Returns:
             List of agent metadata for all running containers.
         """
+        if self._states.synced:
+            status_lookups.inc(source="cache")
+            return [
+                self._to_agent(state.name, state.labels, state.status)
+                for state in self._states.containers()
+                if state.status in LISTED_STATUSES and not state.name.startswith(POOL_CONTAINER_PREFIX)
+            ]
+        status_lookups.inc(source="daemon")
+        return await asyncio.to_thread(self._list_agents)
+
+    def _list_agents(self) -> list[Agent]:
         containers = self._client.containers.list(filters={"label": f"{LABEL_PREFIX}.managed=true"})
-        agents = []
-        for c in containers:
-            labels = c.labels
-            agents.append(
-                Agent(
-                    id=labels.get(f"{LABEL_PREFIX}.agent_id", c.id),
-                    name=labels.get(f"{LABEL_PREFIX}.name", ""),
-                    description=labels.get(f"{LABEL_PREFIX}.description", ""),
-                    version=labels.get(f"{LABEL_PREFIX}.version", ""),
-                    url=f"http://{c.name}:{CONTAINER_PORT}",
-                    port=CONTAINER_PORT,
-                    status=self._map_status(c.status),
-                )
+        return [
+            self._to_agent(c.name, c.labels, c.status)
+            for c in containers
+            if not c.name.startswith(POOL_CONTAINER_PREFIX)
+        ]
+
+    async def list_runtimes(self) -> list[ManagedRuntime]:
+        """List all managed containers on the daemon, including standbys and exited containers.
+
+        Returns:
+            The containers with their agent, status and start time.
+
+        Raises:
+            AgentRuntimeError: If the containers cannot be listed.
+        """
+        return await asyncio.to_thread(self._list_runtimes)
+
+    def _list_runtimes(self) -> list[ManagedRuntime]:
+        try:
+            containers = self._client.containers.list(all=True, filters={"label": f"{LABEL_PREFIX}.managed=true"})
+        except DockerException as e:
+            raise AgentRuntimeError(f"Failed to list managed containers: {e}") from e
+        return [
+            ManagedRuntime(
+                name=c.name,
+                agent_id=None
+                if c.name.startswith(POOL_CONTAINER_PREFIX)
+                else self._to_agent(c.name, c.labels, c.status).id,
+                status=self._map_status(c.status),
+                started_at=_parse_docker_time(c.attrs.get("State", {}).get("StartedAt")),
             )
-        return agents
+            for c in containers
+        ]
+
+    def _to_agent(self, container_name: str, labels: dict[str, str], docker_status: str) -> Agent:
+        return Agent(
+            # Claimed pool containers carry no agent labels; their name identifies the agent
+            id=labels.get(f"{LABEL_PREFIX}.agent_id", parse_runtime_name(container_name)[0]),
+            name=labels.get(f"{LABEL_PREFIX}.name", ""),
+            description=labels.get(f"{LABEL_PREFIX}.description", ""),
+            version=labels.get(f"{LABEL_PREFIX}.version", ""),
+            url=f"http://{container_name}:{CONTAINER_PORT}",
+            port=CONTAINER_PORT,
+            status=self._map_status(docker_status),
+        )
 
-    def get_agent_status(self, agent_id: str) -> AgentStatus:
+    async def get_agent_status(self, agent_id: str) -> AgentStatus:
         """Get the status of an agent container.
 
         Args:
@@ -197,6 +557,15 @@ class DockerRuntimeManager(RuntimeManager):
         Raises:
             AgentNotFoundError: If the container does not exist.
         """
+        # Containers missing from the cache may be unmanaged (e.g. compose services); ask the daemon
+        state = self._states.get(agent_id) if self._states.synced else None
+        if state is not None:
+            status_lookups.inc(source="cache")
+            return self._map_status(state.status)
+        status_lookups.inc(source="daemon")
+        return await asyncio.to_thread(self._get_agent_status, agent_id)
+
+    def _get_agent_status(self, agent_id: str) -> AgentStatus:
         try:
             container = self._client.containers.get(agent_id)
             return self._map_status(container.status)
@@ -208,7 +577,7 @@ class DockerRuntimeManager(RuntimeManager):
         mapping = {
             "created": AgentStatus.PENDING,
             "running": AgentStatus.RUNNING,
-            "paused": AgentStatus.RUNNING,
+            "paused": AgentStatus.PAUSED,
             "restarting": AgentStatus.PENDING,
             "removing": AgentStatus.STOPPED,
             "exited": AgentStatus.STOPPED,
@@ -216,6 +585,7 @@ class DockerRuntimeManager(RuntimeManager):
         }
         return mapping.get(docker_status, AgentStatus.ERROR)
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Close the Docker runtime manager."""
-        self._client.close()
+        await self._states.close()
+        await asyncio.to_thread(self._client.close)
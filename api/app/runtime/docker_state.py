@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from docker.errors import DockerException, NotFound
+
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+    from docker.models.containers import Container
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECONCILE_INTERVAL = 30.0
+WATCH_RETRY_DELAY = 1.0
+EXITED_STATUSES = frozenset({"exited", "dead"})
+# Docker event actions that set a container status; rename and destroy are handled separately
+EVENT_STATUSES = {
+    "create": "created",
+    "start": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "restart": "running",
+    "die": "exited",
+    "oom": "exited",
+}
+
+state_reconciles = metrics.counter("docker_state_reconciles_total", "Full container state reconciliations by result")
+state_events = metrics.counter("docker_state_events_total", "Container events applied to the state cache by action")
+
+
+@dataclass
+class ContainerState:
+    """Last known state of a managed container."""
+
+    id: str
+    name: str
+    status: str
+    labels: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_container(cls, container: Container) -> ContainerState:
+        return cls(id=container.id, name=container.name, status=container.status, labels=dict(container.labels))
+
+
+class DockerStateCache:
+    """In-memory map of managed container states fed by the Docker events stream.
+
+    The stream is subscribed before the initial listing so no transition is
+    missed, and the map is reconciled against a full listing periodically and
+    whenever the stream reconnects. Until the first listing completes, or while
+    the stream is down, ``synced`` is False and callers should ask the daemon.
+
+    Args:
+        client: Docker client.
+        label: Label filter selecting the managed containers (``key=value``).
+        reconcile_interval: Seconds between full reconciliations.
+    """
+
+    def __init__(
+        self, client: DockerClient, label: str, reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL
+    ) -> None:
+        self._client = client
+        self._label = label
+        self._reconcile_interval = reconcile_interval
+        self._states: dict[str, ContainerState] = {}
+        # Sequence of the last event per container, so a listing taken before it cannot overwrite it
+        self._seq = itertools.count(1)
+        self._touched: dict[str, int] = {}
+        self._exit_waiters: dict[str, set[asyncio.Future[None]]] = {}
+        self._synced = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def synced(self) -> bool:
+        """Whether the map currently mirrors the daemon."""
+        return self._synced
+
+    def start(self) -> None:
+        """Start watching container events in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def close(self) -> None:
+        """Stop watching and release exit waiters."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self._synced = False
+        for waiters in self._exit_waiters.values():
+            for waiter in waiters:
+                waiter.cancel()
+        self._exit_waiters.clear()
+
+    def get(self, name_or_id: str) -> ContainerState | None:
+        """Look up a container by name or ID.
+
+        Args:
+            name_or_id: Container name or full ID.
+
+        Returns:
+            The cached state, or None if no managed container matches.
+        """
+        state = self._states.get(name_or_id)
+        if state is not None:
+            return state
+        return next((s for s in self._states.values() if s.id == name_or_id), None)
+
+    def containers(self) -> Iterator[ContainerState]:
+        """Iterate over all cached container states."""
+        return iter(list(self._states.values()))
+
+    async def refresh(self, name_or_id: str) -> None:
+        """Re-read one container from the daemon after changing it.
+
+        Args:
+            name_or_id: Container name or ID.
+        """
+        seq = next(self._seq)
+        try:
+            container = await asyncio.to_thread(self._client.containers.get, name_or_id)
+            state = ContainerState.from_container(container)
+        except NotFound:
+            state = None
+        except DockerException:
+            logger.warning("Failed to refresh state of container %s", name_or_id, exc_info=True)
+            return
+        if state is None:
+            cached = self.get(name_or_id)
+            if cached is not None:
+                self._store(cached.name, None, seq)
+        else:
+            self._store(state.name, state, seq)
+
+    async def wait_for_exit(self, name_or_id: str) -> None:
+        """Return once the container has exited or been removed.
+
+        Args:
+            name_or_id: Container name or ID.
+        """
+        state = self.get(name_or_id)
+        if state is None or state.status in EXITED_STATUSES:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._exit_waiters.setdefault(state.name, set()).add(waiter)
+        try:
+            await waiter
+        finally:
+            waiters = self._exit_waiters.get(state.name)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._exit_waiters[state.name]
+
+    async def _watch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            stream = None
+            reader: asyncio.Future | None = None
+            try:
+                stream = await asyncio.to_thread(
+                    self._client.events, decode=True, filters={"type": "container", "label": self._label}
+                )
+                await self._reconcile()
+                self._synced = True
+                reader = asyncio.ensure_future(asyncio.to_thread(self._read_events, stream, loop))
+                while not reader.done():
+                    done, _ = await asyncio.wait({reader}, timeout=self._reconcile_interval)
+                    if not done:
+                        await self._reconcile()
+                reader.result()
+                logger.warning("Docker event stream ended, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Docker state watcher failed, reconnecting")
+            finally:
+                self._synced = False
+                if stream is not None:
+                    # Closing the stream unblocks the reader thread
+                    stream.close()
+                if reader is not None:
+                    reader.cancel()
+            await asyncio.sleep(WATCH_RETRY_DELAY)
+
+    def _read_events(self, stream: Iterator[dict], loop: asyncio.AbstractEventLoop) -> None:
+        for event in stream:
+            loop.call_soon_threadsafe(self._apply_event, event)
+
+    def _apply_event(self, event: dict) -> None:
+        action = event.get("Action", "")
+        actor = event.get("Actor", {})
+        attributes = actor.get("Attributes", {})
+        name = attributes.get("name", "")
+        seq = next(self._seq)
+        state_events.inc(action=action.split(":")[0])
+
+        if action == "rename":
+            old_name = attributes.get("oldName", "").lstrip("/")
+            state = self._states.get(old_name)
+            self._store(old_name, None, seq)
+            if state is not None:
+                state.name = name
+                self._store(name, state, seq)
+            return
+        if action == "destroy":
+            self._store(name, None, seq)
+            return
+
+        status = EVENT_STATUSES.get(action)
+        if status is None:
+            return
+        state = self._states.get(name)
+        if state is None:
+            labels = {k: v for k, v in attributes.items() if k not in ("name", "image", "exitCode")}
+            state = ContainerState(id=actor.get("ID", ""), name=name, status=status, labels=labels)
+        state.status = status
+        self._store(name, state, seq)
+
+    async def _reconcile(self) -> None:
+        seq = next(self._seq)
+        try:
+            containers = await asyncio.to_thread(self._client.containers.list, all=True, filters={"label": self._label})
+        except DockerException:
+            state_reconciles.inc(result="error")
+            raise
+        listed = {c.name: ContainerState.from_container(c) for c in containers}
+        for name in set(self._states) | set(listed):
+            if self._touched.get(name, 0) > seq:
+                continue
+            self._store(name, listed.get(name), seq)
+        # Everything up to this listing is covered by it; only newer events still need protecting
+        self._touched = {name: touched for name, touched in self._touched.items() if touched > seq}
+        state_reconciles.inc(result="ok")
+
+    def _store(self, name: str, state: ContainerState | None, seq: int) -> None:
+        self._touched[name] = max(self._touched.get(name, 0), seq)
+        if state is None:
+            self._states.pop(name, None)
+        else:
+            self._states[name] = state
+        if state is None or state.status in EXITED_STATUSES:
+            for waiter in self._exit_waiters.get(name, ()):
+                if not waiter.done():
+                    waiter.set_result(None)
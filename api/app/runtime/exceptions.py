@@ -10,5 +10,21 @@ class AgentSpawnError(AgentRuntimeError):
     """Failed to spawn agent."""
 
 
+class AgentStartupError(AgentRuntimeError):
+    """Agent runtime exited or timed out before becoming ready."""
+
+
 class ImageNotFoundError(AgentRuntimeError):
     """Docker image not found."""
+
+
+class ImageNotReadyError(AgentRuntimeError):
+    """Image is not pulled yet; the request can be retried once the pull completes."""
+
+
+class AgentUpdateInProgressError(AgentRuntimeError):
+    """An update of the agent is already rolling out."""
+
+
+class CapacityExceededError(AgentRuntimeError):
+    """No capacity to start an agent and nothing can be evicted; the request can be retried."""
@@ -0,0 +1,35 @@
+from app.config import AgentRuntime, Config
+from app.config import config as default_config
+from app.runtime.docker_manager import DockerRuntimeManager
+from app.runtime.local_manager import LocalProcessRuntimeManager
+from app.runtime.manager import RuntimeManager
+
+
+def create_runtime_manager(config: Config | None = None) -> RuntimeManager:
+    """Create the runtime manager selected by ``agent_runtime``.
+
+    Args:
+        config: Optional configuration. Uses default config if not provided.
+
+    Returns:
+        A Docker runtime manager, or a local process runtime manager for ``local``.
+    """
+    cfg = config or default_config
+    if cfg.agent_runtime == AgentRuntime.LOCAL:
+        return LocalProcessRuntimeManager(
+            command=cfg.agent_local_command or None,
+            image_commands=cfg.agent_local_image_commands,
+            working_dir=cfg.agent_local_workdir,
+            host=cfg.agent_local_host,
+            base_port=cfg.agent_local_base_port,
+            max_ports=cfg.agent_local_max_ports,
+            api_base_url=cfg.api_base_url,
+            agent_gateway_url=cfg.agent_gateway_url,
+        )
+
+    return DockerRuntimeManager(
+        api_base_url=cfg.api_base_url,
+        agent_gateway_url=cfg.agent_gateway_url,
+        network_name=cfg.agent_network,
+        reconcile_interval=cfg.agent_state_reconcile_interval,
+    )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+
+from app.metrics import metrics
+
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_WINDOW = 32
+MIN_SAMPLES = 5
+# Fraction of an agent's idle gaps the adaptive timeout covers, and headroom on top of that gap
+COVERAGE = 0.9
+HEADROOM = 1.2
+
+idle_timeouts = metrics.gauge("agent_idle_timeout_seconds", "Current idle timeout of a serverless agent")
+
+
+class IdleTimeoutPolicy:
+    """Decides how long each serverless agent is kept running after its last request.
+
+    An agent's ``SpawnConfig.idle_timeout`` always wins. Otherwise, when
+    adaptive, the timeout follows the agent's recent idle gaps, the time from
+    the end of one request to the start of the next: it covers ``COVERAGE`` of
+    the gaps that fit within ``max_timeout``, so chatty agents stay warm
+    between requests. If most gaps are longer than ``max_timeout``, keeping the
+    agent around rarely saves a cold start and it gets ``min_timeout``. Agents
+    with fewer than ``MIN_SAMPLES`` gaps use the default.
+
+    Args:
+        default: Idle timeout in seconds for agents without an override or enough history.
+        adaptive: Derive timeouts from observed idle gaps.
+        min_timeout: Lower bound of adaptive timeouts in seconds.
+        max_timeout: Upper bound of adaptive timeouts in seconds.
+        window: Number of recent gaps per agent considered.
+    """
+
+    def __init__(
+        self,
+        default: int = DEFAULT_IDLE_TIMEOUT,
+        *,
+        adaptive: bool = False,
+        min_timeout: int = 0,
+        max_timeout: int = 0,
+        window: int = DEFAULT_WINDOW,
+    ) -> None:
+        self._default = default
+        self._adaptive = adaptive
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout or default
+        self._window = window
+        self._overrides: dict[str, int] = {}
+        self._gaps: dict[str, deque[float]] = {}
+        self._last_seen: dict[str, float] = {}
+        self._adapted: dict[str, float] = {}
+
+    @property
+    def default(self) -> int:
+        """Idle timeout for agents without an override or enough history."""
+        return self._default
+
+    def timeout(self, agent_id: str) -> float:
+        """Return the idle timeout of an agent in seconds.
+
+        Args:
+            agent_id: The agent ID to look up.
+        """
+        override = self._overrides.get(agent_id)
+        if override is not None:
+            return override
+        return self._adapted.get(agent_id, self._default)
+
+    def set_override(self, agent_id: str, seconds: int | None) -> None:
+        """Pin an agent's idle timeout, or clear the pin with None.
+
+        Args:
+            agent_id: The agent ID.
+            seconds: Idle timeout from the agent's spawn config.
+        """
+        if seconds is None:
+            self._overrides.pop(agent_id, None)
+        else:
+            self._overrides[agent_id] = seconds
+        idle_timeouts.set(self.timeout(agent_id), agent_id=agent_id)
+
+    def request_started(self, agent_id: str, *, concurrent: bool = False) -> None:
+        """Record a request arrival and the idle gap before it.
+
+        History is kept across stops of the agent, so gaps that ended in a
+        cold start are counted too.
+
+        Args:
+            agent_id: The agent ID the request is for.
+            concurrent: Another request is in flight, so the agent was not idle.
+        """
+        now = time.monotonic()
+        last_seen = self._last_seen.get(agent_id)
+        self._last_seen[agent_id] = now
+        if concurrent or last_seen is None or not self._adaptive:
+            return
+        gaps = self._gaps.setdefault(agent_id, deque(maxlen=self._window))
+        gaps.append(now - last_seen)
+        if len(gaps) >= MIN_SAMPLES:
+            self._adapted[agent_id] = self._adapt(gaps)
+            idle_timeouts.set(self.timeout(agent_id), agent_id=agent_id)
+
+    def request_ended(self, agent_id: str) -> None:
+        """Record the end of a request; the next idle gap starts here.
+
+        Args:
+            agent_id: The agent ID the request was for.
+        """
+        self._last_seen[agent_id] = time.monotonic()
+
+    def _adapt(self, gaps: deque[float]) -> float:
+        within = sorted(g for g in gaps if g <= self._max_timeout)
+        if len(within) * 2 < len(gaps):
+            return self._min_timeout
+        covering = within[max(0, math.ceil(COVERAGE * len(within)) - 1)]
+        return min(self._max_timeout, max(self._min_timeout, covering * HEADROOM))
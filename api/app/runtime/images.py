@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from app.metrics import metrics
+from app.runtime.exceptions import AgentRuntimeError, ImageNotFoundError, ImageNotReadyError
+from app.runtime.models import ImagePullStatus, ImageState
+
+if TYPE_CHECKING:
+    from app.broker.registry import AgentRegistry
+    from app.runtime.manager import RuntimeManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_INTERVAL = 60.0
+REGISTRY_PAGE_SIZE = 100
+
+image_pulls = metrics.counter("image_pulls_total", "Background image pulls by result")
+
+
+class ImagePrefetcher:
+    """Pulls agent images in the background and tracks whether each one is ready.
+
+    Spawns only check the tracked state, so a pull never runs inside a request;
+    an image that is not ready yet raises a retryable ImageNotReadyError.
+
+    Args:
+        runtime_manager: Runtime manager performing the pulls.
+        retry_interval: Seconds before a failed pull is retried on demand.
+    """
+
+    def __init__(self, runtime_manager: RuntimeManager, retry_interval: float = DEFAULT_RETRY_INTERVAL) -> None:
+        self._runtime = runtime_manager
+        self._retry_interval = retry_interval
+        self._states: dict[str, ImageState] = {}
+        self._failed_at: dict[str, float] = {}
+        self._pulls: dict[str, asyncio.Task] = {}
+
+    def state(self, image: str) -> ImageState:
+        """Return the pull state of an image.
+
+        Args:
+            image: Docker image reference.
+
+        Returns:
+            The tracked state; ``pending`` for images never requested.
+        """
+        return self._states.get(image) or ImageState(image=image, status=ImagePullStatus.PENDING)
+
+    def prefetch(self, image: str) -> ImageState:
+        """Start pulling an image in the background unless it is ready or already pulling.
+
+        Args:
+            image: Docker image reference.
+
+        Returns:
+            The state of the image after scheduling.
+        """
+        state = self._states.get(image)
+        if state is not None and state.status in (ImagePullStatus.READY, ImagePullStatus.PULLING):
+            return state
+        if state is not None and time.monotonic() - self._failed_at.get(image, 0.0) < self._retry_interval:
+            return state
+        state = ImageState(image=image, status=ImagePullStatus.PULLING)
+        self._states[image] = state
+        task = self._pulls[image] = asyncio.create_task(self._pull(image))
+        task.add_done_callback(lambda _task: self._forget_pull(image, task))
+        return state
+
+    def prefetch_all(self, images: Iterable[str]) -> None:
+        """Start pulling every distinct image in the background.
+
+        Args:
+            images: Docker image references.
+        """
+        for image in set(images):
+            self.prefetch(image)
+
+    async def prefetch_registered(self, registry: AgentRegistry, extra_images: Iterable[str] = ()) -> None:
+        """Start pulling the images of all registered agents plus extra images.
+
+        Args:
+            registry: Agent registry to read spawn configs from.
+            extra_images: Additional images, such as templates and warm pool images.
+        """
+        images = set(extra_images)
+        offset = 0
+        while True:
+            agents = await registry.list_agents(offset=offset, limit=REGISTRY_PAGE_SIZE)
+            images.update(a.spawn_config.image for a in agents if a.spawn_config is not None)
+            if len(agents) < REGISTRY_PAGE_SIZE:
+                break
+            offset += REGISTRY_PAGE_SIZE
+        logger.info("Prefetching %d images", len(images))
+        self.prefetch_all(images)
+
+    def ensure_ready(self, image: str) -> None:
+        """Check that an image can be spawned from, scheduling a pull if needed.
+
+        Args:
+            image: Docker image reference.
+
+        Raises:
+            ImageNotReadyError: If the image is still being pulled.
+            ImageNotFoundError: If the last pull of the image failed.
+        """
+        state = self.state(image)
+        if state.status == ImagePullStatus.READY:
+            return
+        state = self.prefetch(image)
+        if state.status == ImagePullStatus.FAILED:
+            raise ImageNotFoundError(f"Image {image} could not be pulled: {state.error}")
+        raise ImageNotReadyError(f"Image {image} is being pulled, retry shortly")
+
+    async def wait_ready(self, image: str) -> None:
+        """Wait until an image can be spawned from, pulling it if needed.
+
+        For work outside the request path, such as booting permanent agents.
+
+        Args:
+            image: Docker image reference.
+
+        Raises:
+            ImageNotFoundError: If the image could not be pulled.
+        """
+        if self.prefetch(image).status == ImagePullStatus.PULLING:
+            # Shielded so a cancelled waiter does not cancel the pull for everyone else
+            await asyncio.shield(self._pulls[image])
+        self.ensure_ready(image)
+
+    def invalidate(self, image: str) -> None:
+        """Forget that an image is ready, e.g. after it was removed from the host, and pull it again.
+
+        Args:
+            image: Docker image reference.
+        """
+        self._states.pop(image, None)
+        self._failed_at.pop(image, None)
+        self.prefetch(image)
+
+    async def close(self) -> None:
+        """Cancel pulls in flight."""
+        tasks = list(self._pulls.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget_pull(self, image: str, task: asyncio.Task) -> None:
+        if self._pulls.get(image) is task:
+            del self._pulls[image]
+
+    async def _pull(self, image: str) -> None:
+        try:
+            await self._runtime.pull_image(image)
+        except AgentRuntimeError as e:
+            logger.warning("Failed to pull image %s: %s", image, e)
+            self._states[image] = ImageState(image=image, status=ImagePullStatus.FAILED, error=str(e))
+            self._failed_at[image] = time.monotonic()
+            image_pulls.inc(result="failed")
+            return
+        self._states[image] = ImageState(image=image, status=ImagePullStatus.READY)
+        self._failed_at.pop(image, None)
+        image_pulls.inc(result="ready")
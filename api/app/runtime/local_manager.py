@@ -0,0 +1,460 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import httpx
+
+from app.models import Agent, AgentStatus
+from app.runtime.cold_start import cold_start_phase
+from app.runtime.exceptions import AgentNotFoundError, AgentRuntimeError, AgentSpawnError, ImageNotFoundError
+from app.runtime.manager import (
+    PASSTHROUGH_ENV_KEYS,
+    POOL_CONTAINER_PREFIX,
+    STANDBY_BOOT_TIMEOUT,
+    STANDBY_CONFIGURE_PATH,
+    STANDBY_CONFIGURE_TIMEOUT,
+    STANDBY_POLL_INTERVAL,
+    RuntimeManager,
+    runtime_name,
+)
+from app.runtime.models import ManagedRuntime, SpawnAgentRequest
+
+logger = logging.getLogger(__name__)
+
+# The personal assistant server, installed as the ``src`` package of the workspace
+DEFAULT_COMMAND = (sys.executable, "-m", "src.server")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_API_BASE_URL = "http://localhost:8000"
+DEFAULT_AGENT_GATEWAY_URL = "http://localhost:8080"
+DEFAULT_BASE_PORT = 19000
+DEFAULT_MAX_PORTS = 1000
+STOP_TIMEOUT = 10.0
+
+
+@dataclass
+class _Process:
+    agent: Agent
+    process: asyncio.subprocess.Process
+    port: int
+    paused: bool = False
+    config_hash: str = ""
+    exited: asyncio.Event = field(default_factory=asyncio.Event)
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @property
+    def status(self) -> AgentStatus:
+        if self.exited.is_set():
+            return AgentStatus.STOPPED
+        return AgentStatus.PAUSED if self.paused else AgentStatus.RUNNING
+
+
+class LocalProcessRuntimeManager(RuntimeManager):
+    """Runs agents as supervised local subprocesses instead of containers.
+
+    Each agent is started from ``command`` in its own process group on a port
+    allocated from ``base_port``, and is named like its container would be.
+    Pausing sends SIGSTOP/SIGCONT to the group; stopping sends SIGTERM and
+    SIGKILL after ``STOP_TIMEOUT``. Exiting processes are reaped right away
+    and report stopped until removed by stop_agent, like exited containers.
+    Processes do not outlive the manager, and CPU and memory limits are not
+    enforced. POSIX only.
+
+    Args:
+        command: Command starting an agent server; it must honour ``AGENT_PORT``.
+        image_commands: Commands per image, overriding ``command``.
+        working_dir: Working directory of agent processes. Defaults to the API's.
+        host: Interface agents bind to and are reached on.
+        base_port: First port allocated to agents.
+        max_ports: Number of ports allocated to agents.
+        api_base_url: Base URL of the A4S API.
+        agent_gateway_url: Gateway URL for agent routing.
+    """
+
+    def __init__(
+        self,
+        command: list[str] | None = None,
+        image_commands: dict[str, list[str]] | None = None,
+        working_dir: str | None = None,
+        host: str = DEFAULT_HOST,
+        base_port: int = DEFAULT_BASE_PORT,
+        max_ports: int = DEFAULT_MAX_PORTS,
+        api_base_url: str = DEFAULT_API_BASE_URL,
+        agent_gateway_url: str = DEFAULT_AGENT_GATEWAY_URL,
+    ) -> None:
+        self._command = command or list(DEFAULT_COMMAND)
+        self._image_commands = image_commands or {}
+        self._working_dir = working_dir
+        self._host = host
+        self._ports = range(base_port, base_port + max_ports)
+        self._next_port = base_port
+        self._api_base_url = api_base_url
+        self._agent_gateway_url = agent_gateway_url
+        self._processes: dict[str, _Process] = {}
+        self._watchers: set[asyncio.Task] = set()
+
+    def _command_for(self, image: str) -> list[str]:
+        return self._image_commands.get(image, self._command)
+
+    def _base_environment(self, port: int) -> dict[str, str]:
+        environment = {
+            "A4S_API_URL": self._api_base_url,
+            "AGENT_PORT": str(port),
+            "AGENT_BIND_HOST": self._host,
+        }
+        for key in PASSTHROUGH_ENV_KEYS:
+            if os.environ.get(key):
+                environment[key] = os.environ[key]
+        return environment
+
+    def _agent_environment(self, request: SpawnAgentRequest) -> dict[str, str]:
+        return {
+            "AGENT_NAME": request.name,
+            "AGENT_ID": request.agent_id,
+            "AGENT_HOST": self._host,
+            "AGENT_MODEL_PROVIDER": request.model.provider.value,
+            "AGENT_MODEL_ID": request.model.model_id,
+            "AGENT_INSTRUCTION": request.instruction,
+            "AGENT_TOOLS": ",".join(request.tools),
+            "AGENT_MCP_TOOL_FILTER": request.mcp_tool_filter,
+            "A4S_AGENT_URL": f"{self._agent_gateway_url}/agents/{request.agent_id}/",
+        }
+
+    def _allocate_port(self) -> int:
+        in_use = {p.port for p in self._processes.values()}
+        for _ in self._ports:
+            port = self._next_port
+            self._next_port = port + 1 if port + 1 in self._ports else self._ports.start
+            if port not in in_use and self._port_free(port):
+                return port
+        raise AgentSpawnError(f"No free port in {self._ports.start}-{self._ports.stop - 1} for an agent process")
+
+    def _port_free(self, port: int) -> bool:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            # Like the agent servers, ignore connections of earlier processes lingering in TIME_WAIT
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind((self._host, port))
+            except OSError:
+                return False
+        return True
+
+    async def _launch(self, name: str, image: str, agent: Agent, environment: dict[str, str]) -> _Process:
+        command = self._command_for(image)
+        try:
+            with cold_start_phase("start"):
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    cwd=self._working_dir,
+                    env=os.environ | environment,
+                    start_new_session=True,
+                )
+        except OSError as e:
+            logger.error("Failed to start process for %s: %s", name, e)
+            raise AgentSpawnError(f"Failed to start process for {name}: {e}") from e
+        record = _Process(agent=agent, process=process, port=agent.port)
+        self._processes[name] = record
+        watcher = asyncio.create_task(self._watch(record))
+        self._watchers.add(watcher)
+        watcher.add_done_callback(self._watchers.discard)
+        return record
+
+    async def _watch(self, record: _Process) -> None:
+        returncode = await record.process.wait()
+        record.exited.set()
+        logger.info("Agent process %s (pid %d) exited with %d", record.agent.id, record.process.pid, returncode)
+
+    def _signal(self, record: _Process, sig: signal.Signals) -> None:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(record.process.pid, sig)
+
+    def _get(self, agent_id: str) -> _Process:
+        record = self._processes.get(agent_id)
+        if record is None:
+            raise AgentNotFoundError(f"Agent {agent_id} not found")
+        return record
+
+    async def pull_image(self, image: str) -> None:
+        """Check that the command an image maps to can be run; nothing is pulled.
+
+        Args:
+            image: Docker image reference of the agent.
+
+        Raises:
+            ImageNotFoundError: If the command is not an executable.
+        """
+        executable = self._command_for(image)[0]
+        if shutil.which(executable) is None:
+            raise ImageNotFoundError(f"Command {executable} for image {image} not found")
+
+    async def spawn_agent(self, request: SpawnAgentRequest) -> Agent:
+        """Start an agent process, reusing a live one with the same spawn config.
+
+        A live process with a different config is replaced.
+
+        Args:
+            request: Agent spawn configuration.
+
+        Returns:
+            Agent metadata for the spawned or reused process.
+
+        Raises:
+            AgentSpawnError: If the process fails to start.
+        """
+        name = runtime_name(request.agent_id, request.replica)
+        config_hash = request.config_hash()
+        existing = self._processes.get(name)
+        if existing is not None and not existing.exited.is_set():
+            if existing.config_hash == config_hash:
+                await self.unpause_agent(name)
+                return existing.agent
+            logger.info("Replacing agent process %s, its spawn config changed", name)
+            await self.stop_agent(name)
+        self._processes.pop(name, None)
+
+        port = self._allocate_port()
+        agent = Agent(
+            id=request.agent_id,
+            name=request.name,
+            description=request.description,
+            version=request.version,
+            url=f"http://{self._host}:{port}",
+            port=port,
+            status=AgentStatus.RUNNING,
+        )
+        environment = self._base_environment(port) | self._agent_environment(request)
+        record = await self._launch(name, request.image, agent, environment)
+        record.config_hash = config_hash
+        logger.info("Spawned agent %s (pid %d, port %d)", request.name, record.process.pid, port)
+        return agent
+
+    async def create_standby(self, image: str) -> str:
+        """Start a pre-booted agent process for an image and wait until it is booted.
+
+        Args:
+            image: Docker image reference of the agent.
+
+        Returns:
+            Name of the standby process.
+
+        Raises:
+            AgentSpawnError: If the process fails to start or boot.
+        """
+        standby_id = f"{POOL_CONTAINER_PREFIX}{uuid4().hex[:12]}"
+        port = self._allocate_port()
+        agent = Agent(
+            id=standby_id,
+            name=standby_id,
+            description="",
+            version="",
+            url=f"http://{self._host}:{port}",
+            port=port,
+            status=AgentStatus.RUNNING,
+        )
+        environment = self._base_environment(port) | {"AGENT_STANDBY": "true"}
+        record = await self._launch(standby_id, image, agent, environment)
+
+        deadline = time.monotonic() + STANDBY_BOOT_TIMEOUT
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            while time.monotonic() < deadline and not record.exited.is_set():
+                try:
+                    resp = await client.get(f"{agent.url}{STANDBY_CONFIGURE_PATH}")
+                    if resp.status_code == 200:
+                        logger.info("Standby process %s booted for image %s", standby_id, image)
+                        return standby_id
+                except httpx.RequestError:
+                    pass
+                await asyncio.sleep(STANDBY_POLL_INTERVAL)
+
+        await self.stop_agent(standby_id)
+        raise AgentSpawnError(f"Standby process for image {image} did not boot in time")
+
+    async def claim_standby(self, standby_id: str, request: SpawnAgentRequest) -> Agent:
+        """Configure a standby process as the given agent and give it the agent's name.
+
+        Args:
+            standby_id: Name of the standby process returned by create_standby.
+            request: Agent spawn configuration.
+
+        Returns:
+            Agent metadata for the claimed process.
+
+        Raises:
+            AgentSpawnError: If the standby is gone or rejects the configuration.
+        """
+        record = self._processes.get(standby_id)
+        if record is None or record.exited.is_set():
+            raise AgentSpawnError(f"Standby process {standby_id} is not running")
+        name = runtime_name(request.agent_id, request.replica)
+        existing = self._processes.get(name)
+        if existing is not None and not existing.exited.is_set():
+            raise AgentSpawnError(f"Agent {request.agent_id} is already running")
+        try:
+            async with httpx.AsyncClient(timeout=STANDBY_CONFIGURE_TIMEOUT) as client:
+                resp = await client.post(
+                    f"{record.agent.url}{STANDBY_CONFIGURE_PATH}", json=self._agent_environment(request)
+                )
+                resp.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("Failed to configure standby %s as agent %s: %s", standby_id, request.agent_id, e)
+            raise AgentSpawnError(f"Failed to configure standby process for agent {request.name}: {e}") from e
+
+        del self._processes[standby_id]
+        record.agent = record.agent.model_copy(
+            update={
+                "id": request.agent_id,
+                "name": request.name,
+                "description": request.description,
+                "version": request.version,
+            }
+        )
+        record.config_hash = request.config_hash()
+        self._processes[name] = record
+        logger.info("Claimed standby process %s for agent %s", standby_id, request.name)
+        return record.agent
+
+    async def stop_agent(self, agent_id: str) -> Agent:
+        """Terminate an agent process and forget it.
+
+        Args:
+            agent_id: Process name, as returned for containers.
+
+        Returns:
+            Agent metadata with stopped status.
+
+        Raises:
+            AgentNotFoundError: If no such process is managed.
+        """
+        record = self._get(agent_id)
+        if not record.exited.is_set():
+            if record.paused:
+                self._signal(record, signal.SIGCONT)
+            self._signal(record, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(record.exited.wait(), STOP_TIMEOUT)
+            except TimeoutError:
+                logger.warning("Agent process %s did not terminate, killing it", agent_id)
+                self._signal(record, signal.SIGKILL)
+                await record.exited.wait()
+        if self._processes.get(agent_id) is record:
+            del self._processes[agent_id]
+        logger.info("Stopped agent %s", agent_id)
+        return record.agent.model_copy(update={"url": "", "port": 0, "status": AgentStatus.STOPPED})
+
+    async def pause_agent(self, agent_id: str) -> None:
+        """Suspend an agent process group; it keeps its memory but uses no CPU.
+
+        Args:
+            agent_id: Process name.
+
+        Raises:
+            AgentNotFoundError: If no such process is managed.
+            AgentRuntimeError: If the process has exited.
+        """
+        record = self._get(agent_id)
+        if record.exited.is_set():
+            raise AgentRuntimeError(f"Failed to pause agent {agent_id}: process has exited")
+        self._signal(record, signal.SIGSTOP)
+        record.paused = True
+        logger.info("Paused agent %s", agent_id)
+
+    async def unpause_agent(self, agent_id: str) -> None:
+        """Resume a suspended agent process group.
+
+        Args:
+            agent_id: Process name.
+
+        Raises:
+            AgentNotFoundError: If no such process is managed.
+            AgentRuntimeError: If the process has exited.
+        """
+        record = self._get(agent_id)
+        if record.exited.is_set():
+            raise AgentRuntimeError(f"Failed to unpause agent {agent_id}: process has exited")
+        if record.paused:
+            self._signal(record, signal.SIGCONT)
+            record.paused = False
+            logger.info("Unpaused agent %s", agent_id)
+
+    async def wait_for_exit(self, agent_id: str) -> None:
+        """Return once an agent process has exited or is no longer managed.
+
+        Args:
+            agent_id: Process name.
+        """
+        record = self._processes.get(agent_id)
+        if record is not None:
+            await record.exited.wait()
+
+    async def get_agent_endpoint(self, agent_id: str) -> str:
+        """Return the local URL of an agent process.
+
+        Args:
+            agent_id: Process name.
+
+        Returns:
+            Base URL of the agent server.
+
+        Raises:
+            AgentNotFoundError: If no such process is managed.
+        """
+        return self._get(agent_id).agent.url
+
+    async def list_agents(self) -> list[Agent]:
+        """List running and paused agent processes.
+
+        Returns:
+            List of agent metadata, excluding warm pool processes.
+        """
+        return [
+            record.agent.model_copy(update={"status": record.status})
+            for name, record in self._processes.items()
+            if not name.startswith(POOL_CONTAINER_PREFIX) and not record.exited.is_set()
+        ]
+
+    async def list_runtimes(self) -> list[ManagedRuntime]:
+        """List all agent and standby processes, including exited ones.
+
+        Returns:
+            The processes with their agent, status and start time.
+        """
+        return [
+            ManagedRuntime(
+                name=name,
+                agent_id=None if name.startswith(POOL_CONTAINER_PREFIX) else record.agent.id,
+                status=record.status,
+                started_at=record.started_at,
+            )
+            for name, record in self._processes.items()
+        ]
+
+    async def get_agent_status(self, agent_id: str) -> AgentStatus:
+        """Get the status of an agent process.
+
+        Args:
+            agent_id: Process name.
+
+        Returns:
+            Current status of the agent.
+
+        Raises:
+            AgentNotFoundError: If no such process is managed.
+        """
+        return self._get(agent_id).status
+
+    async def close(self) -> None:
+        """Stop all agent processes; they cannot be adopted by another API process."""
+        await asyncio.gather(*(self.stop_agent(name) for name in list(self._processes)), return_exceptions=True)
+        for watcher in self._watchers:
+            watcher.cancel()
+        await asyncio.gather(*self._watchers, return_exceptions=True)
@@ -1,28 +1,111 @@
+import asyncio
 from abc import ABC, abstractmethod
 
+import httpx
+
 from app.models import Agent, AgentStatus
-from app.runtime.models import SpawnAgentRequest
+from app.runtime.exceptions import AgentNotFoundError
+from app.runtime.models import ManagedRuntime, SpawnAgentRequest
+
+EXIT_POLL_INTERVAL = 1.0
+CONTAINER_NAME_PREFIX = "a4s-agent-"
+POOL_CONTAINER_PREFIX = "a4s-pool-"
+STANDBY_CONFIGURE_PATH = "/_a4s/configure"
+STANDBY_BOOT_TIMEOUT = 120.0
+STANDBY_POLL_INTERVAL = 0.2
+STANDBY_CONFIGURE_TIMEOUT = httpx.Timeout(timeout=30.0, connect=5.0)
+PASSTHROUGH_ENV_KEYS = ("GOOGLE_API_KEY", "OPENAI_API_KEY", "OPENROUTER_API_KEY", "GITHUB_TOKEN", "LINEAR_API_KEY")
+# Agent IDs end in a hyphenated hash, so a dot followed by digits only ever marks a replica
+REPLICA_SEPARATOR = "."
+
+
+def runtime_name(agent_id: str, replica: int = 0) -> str:
+    """Return the runtime name of an agent replica; replica 0 is the agent's primary runtime."""
+    name = f"{CONTAINER_NAME_PREFIX}{agent_id}"
+    return name if replica == 0 else f"{name}{REPLICA_SEPARATOR}{replica}"
+
+
+def parse_runtime_name(name: str) -> tuple[str, int]:
+    """Split an agent runtime name into the agent ID and replica index."""
+    agent_id = name.removeprefix(CONTAINER_NAME_PREFIX)
+    base, separator, replica = agent_id.rpartition(REPLICA_SEPARATOR)
+    if separator and replica.isdigit():
+        return base, int(replica)
+    return agent_id, 0
 
 
 class RuntimeManager(ABC):
-    """Managing lifecycle of AI agent runtimes."""
+    """Managing lifecycle of AI agent runtimes.
+
+    All methods are coroutines; implementations backed by blocking clients must
+    offload them so they never stall the event loop.
+    """
+
+    async def start(self) -> None:
+        """Start background work of the runtime manager, if any."""
+        return
 
     @abstractmethod
-    def spawn_agent(self, request: SpawnAgentRequest) -> Agent:
+    async def spawn_agent(self, request: SpawnAgentRequest) -> Agent:
         """Spawn a new agent runtime."""
 
     @abstractmethod
-    def stop_agent(self, agent_id: str) -> Agent:
+    async def pull_image(self, image: str) -> None:
+        """Make an image available to spawns ahead of time; spawns never pull themselves."""
+
+    async def create_standby(self, image: str) -> str | None:  # noqa: ARG002
+        """Start a pre-booted runtime for an image that is not yet bound to an agent.
+
+        Runtimes that support warm pools override this; the default returns None, meaning unsupported.
+        """
+        return None
+
+    async def claim_standby(self, standby_id: str, request: SpawnAgentRequest) -> Agent | None:  # noqa: ARG002
+        """Bind a standby runtime created by create_standby to an agent; None if standbys are unsupported."""
+        return None
+
+    @abstractmethod
+    async def stop_agent(self, agent_id: str) -> Agent:
         """Stop an agent runtime."""
 
     @abstractmethod
-    def list_agents(self) -> list[Agent]:
+    async def pause_agent(self, agent_id: str) -> None:
+        """Suspend a running agent runtime, keeping its memory state."""
+
+    @abstractmethod
+    async def unpause_agent(self, agent_id: str) -> None:
+        """Resume a runtime suspended by pause_agent."""
+
+    @abstractmethod
+    async def get_agent_endpoint(self, agent_id: str) -> str:
+        """Return the base URL at which the API reaches an agent runtime."""
+
+    @abstractmethod
+    async def list_agents(self) -> list[Agent]:
         """List all agent runtimes."""
 
     @abstractmethod
-    def get_agent_status(self, agent_id: str) -> AgentStatus:
+    async def list_runtimes(self) -> list[ManagedRuntime]:
+        """List every runtime owned by the manager, including standbys and exited runtimes."""
+
+    @abstractmethod
+    async def get_agent_status(self, agent_id: str) -> AgentStatus:
         """Get the status of an agent runtime."""
 
+    async def wait_for_exit(self, agent_id: str) -> None:
+        """Return once an agent runtime has exited or no longer exists.
+
+        The default polls get_agent_status; runtimes with an event stream override it.
+        """
+        while True:
+            try:
+                status = await self.get_agent_status(agent_id)
+            except AgentNotFoundError:
+                return
+            if status in (AgentStatus.STOPPED, AgentStatus.ERROR):
+                return
+            await asyncio.sleep(EXIT_POLL_INTERVAL)
+
     @abstractmethod
-    def close(self) -> None:
+    async def close(self) -> None:
         """Close the runtime manager and release resources."""
@@ -1,6 +1,26 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import UTC, datetime
+from enum import Enum
+
 from pydantic import BaseModel, Field
 
-from app.models import AgentModel
+from app.models import Agent, AgentModel, AgentStatus
+
+
+class ImagePullStatus(str, Enum):
+    PENDING = "pending"
+    PULLING = "pulling"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ImageState(BaseModel):
+    image: str = Field(description="The docker image reference.")
+    status: ImagePullStatus = Field(description="Whether the image is available to spawns.")
+    error: str | None = Field(default=None, description="Error of the last failed pull.")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Time of the last change.")
 
 
 class SpawnAgentRequest(BaseModel):
@@ -14,3 +34,51 @@ class SpawnAgentRequest(BaseModel):
     instruction: str = Field(description="The additional instruction of the agent.")
     tools: list[str] = Field(description="The enabled tools of the agent.")
     mcp_tool_filter: str = Field(default="", description="Comma-separated MCP tool names to expose.")
+    cpu_limit: float | None = Field(default=None, description="CPU cores the agent may use.")
+    memory_limit_mb: int | None = Field(default=None, description="Memory limit of the agent in MiB.")
+    replica: int = Field(default=0, description="Index of the replica; 0 is the agent's primary runtime.")
+
+    @classmethod
+    def from_agent(cls, agent: Agent, replica: int = 0) -> SpawnAgentRequest:
+        """Build a spawn request for a replica of a registered agent from its spawn config."""
+        return cls(
+            agent_id=agent.id,
+            name=agent.name,
+            image=agent.spawn_config.image,
+            version=agent.version,
+            port=agent.port,
+            model=agent.spawn_config.model,
+            description=agent.description,
+            instruction=agent.spawn_config.instruction,
+            tools=agent.spawn_config.tools,
+            mcp_tool_filter=agent.spawn_config.mcp_tool_filter,
+            cpu_limit=agent.spawn_config.cpu_limit,
+            memory_limit_mb=agent.spawn_config.memory_limit_mb,
+            replica=replica,
+        )
+
+    def config_hash(self) -> str:
+        """Return a digest of the spawn configuration; runtimes with the same digest can be reused."""
+        return hashlib.sha256(self.model_dump_json().encode()).hexdigest()[:16]
+
+
+class ColdStartBreakdown(BaseModel):
+    agent_id: str = Field(description="The agent that was cold started.")
+    image: str = Field(description="The docker image of the agent.")
+    total_ms: float = Field(description="Duration of the cold start in milliseconds.")
+    phases: dict[str, float] = Field(description="Duration of each phase in milliseconds, in the order they ran.")
+    finished_at: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Time the agent became ready.")
+
+
+class ColdStartPhaseStats(BaseModel):
+    count: int = Field(description="Number of cold starts that ran the phase.")
+    mean_ms: float = Field(description="Mean duration in milliseconds.")
+    p50_ms: float = Field(description="Estimated median duration in milliseconds.")
+    p95_ms: float = Field(description="Estimated 95th percentile duration in milliseconds.")
+
+
+class ManagedRuntime(BaseModel):
+    name: str = Field(description="Name of the container or process.")
+    agent_id: str | None = Field(default=None, description="The agent it runs; None for unclaimed standbys.")
+    status: AgentStatus = Field(description="Current status of the runtime.")
+    started_at: datetime | None = Field(default=None, description="Time the runtime was last started.")
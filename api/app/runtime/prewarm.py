@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from enum import Enum
+
+from app.metrics import metrics
+from app.runtime.activity_history import SqliteActivityHistory, bucket_of
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60.0
+DEFAULT_LEAD_TIME = 600
+DEFAULT_THRESHOLD = 0.5
+
+prewarms = metrics.counter("agent_prewarms_total", "Predictive agent warm-ups by result")
+expected_agents_gauge = metrics.gauge("agent_prewarm_expected_agents", "Agents inside a predicted demand window")
+
+
+class WarmResult(str, Enum):
+    """Outcome of warming one expected agent."""
+
+    STARTED = "started"
+    ALREADY_RUNNING = "already_running"
+    SKIPPED_CAPACITY = "skipped_capacity"
+
+
+class Prewarmer:
+    """Warms agents ahead of the demand windows predicted from their activity history.
+
+    Every ``interval`` seconds the current hour and the hour ``lead_time``
+    seconds ahead are scored. Agents at or above ``threshold`` in either are
+    expected; the ``max_agents`` highest-scoring ones are started and kept
+    from being paused or reaped until their window passes.
+
+    Args:
+        history: Activity history to predict from.
+        warm: Starts an agent and reports the outcome; called for every expected agent each round.
+        max_agents: Capacity budget of agents kept warm by prediction.
+        lead_time: Seconds ahead of a demand window to start warming.
+        threshold: Minimum demand score for an agent to be warmed.
+        interval: Seconds between predictions.
+    """
+
+    def __init__(
+        self,
+        history: SqliteActivityHistory,
+        warm: Callable[[str], Awaitable[WarmResult]],
+        max_agents: int,
+        lead_time: int = DEFAULT_LEAD_TIME,
+        threshold: float = DEFAULT_THRESHOLD,
+        interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        self._history = history
+        self._warm = warm
+        self._max_agents = max_agents
+        self._lead_time = lead_time
+        self._threshold = threshold
+        self._interval = interval
+        self._expected: frozenset[str] = frozenset()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def expected_agents(self) -> frozenset[str]:
+        """Agents currently inside a predicted demand window."""
+        return self._expected
+
+    def start(self) -> None:
+        """Start predicting and warming in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(
+                "Started prewarmer (max_agents=%d, lead_time=%ds, threshold=%.2f)",
+                self._max_agents,
+                self._lead_time,
+                self._threshold,
+            )
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def run_once(self) -> None:
+        """Predict the expected agents and warm them."""
+        now = time.time()
+        scores: dict[str, float] = {}
+        for bucket in {bucket_of(now), bucket_of(now + self._lead_time)}:
+            for agent_id, score in (await self._history.demand_scores(bucket)).items():
+                scores[agent_id] = max(score, scores.get(agent_id, 0.0))
+        ranked = sorted((a for a, s in scores.items() if s >= self._threshold), key=scores.__getitem__, reverse=True)
+        self._expected = frozenset(ranked[: self._max_agents])
+        expected_agents_gauge.set(len(self._expected))
+        if len(ranked) > self._max_agents:
+            logger.info("Prewarm budget of %d agents exceeded by %d expected agents", self._max_agents, len(ranked))
+
+        results = await asyncio.gather(*(self._warm_one(agent_id) for agent_id in self._expected))
+        started = sum(results)
+        if started:
+            logger.info("Prewarmed %d of %d expected agents", started, len(self._expected))
+
+    async def _warm_one(self, agent_id: str) -> bool:
+        try:
+            result = await self._warm(agent_id)
+        except Exception:
+            logger.exception("Failed to prewarm agent %s", agent_id)
+            prewarms.inc(result="failed")
+            return False
+        prewarms.inc(result=result.value)
+        return result == WarmResult.STARTED
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error in prewarm loop")
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import math
+
+from app.metrics import metrics
+from app.models import SpawnConfig
+
+# Seconds load must stay low before surplus replicas are stopped, so bursts do not churn replicas
+SCALE_DOWN_DELAY = 60.0
+
+replica_counts = metrics.gauge("agent_replicas", "Ready replicas of a serverless agent")
+replica_scaling = metrics.counter("agent_replica_scaling_total", "Replicas started or stopped by direction and result")
+
+
+class ReplicaSet:
+    """Replicas of one serverless agent; replica 0 is the agent's primary runtime.
+
+    The desired number of replicas follows the requests in flight: one replica
+    per ``replica_concurrency`` requests, within ``min_replicas`` and
+    ``max_replicas``. Requests go to the ready replica with the fewest requests
+    in flight.
+
+    Args:
+        agent_id: The agent the replicas serve.
+        spawn_config: Spawn config holding the replica bounds.
+    """
+
+    def __init__(self, agent_id: str, spawn_config: SpawnConfig) -> None:
+        self.agent_id = agent_id
+        self.ready: set[int] = {0}
+        self.starting: set[int] = set()
+        self.stopping: set[int] = set()
+        self.low_since: float | None = None
+        self.configure(spawn_config)
+
+    def configure(self, spawn_config: SpawnConfig) -> None:
+        """Apply the replica bounds of a possibly updated spawn config."""
+        self.min_replicas = spawn_config.min_replicas
+        self.max_replicas = max(spawn_config.max_replicas, spawn_config.min_replicas)
+        self.concurrency = spawn_config.replica_concurrency
+
+    def pick(self, load: dict[int, int]) -> int:
+        """Return the ready replica with the fewest requests in flight, preferring lower indices."""
+        return min(self.ready - self.stopping, key=lambda replica: (load.get(replica, 0), replica))
+
+    def desired(self, in_flight: int) -> int:
+        """Return how many replicas the agent should run for the given requests in flight."""
+        return min(self.max_replicas, max(self.min_replicas, math.ceil(in_flight / self.concurrency)))
+
+    def next_index(self) -> int:
+        """Return the lowest replica index that is free."""
+        used = self.ready | self.starting
+        return next(i for i in range(1, len(used) + 2) if i not in used)
+
+    def surplus(self, desired: int, load: dict[int, int]) -> list[int]:
+        """Return idle extra replicas beyond ``desired``, highest index first."""
+        active = self.ready - self.stopping
+        idle = sorted((r for r in active if r != 0 and not load.get(r)), reverse=True)
+        return idle[: max(0, len(active) - desired)]
+
+    def report(self) -> None:
+        replica_counts.set(len(self.ready), agent_id=self.agent_id)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+import httpx
+
+from app.metrics import metrics
+from app.models import Agent, AgentMode, AgentStatus
+from app.runtime.exceptions import AgentNotFoundError
+from app.runtime.manager import runtime_name
+
+if TYPE_CHECKING:
+    from app.broker.registry import AgentRegistry
+    from app.runtime.manager import RuntimeManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 30.0
+DEFAULT_UNHEALTHY_THRESHOLD = 3
+HEALTH_TIMEOUT = 5.0
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 300.0
+REGISTRY_PAGE_SIZE = 100
+
+restarts = metrics.counter("permanent_agent_restarts_total", "Permanent agent boots and restarts by reason and result")
+healthy_agents = metrics.gauge("permanent_agents_healthy", "Permanent agents that passed their last health check")
+
+
+class PermanentAgentSupervisor:
+    """Keeps permanent agents running.
+
+    The first round boots every registered permanent agent concurrently; later
+    rounds every ``interval`` seconds health-check them the same way. An agent
+    whose runtime is missing or exited, or that fails ``unhealthy_threshold``
+    consecutive health checks, is restarted. Failed restarts back off
+    exponentially up to ``MAX_BACKOFF`` seconds and are retried as soon as
+    their backoff has passed, without waiting for the next round.
+
+    Args:
+        runtime_manager: Runtime manager to inspect agent runtimes with.
+        registry: Agent registry listing the permanent agents.
+        boot: Replaces an agent's runtime with a fresh one and waits until it is ready.
+        interval: Seconds between rounds.
+        unhealthy_threshold: Consecutive failed health checks before a running agent is restarted.
+        skip: Returns whether an agent is left alone this round, such as while its runtime is being replaced.
+    """
+
+    def __init__(
+        self,
+        runtime_manager: RuntimeManager,
+        registry: AgentRegistry,
+        boot: Callable[[Agent], Awaitable[None]],
+        interval: float = DEFAULT_CHECK_INTERVAL,
+        unhealthy_threshold: int = DEFAULT_UNHEALTHY_THRESHOLD,
+        skip: Callable[[str], bool] | None = None,
+    ) -> None:
+        self._runtime = runtime_manager
+        self._registry = registry
+        self._boot = boot
+        self._interval = interval
+        self._unhealthy_threshold = unhealthy_threshold
+        self._skip = skip
+        self._http = httpx.AsyncClient(timeout=HEALTH_TIMEOUT)
+        self._unhealthy: dict[str, int] = {}
+        self._failures: dict[str, int] = {}
+        self._next_attempt: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Boot permanent agents and supervise them in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info("Started permanent agent supervisor (interval=%gs)", self._interval)
+
+    async def stop(self) -> None:
+        """Stop supervising; running agents are left running."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._http.aclose()
+
+    async def run_once(self) -> None:
+        """Check every permanent agent concurrently and restart the ones that are down."""
+        agents = await self._permanent_agents()
+        results = await asyncio.gather(*(self._supervise(agent) for agent in agents))
+        healthy_agents.set(sum(results))
+
+    async def _permanent_agents(self) -> list[Agent]:
+        agents = []
+        offset = 0
+        while True:
+            page = await self._registry.list_agents(offset=offset, limit=REGISTRY_PAGE_SIZE)
+            agents.extend(a for a in page if a.mode == AgentMode.PERMANENT and a.spawn_config is not None)
+            if len(page) < REGISTRY_PAGE_SIZE:
+                return agents
+            offset += REGISTRY_PAGE_SIZE
+
+    async def _supervise(self, agent: Agent) -> bool:
+        """Check one agent, restarting it if needed; returns whether it is healthy."""
+        if self._skip is not None and self._skip(agent.id):
+            return True
+        try:
+            reason = await self._check(agent)
+        except Exception:
+            logger.exception("Failed to check permanent agent %s", agent.id)
+            return False
+        if reason is None:
+            return agent.id not in self._unhealthy
+        if time.monotonic() < self._next_attempt.get(agent.id, 0.0):
+            return False
+
+        logger.info("Starting permanent agent %s (%s)", agent.id, reason)
+        try:
+            await self._boot(agent)
+        except Exception as e:
+            failures = self._failures[agent.id] = self._failures.get(agent.id, 0) + 1
+            backoff = min(MAX_BACKOFF, INITIAL_BACKOFF * 2 ** (failures - 1))
+            self._next_attempt[agent.id] = time.monotonic() + backoff
+            restarts.inc(reason=reason, result="failed")
+            logger.warning("Failed to start permanent agent %s, retrying in %gs: %s", agent.id, backoff, e)
+            return False
+        self._unhealthy.pop(agent.id, None)
+        self._failures.pop(agent.id, None)
+        self._next_attempt.pop(agent.id, None)
+        restarts.inc(reason=reason, result="started")
+        return True
+
+    async def _check(self, agent: Agent) -> str | None:
+        """Return why an agent needs to be (re)started, or None if it is healthy or still starting."""
+        name = runtime_name(agent.id)
+        try:
+            status = await self._runtime.get_agent_status(name)
+        except AgentNotFoundError:
+            return "missing"
+        if status == AgentStatus.PENDING:
+            return None
+        if status == AgentStatus.PAUSED:
+            await self._runtime.unpause_agent(name)
+        elif status != AgentStatus.RUNNING:
+            return "exited"
+
+        if await self._healthy(name):
+            self._unhealthy.pop(agent.id, None)
+            return None
+        failed_checks = self._unhealthy[agent.id] = self._unhealthy.get(agent.id, 0) + 1
+        logger.warning("Permanent agent %s failed health check %d", agent.id, failed_checks)
+        return "unhealthy" if failed_checks >= self._unhealthy_threshold else None
+
+    async def _healthy(self, name: str) -> bool:
+        try:
+            resp = await self._http.get(await self._runtime.get_agent_endpoint(name))
+        except httpx.RequestError:
+            return False
+        return resp.status_code < 500
+
+    async def _retry_due(self) -> None:
+        """Retry the agents whose failed start has backed off until now."""
+        now = time.monotonic()
+        due = {agent_id for agent_id, at in self._next_attempt.items() if at <= now}
+        if due:
+            agents = [agent for agent in await self._permanent_agents() if agent.id in due]
+            await asyncio.gather(*(self._supervise(agent) for agent in agents))
+
+    def _until_next_wakeup(self, next_round: float) -> float:
+        """Return seconds until the next round, or until the next retry of a failed start if sooner."""
+        now = time.monotonic()
+        wakeup = min([next_round, *(at for at in self._next_attempt.values() if at > now)])
+        return max(0.0, wakeup - now)
+
+    async def _loop(self) -> None:
+        next_round = time.monotonic()
+        while True:
+            try:
+                if time.monotonic() >= next_round:
+                    next_round = time.monotonic() + self._interval
+                    await self.run_once()
+                else:
+                    await self._retry_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error in permanent agent supervisor")
+            await asyncio.sleep(self._until_next_wakeup(next_round))
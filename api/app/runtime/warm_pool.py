@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+from collections import deque
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from app.metrics import metrics
+from app.runtime.exceptions import AgentRuntimeError, ImageNotReadyError
+
+if TYPE_CHECKING:
+    from app.runtime.manager import RuntimeManager
+
+logger = logging.getLogger(__name__)
+
+IMAGE_RETRY_DELAY = 5.0
+MAX_BOOT_ATTEMPTS = 3
+BOOT_RETRY_DELAY = 1.0
+
+pool_claims = metrics.counter("warm_pool_claims_total", "Cold starts by warm pool result (hit or miss)")
+pool_ready = metrics.gauge("warm_pool_ready", "Booted standby containers waiting to be claimed, by image")
+
+
+class WarmPool:
+    """Keeps pre-booted standby runtimes per image for fast cold starts.
+
+    Every configured image gets ``size`` standby runtimes; claimed runtimes are
+    replaced in the background. Only configured images are pooled, as standbys
+    need an image that implements the standby configure endpoint. A failed
+    standby boot is retried up to ``MAX_BOOT_ATTEMPTS`` times with exponential
+    backoff.
+
+    Args:
+        runtime_manager: Runtime manager creating the standby runtimes.
+        size: Number of standby runtimes kept per image.
+        images: Images that support standby boot, pooled from start.
+    """
+
+    def __init__(self, runtime_manager: RuntimeManager, size: int, images: Iterable[str] = ()) -> None:
+        self._runtime = runtime_manager
+        self._size = size
+        self._images = set(images)
+        self._ready: dict[str, deque[str]] = {}
+        self._booting: dict[str, int] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._supported = True
+
+    def start(self) -> None:
+        """Start filling the pool for the configured images."""
+        for image in self._images:
+            self.refill(image)
+        logger.info("Started warm pool (size=%d, images=%s)", self._size, sorted(self._images))
+
+    def claim(self, image: str) -> str | None:
+        """Take a booted standby runtime for a configured image, if one is ready.
+
+        Args:
+            image: Image the agent runs.
+
+        Returns:
+            ID of the standby runtime, or None if the image is not pooled or has none ready.
+        """
+        if image not in self._images:
+            return None
+        ready = self._ready.get(image)
+        standby_id = ready.popleft() if ready else None
+        pool_claims.inc(result="hit" if standby_id is not None else "miss")
+        pool_ready.set(len(ready or ()), image=image)
+        self.refill(image)
+        return standby_id
+
+    def refill(self, image: str) -> None:
+        """Boot standby runtimes in the background until the image's pool is full.
+
+        Args:
+            image: Image to refill.
+        """
+        if not self._supported or image not in self._images:
+            return
+        missing = self._size - len(self._ready.get(image, ())) - self._booting.get(image, 0)
+        for _ in range(missing):
+            self._booting[image] = self._booting.get(image, 0) + 1
+            # A fresh context keeps standby boots out of the cold start trace of the claiming request
+            task = asyncio.create_task(self._boot(image), context=contextvars.Context())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """Stop refilling and remove all unclaimed standby runtimes."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        standby_ids = [standby_id for ready in self._ready.values() for standby_id in ready]
+        self._ready.clear()
+        for standby_id in standby_ids:
+            with contextlib.suppress(AgentRuntimeError):
+                await self._runtime.stop_agent(standby_id)
+        logger.info("Stopped warm pool")
+
+    async def _boot(self, image: str) -> None:
+        try:
+            standby_id = await self._create_standby(image)
+            if standby_id is None:
+                return
+            self._ready.setdefault(image, deque()).append(standby_id)
+            pool_ready.set(len(self._ready[image]), image=image)
+        finally:
+            self._booting[image] -= 1
+
+    async def _create_standby(self, image: str) -> str | None:
+        """Boot a standby, waiting for the image and retrying failures; None if it cannot be booted."""
+        attempt = 1
+        while True:
+            try:
+                standby_id = await self._runtime.create_standby(image)
+            except ImageNotReadyError:
+                logger.debug("Image %s not pulled yet, retrying standby boot", image)
+                await asyncio.sleep(IMAGE_RETRY_DELAY)
+                continue
+            except AgentRuntimeError as e:
+                if attempt >= MAX_BOOT_ATTEMPTS:
+                    logger.error("Failed to boot standby runtime for image %s after %d attempts: %s", image, attempt, e)
+                    return None
+                delay = BOOT_RETRY_DELAY * 2 ** (attempt - 1)
+                logger.warning("Failed to boot standby runtime for image %s, retrying in %gs: %s", image, delay, e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            if standby_id is None:
+                logger.warning("Runtime does not support standby runtimes, disabling warm pool")
+                self._supported = False
+            return standby_id
@@ -16,18 +16,40 @@ from app.broker.exceptions import (
 )
 from app.broker.qdrant_registry import QdrantAgentRegistry
 from app.broker.sqlite_channel_registry import SqliteChannelRegistry
+from app.chat.exceptions import ChatJobCapacityError, ChatJobNotFoundError, IdempotencyKeyConflictError
+from app.chat.idempotency import IdempotencyStore
+from app.chat.jobs import ChatJobStore
+from app.chat.roster import ChannelRosterCache
 from app.config import config
 from app.memory.factory import create_memory_manager
 from app.models import Agent, AgentMode, AgentModel, AgentStatus, SpawnConfig
-from app.routers import health_router, v1_router
+from app.routers import gateway_router, health_router, v1_router
+from app.routers.gateway import create_gateway_client
+from app.routers.v1.template_agents import get_template_agents
+from app.runtime.activity_history import SqliteActivityHistory
 from app.runtime.agent_scheduler import AgentScheduler
-from app.runtime.docker_manager import DockerRuntimeManager
-from app.runtime.exceptions import AgentNotFoundError, AgentSpawnError, ImageNotFoundError
+from app.runtime.capacity import CapacityBudget
+from app.runtime.exceptions import (
+    AgentNotFoundError,
+    AgentSpawnError,
+    AgentStartupError,
+    AgentUpdateInProgressError,
+    CapacityExceededError,
+    ImageNotFoundError,
+    ImageNotReadyError,
+)
+from app.runtime.factory import create_runtime_manager
+from app.runtime.idle_timeout import IdleTimeoutPolicy
+from app.runtime.images import ImagePrefetcher
+from app.runtime.warm_pool import WarmPool
 from app.skills import exceptions as skills_exc
 from app.skills.sqlite_registry import SqliteSkillsRegistry
 
 logger = logging.getLogger(__name__)
 
+IMAGE_NOT_READY_RETRY_AFTER = 2
+CAPACITY_EXCEEDED_RETRY_AFTER = 5
+
 fastapi_app = FastAPI(title="A4S API")
 
 fastapi_app.add_middleware(
@@ -40,6 +62,8 @@ fastapi_app.add_middleware(
 
 fastapi_app.include_router(health_router)
 fastapi_app.include_router(v1_router)
+if config.agent_gateway_enabled:
+    fastapi_app.include_router(gateway_router)
 
 
 @fastapi_app.exception_handler(AgentNotFoundError)
@@ -52,11 +76,39 @@ async def agent_spawn_error_handler(_request: Request, exc: AgentSpawnError) ->
     return JSONResponse(status_code=500, content={"detail": str(exc)})
 
 
+@fastapi_app.exception_handler(AgentUpdateInProgressError)
+async def agent_update_in_progress_handler(_request: Request, exc: AgentUpdateInProgressError) -> JSONResponse:
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
+@fastapi_app.exception_handler(AgentStartupError)
+async def agent_startup_error_handler(_request: Request, exc: AgentStartupError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
 @fastapi_app.exception_handler(ImageNotFoundError)
 async def image_not_found_handler(_request: Request, exc: ImageNotFoundError) -> JSONResponse:
     return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
+@fastapi_app.exception_handler(ImageNotReadyError)
+async def image_not_ready_handler(_request: Request, exc: ImageNotReadyError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(IMAGE_NOT_READY_RETRY_AFTER)},
+    )
+
+
+@fastapi_app.exception_handler(CapacityExceededError)
+async def capacity_exceeded_handler(_request: Request, exc: CapacityExceededError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(CAPACITY_EXCEEDED_RETRY_AFTER)},
+    )
+
+
 @fastapi_app.exception_handler(AgentNotRegisteredError)
 async def agent_not_registered_handler(_request: Request, exc: AgentNotRegisteredError) -> JSONResponse:
     return JSONResponse(status_code=404, content={"detail": str(exc)})
@@ -111,6 +163,21 @@ async def channel_registry_error_handler(_request: Request, exc: ChannelRegistry
     return JSONResponse(status_code=500, content={"detail": str(exc)})
 
 
+@fastapi_app.exception_handler(ChatJobNotFoundError)
+async def chat_job_not_found_handler(_request: Request, exc: ChatJobNotFoundError) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@fastapi_app.exception_handler(ChatJobCapacityError)
+async def chat_job_capacity_error_handler(_request: Request, exc: ChatJobCapacityError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@fastapi_app.exception_handler(IdempotencyKeyConflictError)
+async def idempotency_key_conflict_handler(_request: Request, exc: IdempotencyKeyConflictError) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
+
+
 async def _ensure_backbone_agent(registry: QdrantAgentRegistry) -> None:
     agent_id = config.backbone_agent_id
     try:
@@ -150,19 +217,58 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         url=config.qdrant_url,
         collection_name=config.registry_qdrant_collection,
     )
-    runtime_manager = DockerRuntimeManager(
-        api_base_url=config.api_base_url,
-        agent_gateway_url=config.agent_gateway_url,
-        network_name=config.agent_network,
-    )
+    runtime_manager = create_runtime_manager(config)
+    await runtime_manager.start()
+    image_prefetcher = ImagePrefetcher(runtime_manager)
     skills_registry = await SqliteSkillsRegistry.create(config.skills_db_path)
-    channel_registry = await SqliteChannelRegistry.create(config.channel_db_path)
+    channel_registry = await SqliteChannelRegistry.create(config.channel_db_path, cache_size=config.channel_cache_size)
     memory_manager = await create_memory_manager(config)
+    chat_job_store = ChatJobStore(ttl_seconds=config.chat_job_ttl, max_jobs=config.chat_job_max_jobs)
+    roster_cache = ChannelRosterCache(registry, excluded_agent_ids={config.backbone_agent_id})
+    idempotency_store = IdempotencyStore(
+        ttl_seconds=config.chat_idempotency_ttl,
+        max_entries=config.chat_idempotency_max_entries,
+    )
+    activity_history = await SqliteActivityHistory.create(config.agent_activity_db_path)
+    activity_history.start()
+    warm_pool = (
+        WarmPool(runtime_manager, size=config.agent_warm_pool_size, images=config.agent_warm_pool_images)
+        if config.agent_warm_pool_size > 0
+        else None
+    )
     agent_scheduler = AgentScheduler(
         runtime_manager=runtime_manager,
         registry=registry,
-        idle_timeout=config.agent_idle_timeout,
+        idle_timeouts=IdleTimeoutPolicy(
+            config.agent_idle_timeout,
+            adaptive=config.agent_adaptive_idle_timeout,
+            min_timeout=config.agent_idle_timeout_min,
+            max_timeout=config.agent_idle_timeout_max,
+        ),
+        pause_timeout=config.agent_pause_timeout,
         reaper_interval=config.agent_reaper_interval,
+        reap_concurrency=config.agent_reap_concurrency,
+        warm_pool=warm_pool,
+        activity_history=activity_history,
+        prewarm_max_agents=config.agent_prewarm_max_agents,
+        prewarm_lead_time=config.agent_prewarm_lead_time,
+        prewarm_threshold=config.agent_prewarm_threshold,
+        image_prefetcher=image_prefetcher,
+        capacity=CapacityBudget(
+            max_agents=config.agent_max_running,
+            memory_budget_mb=config.agent_memory_budget_mb,
+            default_memory_mb=config.agent_default_memory_mb,
+        ),
+        cold_start_concurrency=config.agent_cold_start_concurrency,
+        max_request_duration=config.agent_max_request_duration,
+        supervise_interval=config.agent_supervise_interval,
+    )
+    # Registered before the scheduler starts so the supervisor boots it in its first round, which waits for
+    # the images of permanent agents; pulls of the others start here and complete in the background
+    await _ensure_backbone_agent(registry)
+    await image_prefetcher.prefetch_registered(
+        registry,
+        extra_images=[t.image_name for t in get_template_agents()] + config.agent_warm_pool_images,
     )
     await agent_scheduler.start()
 
@@ -172,15 +278,30 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.channel_registry = channel_registry
     app.state.memory_manager = memory_manager
     app.state.agent_scheduler = agent_scheduler
-
-    await _ensure_backbone_agent(registry)
+    app.state.chat_job_store = chat_job_store
+    app.state.idempotency_store = idempotency_store
+    app.state.roster_cache = roster_cache
+    app.state.image_prefetcher = image_prefetcher
+    if config.agent_gateway_enabled:
+        app.state.gateway_client = create_gateway_client(
+            timeout=config.agent_gateway_timeout,
+            max_connections=config.agent_gateway_max_connections,
+            max_keepalive_connections=config.agent_gateway_max_keepalive,
+            keepalive_expiry=config.agent_gateway_keepalive_expiry,
+        )
 
     try:
         yield
     finally:
+        if config.agent_gateway_enabled:
+            await app.state.gateway_client.aclose()
+        await idempotency_store.close()
+        await chat_job_store.close()
         await agent_scheduler.stop()
+        await image_prefetcher.close()
+        await activity_history.close()
         await registry.close()
-        runtime_manager.close()
+        await runtime_manager.close()
         await skills_registry.close()
         await channel_registry.close()
         await memory_manager.close()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class _Call:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work; callers arriving while it is in
+    flight await the same result, and an exception is raised to every one of
+    them. A caller being cancelled only stops its own wait; the shared work is
+    cancelled once no callers are left waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Return whether work for the key is currently running."""
+        return key in self._calls
+
+    async def do[T](self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run ``factory`` for the key, or join the execution already in flight.
+
+        Args:
+            key: Key identifying the work.
+            factory: Callable starting the work; only invoked by the first caller.
+
+        Returns:
+            The result of the shared execution.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self._forget(key, call)
+
+    async def close(self) -> None:
+        """Cancel all work in flight."""
+        tasks = [call.task for call in self._calls.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
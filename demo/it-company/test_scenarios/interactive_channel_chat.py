@@ -15,6 +15,7 @@ import logging
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Self
+from uuid import uuid4
 
 import httpx
 
@@ -153,15 +154,19 @@ class ConversationHistory:
 class ChannelChatClient:
     """Client for channel chat API communication."""
 
-    def __init__(self, base_url: str = "http://localhost:8000/api/v1", timeout: float = 60.0) -> None:
+    def __init__(
+        self, base_url: str = "http://localhost:8000/api/v1", timeout: float = 60.0, max_retries: int = 2
+    ) -> None:
         """Initialize HTTP client.
 
         Args:
             base_url: Base URL for API
             timeout: Request timeout in seconds
+            max_retries: Number of times a timed-out chat request is retried
         """
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
+        self._max_retries = max_retries
         self._client: httpx.Client | None = None
 
     def __enter__(self) -> Self:
@@ -200,6 +205,10 @@ class ChannelChatClient:
     def send_chat(self, channel_id: str, message: str, agent_ids: list[str]) -> dict:
         """Send chat message to channel agents.
 
+        Timed-out requests are retried with the same Idempotency-Key, so a retry
+        attaches to the fan-out already running on the server instead of starting
+        a new one.
+
         Args:
             channel_id: Channel ID
             message: Message text (may include context)
@@ -217,10 +226,18 @@ class ChannelChatClient:
 
         url = f"{self._base_url}/channels/{channel_id}/chat"
         payload = {"message": message, "agent_ids": agent_ids}
+        headers = {"Idempotency-Key": str(uuid4())}
 
         logger.info("Sending chat to %d agents", len(agent_ids))
 
-        response = self._client.post(url, json=payload)
+        for attempt in range(self._max_retries + 1):
+            try:
+                response = self._client.post(url, json=payload, headers=headers)
+                break
+            except httpx.TimeoutException:
+                if attempt == self._max_retries:
+                    raise
+                logger.warning("Chat request timed out, retrying (%d/%d)", attempt + 1, self._max_retries)
         response.raise_for_status()
 
         return response.json()
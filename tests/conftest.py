@@ -0,0 +1,28 @@
+import httpx
+import pytest
+from app.runtime.agent_scheduler import AgentScheduler
+
+from tests.fakes import FakeRegistry
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def create_scheduler():
+    schedulers = []
+
+    async def create(runtime, *agents, **kwargs):
+        kwargs.setdefault("supervise_interval", 0)
+        scheduler = AgentScheduler(runtime, FakeRegistry(*agents), **kwargs)
+        # Every runtime answers readiness probes right away
+        await scheduler._http.aclose()
+        scheduler._http = httpx.AsyncClient(transport=httpx.MockTransport(lambda _request: httpx.Response(200)))
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield create
+    for scheduler in schedulers:
+        await scheduler.stop()
@@ -0,0 +1,146 @@
+"""In-memory stand-ins for the registry and runtime manager used by the scheduler."""
+
+import asyncio
+from collections.abc import Callable
+
+from app.broker.exceptions import AgentNotRegisteredError
+from app.models import Agent, AgentMode, AgentModel, AgentStatus, SpawnConfig
+from app.runtime.exceptions import AgentNotFoundError, AgentRuntimeError, AgentSpawnError
+from app.runtime.manager import RuntimeManager, parse_runtime_name, runtime_name
+from app.runtime.models import ManagedRuntime, SpawnAgentRequest
+
+
+async def eventually(predicate: Callable[[], bool]) -> None:
+    """Wait up to a second until background work makes ``predicate`` true."""
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition not met in time")
+
+
+def make_agent(agent_id: str = "agent-1", mode: AgentMode = AgentMode.SERVERLESS, **spawn_config) -> Agent:
+    return Agent(
+        id=agent_id,
+        name=agent_id,
+        description=f"Agent {agent_id}",
+        version="1",
+        url=f"http://agents/{agent_id}",
+        port=8000,
+        mode=mode,
+        spawn_config=SpawnConfig(image="agent:latest", model=AgentModel(), **spawn_config),
+    )
+
+
+class FakeRegistry:
+    def __init__(self, *agents: Agent) -> None:
+        self.agents = {agent.id: agent for agent in agents}
+
+    async def get_agent(self, agent_id: str) -> Agent:
+        if agent_id not in self.agents:
+            raise AgentNotRegisteredError(f"Agent {agent_id} not found")
+        return self.agents[agent_id]
+
+    async def list_agents(self, offset: int = 0, limit: int = 50) -> list[Agent]:
+        return list(self.agents.values())[offset : offset + limit]
+
+    async def update_agent(self, agent: Agent) -> None:
+        await self.get_agent(agent.id)
+        self.agents[agent.id] = agent
+
+
+class FakeRuntime(RuntimeManager):
+    """Runtime manager keeping runtime statuses in a dict.
+
+    Spawns and stops of the runtime names in ``failing_spawns`` and
+    ``failing_stops`` raise; set ``spawn_gate`` to hold every spawn until the
+    event is set, and ``pull_gate`` to hold image pulls. ``spawning`` is set
+    once a spawn has created its runtime.
+    """
+
+    def __init__(self) -> None:
+        self.runtimes: dict[str, AgentStatus] = {}
+        self.calls: list[tuple[str, str]] = []
+        self.spawn_gate: asyncio.Event | None = None
+        self.spawning = asyncio.Event()
+        self.pull_gate: asyncio.Event | None = None
+        self.failing_spawns: set[str] = set()
+        self.failing_stops: set[str] = set()
+        self._changed = asyncio.Condition()
+
+    async def spawn_agent(self, request: SpawnAgentRequest) -> Agent:
+        name = runtime_name(request.agent_id, request.replica)
+        self.calls.append(("spawn", name))
+        # The runtime exists as soon as it is created, before the spawn returns
+        self.runtimes[name] = AgentStatus.RUNNING
+        self.spawning.set()
+        if self.spawn_gate is not None:
+            await self.spawn_gate.wait()
+        if name in self.failing_spawns:
+            raise AgentSpawnError(f"Failed to spawn {name}")
+        return Agent(
+            id=request.agent_id,
+            name=request.name,
+            description=request.description,
+            version=request.version,
+            url=await self.get_agent_endpoint(name),
+            port=request.port,
+            status=AgentStatus.RUNNING,
+        )
+
+    async def pull_image(self, image: str) -> None:
+        self.calls.append(("pull", image))
+        if self.pull_gate is not None:
+            await self.pull_gate.wait()
+
+    async def stop_agent(self, agent_id: str) -> Agent:
+        self.calls.append(("stop", agent_id))
+        if agent_id in self.failing_stops:
+            raise AgentRuntimeError(f"Failed to stop {agent_id}")
+        if self.runtimes.pop(agent_id, None) is None:
+            raise AgentNotFoundError(f"Agent {agent_id} not found")
+        await self._notify()
+        return Agent(id=agent_id, name="", description="", version="", url="", port=0, status=AgentStatus.STOPPED)
+
+    async def pause_agent(self, agent_id: str) -> None:
+        self.calls.append(("pause", agent_id))
+        self.runtimes[agent_id] = AgentStatus.PAUSED
+
+    async def unpause_agent(self, agent_id: str) -> None:
+        self.calls.append(("unpause", agent_id))
+        self.runtimes[agent_id] = AgentStatus.RUNNING
+
+    async def get_agent_endpoint(self, agent_id: str) -> str:
+        return f"http://{agent_id}:8000"
+
+    async def list_agents(self) -> list[Agent]:
+        return []
+
+    async def list_runtimes(self) -> list[ManagedRuntime]:
+        return [
+            ManagedRuntime(name=name, agent_id=parse_runtime_name(name)[0], status=status)
+            for name, status in self.runtimes.items()
+        ]
+
+    async def get_agent_status(self, agent_id: str) -> AgentStatus:
+        if agent_id not in self.runtimes:
+            raise AgentNotFoundError(f"Agent {agent_id} not found")
+        return self.runtimes[agent_id]
+
+    async def exit(self, agent_id: str) -> None:
+        """Let a runtime exit on its own, as a crashed container would."""
+        self.runtimes[agent_id] = AgentStatus.STOPPED
+        await self._notify()
+
+    async def wait_for_exit(self, agent_id: str) -> None:
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self.runtimes.get(agent_id) in (None, AgentStatus.STOPPED, AgentStatus.ERROR)
+            )
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        return
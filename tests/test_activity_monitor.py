@@ -0,0 +1,51 @@
+from app.runtime.activity_monitor import AgentActivityMonitor
+
+
+def test_unreported_request_expires_after_max_duration():
+    monitor = AgentActivityMonitor(max_request_duration=0)
+    monitor.begin_request("agent-1")
+
+    assert monitor.in_flight("agent-1") == 0
+    assert monitor.total_in_flight() == 0
+
+
+def test_request_that_does_not_expire_counts_until_ended():
+    monitor = AgentActivityMonitor(max_request_duration=0)
+    token = monitor.begin_request("agent-1", expires=False)
+
+    assert monitor.in_flight("agent-1") == 1
+    assert monitor.end_request("agent-1", token)
+    assert monitor.in_flight("agent-1") == 0
+
+
+def test_earlier_deadline_is_kept_unless_replaced():
+    monitor = AgentActivityMonitor()
+
+    assert monitor.schedule("agent-1", 10.0)
+    assert not monitor.schedule("agent-1", 20.0)
+    assert monitor.next_due() == 10.0
+
+    monitor.schedule("agent-1", 20.0, replace=True)
+    assert monitor.next_due() == 20.0
+
+
+def test_due_agents_are_popped_in_deadline_order():
+    monitor = AgentActivityMonitor()
+    monitor.schedule("agent-2", 20.0)
+    monitor.schedule("agent-1", 10.0)
+    monitor.schedule("agent-3", 30.0)
+
+    assert monitor.pop_due(25.0) == ["agent-1", "agent-2"]
+    assert monitor.next_due() == 30.0
+
+
+def test_removed_agent_is_not_due():
+    monitor = AgentActivityMonitor()
+    monitor.schedule("agent-1", 10.0)
+    monitor.schedule("agent-2", 20.0)
+
+    monitor.remove("agent-1")
+
+    assert monitor.next_due() == 20.0
+    assert monitor.pop_due(30.0) == ["agent-2"]
+    assert monitor.next_due() is None
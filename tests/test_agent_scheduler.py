@@ -0,0 +1,288 @@
+import asyncio
+
+import httpx
+import pytest
+from app.models import AgentMode, AgentStatus
+from app.runtime import agent_scheduler
+from app.runtime.capacity import CapacityBudget
+from app.runtime.exceptions import AgentRuntimeError, AgentStartupError, CapacityExceededError
+from app.runtime.idle_timeout import IdleTimeoutPolicy
+from app.runtime.images import ImagePrefetcher
+from app.runtime.manager import runtime_name
+
+from tests.fakes import FakeRuntime, eventually, make_agent
+
+pytestmark = pytest.mark.anyio
+
+PRIMARY = runtime_name("agent-1")
+
+
+async def test_concurrent_requests_share_one_cold_start(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent())
+
+    results = await asyncio.gather(*(scheduler.ensure_running("agent-1") for _ in range(3)))
+
+    assert all(cold_start_ms is not None for _, cold_start_ms in results)
+    assert runtime.calls.count(("spawn", PRIMARY)) == 1
+    assert scheduler._monitor.last_activity("agent-1") is not None
+
+
+async def test_cold_start_cancelled_mid_spawn_removes_the_runtime(create_scheduler):
+    runtime = FakeRuntime()
+    runtime.spawn_gate = asyncio.Event()
+    scheduler = await create_scheduler(runtime, make_agent(), capacity=CapacityBudget(max_agents=1))
+
+    request = asyncio.create_task(scheduler.ensure_running("agent-1"))
+    await runtime.spawning.wait()
+    # The only waiter gives up, which cancels the shared cold start
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+
+    await eventually(lambda: PRIMARY not in runtime.runtimes)
+    assert not scheduler._capacity.holds("agent-1")
+    assert scheduler._monitor.last_activity("agent-1") is None
+
+
+async def test_cancelled_spawn_that_cannot_be_removed_is_left_to_the_reaper(create_scheduler):
+    runtime = FakeRuntime()
+    runtime.spawn_gate = asyncio.Event()
+    runtime.failing_stops.add(PRIMARY)
+    scheduler = await create_scheduler(runtime, make_agent())
+
+    request = asyncio.create_task(scheduler.ensure_running("agent-1"))
+    await runtime.spawning.wait()
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+
+    await eventually(lambda: ("stop", PRIMARY) in runtime.calls)
+    assert scheduler._capacity.holds("agent-1")
+    assert scheduler._monitor.last_activity("agent-1") is not None
+
+
+async def test_permanent_agent_boots_in_the_first_round_once_its_image_is_pulled(create_scheduler):
+    runtime = FakeRuntime()
+    runtime.pull_gate = asyncio.Event()
+    agent = make_agent(mode=AgentMode.PERMANENT)
+    images = ImagePrefetcher(runtime)
+    images.prefetch(agent.spawn_config.image)
+    scheduler = await create_scheduler(runtime, agent, image_prefetcher=images, supervise_interval=3600)
+
+    await scheduler.start()
+    await asyncio.sleep(0.05)
+    assert PRIMARY not in runtime.runtimes
+    runtime.pull_gate.set()
+
+    await eventually(lambda: PRIMARY in runtime.runtimes)
+    await images.close()
+
+
+async def test_cold_start_evicts_the_least_recently_used_agent(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(
+        runtime, make_agent("agent-1"), make_agent("agent-2"), capacity=CapacityBudget(max_agents=1)
+    )
+    await scheduler.ensure_running("agent-1")
+
+    await scheduler.ensure_running("agent-2")
+
+    assert PRIMARY not in runtime.runtimes
+    assert scheduler._capacity.agents() == ["agent-2"]
+
+
+async def test_agent_that_fails_to_stop_keeps_its_capacity(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(
+        runtime, make_agent("agent-1"), make_agent("agent-2"), capacity=CapacityBudget(max_agents=1)
+    )
+    await scheduler.ensure_running("agent-1")
+    runtime.failing_stops.add(PRIMARY)
+
+    with pytest.raises(CapacityExceededError):
+        await scheduler.ensure_running("agent-2")
+
+    assert PRIMARY in runtime.runtimes
+    assert scheduler._capacity.agents() == ["agent-1"]
+    assert runtime_name("agent-2") not in runtime.runtimes
+
+
+async def test_manual_stop_that_fails_keeps_the_capacity(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent())
+    await scheduler.ensure_running("agent-1")
+    runtime.failing_stops.add(PRIMARY)
+
+    with pytest.raises(AgentRuntimeError):
+        await scheduler.stop_agent("agent-1")
+
+    assert scheduler._capacity.holds("agent-1")
+
+
+async def test_failed_primary_replacement_releases_the_primary_reservation(create_scheduler, monkeypatch):
+    monkeypatch.setattr(agent_scheduler, "PRIMARY_RETRY_DELAY", 0.01)
+    runtime = FakeRuntime()
+    agent = make_agent()
+    scheduler = await create_scheduler(runtime, agent)
+    await scheduler.ensure_running("agent-1")
+    runtime.failing_spawns.add(PRIMARY)
+
+    await scheduler.update_agent(make_agent(instruction="Be brief."))
+    await eventually(lambda: "agent-1" not in scheduler._updating)
+
+    assert not scheduler._capacity.holds("agent-1")
+    assert not scheduler._capacity.holds(PRIMARY)
+
+
+async def test_updated_runtime_keeps_serving_when_the_primary_cannot_be_replaced(create_scheduler, monkeypatch):
+    monkeypatch.setattr(agent_scheduler, "PRIMARY_RETRY_DELAY", 0.01)
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent())
+    await scheduler.ensure_running("agent-1")
+    runtime.failing_spawns.add(PRIMARY)
+
+    await scheduler.update_agent(make_agent(instruction="Be brief."))
+    await eventually(lambda: "agent-1" not in scheduler._updating)
+
+    green = runtime_name("agent-1", 1)
+    assert runtime.calls.count(("spawn", PRIMARY)) == 1 + agent_scheduler.PRIMARY_START_ATTEMPTS
+    assert green in runtime.runtimes
+    async with scheduler.request_scope("agent-1") as url:
+        assert url == await runtime.get_agent_endpoint(green)
+
+    # Once stopped, the agent cold starts its primary again
+    await scheduler._stop_idle("agent-1")
+    await eventually(lambda: green not in runtime.runtimes)
+    runtime.failing_spawns.clear()
+    _, cold_start_ms = await scheduler.ensure_running("agent-1")
+    assert cold_start_ms is not None
+
+
+async def test_primary_replacement_is_retried(create_scheduler, monkeypatch):
+    monkeypatch.setattr(agent_scheduler, "PRIMARY_RETRY_DELAY", 0.01)
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent())
+    await scheduler.ensure_running("agent-1")
+    runtime.failing_spawns.add(PRIMARY)
+    spawns = runtime.calls.count(("spawn", PRIMARY))
+
+    await scheduler.update_agent(make_agent(instruction="Be brief."))
+    await eventually(lambda: runtime.calls.count(("spawn", PRIMARY)) > spawns)
+    runtime.failing_spawns.clear()
+    await eventually(lambda: "agent-1" not in scheduler._updating)
+
+    await eventually(lambda: runtime_name("agent-1", 1) not in runtime.runtimes)
+    assert PRIMARY in runtime.runtimes
+    assert scheduler._capacity.agents() == ["agent-1"]
+
+
+async def test_permanent_agent_moves_back_to_a_restarted_primary(create_scheduler, monkeypatch):
+    monkeypatch.setattr(agent_scheduler, "PRIMARY_RETRY_DELAY", 0.01)
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent(mode=AgentMode.PERMANENT))
+    await scheduler._boot_permanent(make_agent(mode=AgentMode.PERMANENT))
+    runtime.failing_spawns.add(PRIMARY)
+    updated = make_agent(mode=AgentMode.PERMANENT, instruction="Be brief.")
+    await scheduler.update_agent(updated)
+    await eventually(lambda: "agent-1" not in scheduler._updating)
+    assert PRIMARY not in runtime.runtimes
+
+    # As the supervisor does once it finds the primary missing
+    runtime.failing_spawns.clear()
+    await scheduler._boot_permanent(updated)
+
+    await eventually(lambda: runtime_name("agent-1", 1) not in runtime.runtimes)
+    async with scheduler.request_scope("agent-1", idle=False) as url:
+        assert url == await runtime.get_agent_endpoint(PRIMARY)
+
+
+async def test_cold_start_fails_when_the_readiness_probe_errors(create_scheduler):
+    def broken_probe(_request):
+        raise RuntimeError("unexpected probe failure")
+
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent())
+    await scheduler._http.aclose()
+    scheduler._http = httpx.AsyncClient(transport=httpx.MockTransport(broken_probe))
+
+    with pytest.raises(AgentStartupError):
+        await scheduler.ensure_running("agent-1")
+
+    assert PRIMARY not in runtime.runtimes
+    assert not scheduler._capacity.holds("agent-1")
+
+
+async def test_reconcile_keeps_exited_runtimes_of_registered_agents(create_scheduler):
+    runtime = FakeRuntime()
+    runtime.runtimes = {
+        PRIMARY: AgentStatus.STOPPED,
+        runtime_name("agent-1", 1): AgentStatus.STOPPED,
+        runtime_name("agent-2"): AgentStatus.STOPPED,
+        runtime_name("agent-3"): AgentStatus.RUNNING,
+    }
+    scheduler = await create_scheduler(runtime, make_agent("agent-1"), make_agent("agent-3"))
+
+    await scheduler.reconcile()
+
+    assert set(runtime.runtimes) == {PRIMARY, runtime_name("agent-3")}
+    assert scheduler._capacity.agents() == ["agent-3"]
+
+
+async def test_idle_agent_is_reaped(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(
+        runtime, make_agent(), idle_timeouts=IdleTimeoutPolicy(0.05), capacity=CapacityBudget(max_agents=1)
+    )
+    await scheduler.start()
+
+    await scheduler.ensure_running("agent-1")
+
+    await eventually(lambda: PRIMARY not in runtime.runtimes)
+    assert not scheduler._capacity.holds("agent-1")
+    assert scheduler._monitor.last_activity("agent-1") is None
+
+
+async def test_agent_is_not_reaped_while_a_request_is_in_flight(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(
+        runtime, make_agent(), idle_timeouts=IdleTimeoutPolicy(0.05), reaper_interval=0.02
+    )
+    await scheduler.start()
+    await scheduler.ensure_running("agent-1")
+
+    async with scheduler.request_scope("agent-1"):
+        await asyncio.sleep(0.2)
+        assert PRIMARY in runtime.runtimes
+
+    await eventually(lambda: PRIMARY not in runtime.runtimes)
+
+
+async def test_unreported_request_stops_holding_the_agent_after_the_maximum_duration(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(
+        runtime,
+        make_agent(),
+        idle_timeouts=IdleTimeoutPolicy(0.05),
+        reaper_interval=0.02,
+        max_request_duration=0.2,
+    )
+    await scheduler.start()
+    await scheduler.ensure_running("agent-1")
+
+    scheduler.begin_request("agent-1")
+
+    await asyncio.sleep(0.1)
+    assert PRIMARY in runtime.runtimes
+    await eventually(lambda: PRIMARY not in runtime.runtimes)
+
+
+async def test_repeated_activity_keeps_one_deadline_per_agent(create_scheduler):
+    runtime = FakeRuntime()
+    scheduler = await create_scheduler(runtime, make_agent(), idle_timeouts=IdleTimeoutPolicy(60))
+    await scheduler.ensure_running("agent-1")
+
+    for _ in range(100):
+        scheduler.record_activity("agent-1")
+
+    assert len(scheduler._monitor._deadlines) == 1
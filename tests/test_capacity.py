@@ -0,0 +1,40 @@
+from app.runtime.capacity import CapacityBudget
+
+
+def test_unlimited_budget_fits_everything():
+    capacity = CapacityBudget()
+    for i in range(100):
+        capacity.reserve(f"agent-{i}", 4096)
+
+    assert capacity.fits(4096)
+
+
+def test_agent_count_limit():
+    capacity = CapacityBudget(max_agents=2)
+    capacity.reserve("agent-1", 512)
+    assert capacity.fits(512)
+
+    capacity.reserve("agent-2", 512)
+    assert not capacity.fits(512)
+
+    capacity.release("agent-1")
+    assert capacity.fits(512)
+
+
+def test_memory_budget_accounts_agents_without_a_limit_at_the_default():
+    capacity = CapacityBudget(memory_budget_mb=1024, default_memory_mb=256)
+    capacity.reserve("agent-1", capacity.memory_of(None))
+    capacity.reserve("agent-2", capacity.memory_of(512))
+
+    assert capacity.reserved_mb == 768
+    assert capacity.fits(256)
+    assert not capacity.fits(257)
+
+
+def test_reserving_again_replaces_the_reservation():
+    capacity = CapacityBudget(memory_budget_mb=1024)
+    capacity.reserve("agent-1", 512)
+    capacity.reserve("agent-1", 768)
+
+    assert capacity.agents() == ["agent-1"]
+    assert capacity.reserved_mb == 768
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from app.chat.exceptions import ChatJobCapacityError, ChatJobNotFoundError
+from app.chat.jobs import ChatJobStore
+from app.chat.models import ChatJobStatus
+from pydantic import BaseModel
+
+pytestmark = pytest.mark.anyio
+
+
+class Reply(BaseModel):
+    text: str
+
+
+async def reply(text: str, delay: float = 0) -> Reply:
+    await asyncio.sleep(delay)
+    return Reply(text=text)
+
+
+async def test_wait_returns_the_finished_job():
+    store = ChatJobStore()
+    job = store.submit("channel-1", reply("hello"))
+
+    finished = await store.wait(job.id, wait_seconds=1)
+
+    assert finished.status == ChatJobStatus.SUCCEEDED
+    assert finished.result == {"text": "hello"}
+    await store.close()
+
+
+async def test_wait_times_out_on_a_running_job():
+    store = ChatJobStore()
+    job = store.submit("channel-1", reply("hello", delay=10))
+
+    pending = await store.wait(job.id, wait_seconds=0.01)
+
+    assert not pending.done
+    await store.close()
+
+
+async def test_failed_work_is_recorded_on_the_job():
+    async def fail() -> Reply:
+        raise RuntimeError("agent unreachable")
+
+    store = ChatJobStore()
+    job = store.submit("channel-1", fail())
+
+    failed = await store.wait(job.id, wait_seconds=1)
+
+    assert failed.status == ChatJobStatus.FAILED
+    assert failed.error == "agent unreachable"
+    await store.close()
+
+
+async def test_finished_jobs_expire_after_the_ttl():
+    store = ChatJobStore(ttl_seconds=0)
+    job = store.submit("channel-1", reply("hello"))
+    await store.wait(job.id, wait_seconds=1)
+
+    with pytest.raises(ChatJobNotFoundError):
+        store.get(job.id)
+
+
+async def test_full_store_evicts_finished_jobs_before_rejecting():
+    store = ChatJobStore(max_jobs=1)
+    finished = store.submit("channel-1", reply("hello"))
+    await store.wait(finished.id, wait_seconds=1)
+
+    running = store.submit("channel-1", reply("hello", delay=10))
+    await asyncio.sleep(0)
+    with pytest.raises(ChatJobCapacityError):
+        store.submit("channel-1", reply("hello"))
+
+    assert not store.get(running.id).done
+    with pytest.raises(ChatJobNotFoundError):
+        store.get(finished.id)
+    await store.close()
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+from app.routers.gateway import router
+from app.runtime.manager import runtime_name
+from fastapi import FastAPI
+
+from tests.fakes import FakeRegistry, FakeRuntime, eventually, make_agent
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def create_gateway(create_scheduler):
+    clients = []
+
+    async def create(handler):
+        agent = make_agent()
+        scheduler = await create_scheduler(FakeRuntime(), agent)
+        app = FastAPI()
+        app.include_router(router)
+        app.state.agent_scheduler = scheduler
+        app.state.registry = FakeRegistry(agent)
+        app.state.gateway_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
+        clients.extend([client, app.state.gateway_client])
+        return client, scheduler
+
+    yield create
+    for client in clients:
+        await client.aclose()
+
+
+async def test_request_is_forwarded_and_ended(create_gateway):
+    forwarded = []
+
+    def agent(request):
+        forwarded.append(request)
+        # The gateway relays the raw stream, so mocked agents answer with a stream rather than content
+        return httpx.Response(200, headers={"Connection": "close"}, stream=httpx.ByteStream(b"pong"))
+
+    client, scheduler = await create_gateway(agent)
+
+    response = await client.post("/agents/agent-1/ping?x=1", content=b"ping")
+
+    assert response.status_code == 200
+    assert response.content == b"pong"
+    assert "connection" not in response.headers
+    assert "cold-start;dur=" in response.headers["server-timing"]
+    assert str(forwarded[0].url) == f"http://{runtime_name('agent-1')}:8000/ping?x=1"
+    assert forwarded[0].content == b"ping"
+    await eventually(lambda: scheduler._monitor.total_in_flight() == 0)
+
+
+async def test_repeated_response_headers_are_kept(create_gateway):
+    def agent(_request):
+        return httpx.Response(200, headers=[("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")], stream=httpx.ByteStream(b""))
+
+    client, _ = await create_gateway(agent)
+
+    response = await client.get("/agents/agent-1/")
+
+    assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+
+
+async def test_unreachable_agent_returns_502_and_ends_the_request(create_gateway):
+    def agent(request):
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    client, scheduler = await create_gateway(agent)
+
+    response = await client.get("/agents/agent-1/")
+
+    assert response.status_code == 502
+    assert scheduler._monitor.total_in_flight() == 0
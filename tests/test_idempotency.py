@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from app.chat.exceptions import IdempotencyKeyConflictError
+from app.chat.idempotency import IdempotencyStore
+from pydantic import BaseModel
+
+pytestmark = pytest.mark.anyio
+
+
+class Reply(BaseModel):
+    text: str
+
+
+async def test_completed_result_is_replayed():
+    store = IdempotencyStore()
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        return Reply(text="hello")
+
+    first, first_replayed = await store.run("key", "fp", factory)
+    second, second_replayed = await store.run("key", "fp", factory)
+
+    assert (first_replayed, second_replayed) == (False, True)
+    assert second == first
+    assert calls == 1
+
+
+async def test_duplicate_joins_the_request_in_flight():
+    store = IdempotencyStore()
+    release = asyncio.Event()
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return Reply(text="hello")
+
+    first = asyncio.create_task(store.run("key", "fp", factory))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(store.run("key", "fp", factory))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert [replayed for _, replayed in await asyncio.gather(first, second)] == [False, True]
+    assert calls == 1
+
+
+async def test_key_reused_with_another_payload_conflicts():
+    store = IdempotencyStore()
+
+    async def factory():
+        return Reply(text="hello")
+
+    await store.run("key", "fp", factory)
+    with pytest.raises(IdempotencyKeyConflictError):
+        await store.run("key", "other", factory)
+
+
+async def test_failed_request_runs_again():
+    store = IdempotencyStore()
+    attempts = 0
+
+    async def factory():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("agent unreachable")
+        return Reply(text="hello")
+
+    with pytest.raises(RuntimeError):
+        await store.run("key", "fp", factory)
+    result, replayed = await store.run("key", "fp", factory)
+
+    assert result == Reply(text="hello")
+    assert not replayed
+
+
+async def test_results_expire_after_the_ttl():
+    store = IdempotencyStore(ttl_seconds=0)
+
+    async def factory():
+        return Reply(text="hello")
+
+    await store.run("key", "fp", factory)
+    _, replayed = await store.run("key", "fp", factory)
+
+    assert not replayed
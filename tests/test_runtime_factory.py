@@ -0,0 +1,15 @@
+from app.config import AgentRuntime, Config
+from app.runtime.factory import create_runtime_manager
+
+
+def test_local_runtime_uses_the_configured_image_commands():
+    config = Config(
+        agent_runtime=AgentRuntime.LOCAL,
+        agent_local_command=["python", "-m", "src.server"],
+        agent_local_image_commands={"custom-agent:latest": ["./run-agent"]},
+    )
+
+    manager = create_runtime_manager(config)
+
+    assert manager._command_for("custom-agent:latest") == ["./run-agent"]
+    assert manager._command_for("agent:latest") == ["python", "-m", "src.server"]
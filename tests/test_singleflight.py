@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from app.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "done"
+
+    waiters = [asyncio.create_task(flights.do("key", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert flights.in_flight("key")
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["done"] * 3
+    assert calls == 1
+    assert not flights.in_flight("key")
+
+
+async def test_exception_is_raised_to_every_waiter():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flights.do("key", work) for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelling_one_waiter_keeps_the_work_running():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flights.do("key", work))
+    second = asyncio.create_task(flights.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_cancelling_the_last_waiter_cancels_the_work():
+    flights = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flights.do("key", work))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert not flights.in_flight("key")
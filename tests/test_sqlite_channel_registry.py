@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from app.broker.sqlite_channel_registry import SqliteChannelRegistry
+from app.models import Channel
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def registry(tmp_path):
+    registry = await SqliteChannelRegistry.create(str(tmp_path / "channels.db"))
+    yield registry
+    await registry.close()
+
+
+class _GatedQuery:
+    """Wraps a query so that closing its cursor waits until the gate is opened."""
+
+    def __init__(self, query, reading: asyncio.Event, gate: asyncio.Event) -> None:
+        self._query = query
+        self._reading = reading
+        self._gate = gate
+
+    async def __aenter__(self):
+        return await self._query.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        self._reading.set()
+        await self._gate.wait()
+        return await self._query.__aexit__(*exc_info)
+
+
+def _gate_next_query(registry, monkeypatch):
+    reading, gate = asyncio.Event(), asyncio.Event()
+    execute = registry._db.execute
+
+    def execute_gated(sql, *args):
+        monkeypatch.setattr(registry._db, "execute", execute)
+        return _GatedQuery(execute(sql, *args), reading, gate)
+
+    monkeypatch.setattr(registry._db, "execute", execute_gated)
+    return reading, gate
+
+
+async def test_reads_are_served_from_the_cache(registry):
+    await registry.create_channel(Channel(id="channel-1", name="old", description="", owner_id="owner"))
+    await registry.update_channel("channel-1", {"name": "new"})
+
+    channel = await registry.get_channel("channel-1")
+
+    assert channel.name == "new"
+    channel.name = "changed by the caller"
+    assert (await registry.get_channel("channel-1")).name == "new"
+
+
+async def test_miss_racing_with_an_update_does_not_cache_the_stale_row(registry, monkeypatch):
+    await registry.create_channel(Channel(id="channel-1", name="old", description="", owner_id="owner"))
+    registry._cache.clear()
+    reading, gate = _gate_next_query(registry, monkeypatch)
+    read = asyncio.create_task(registry.get_channel("channel-1"))
+    await reading.wait()
+
+    await registry.update_channel("channel-1", {"name": "new"})
+    gate.set()
+
+    assert (await read).name == "old"
+    assert (await registry.get_channel("channel-1")).name == "new"
+
+
+async def test_miss_racing_with_a_delete_does_not_cache_the_deleted_channel(registry, monkeypatch):
+    await registry.create_channel(Channel(id="channel-1", name="old", description="", owner_id="owner"))
+    registry._cache.clear()
+    reading, gate = _gate_next_query(registry, monkeypatch)
+    read = asyncio.create_task(registry.get_channel("channel-1"))
+    await reading.wait()
+
+    await registry.delete_channel("channel-1")
+    gate.set()
+    await read
+
+    assert "channel-1" not in registry._cache
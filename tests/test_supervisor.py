@@ -0,0 +1,34 @@
+import pytest
+from app.models import AgentMode
+from app.runtime import supervisor
+from app.runtime.manager import runtime_name
+from app.runtime.models import SpawnAgentRequest
+from app.runtime.supervisor import PermanentAgentSupervisor
+
+from tests.fakes import FakeRegistry, FakeRuntime, eventually, make_agent
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_start_is_retried_after_its_backoff_not_the_interval(monkeypatch):
+    monkeypatch.setattr(supervisor, "INITIAL_BACKOFF", 0.05)
+    runtime = FakeRuntime()
+    attempts = 0
+
+    async def boot(agent):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("image not ready")
+        await runtime.spawn_agent(SpawnAgentRequest.from_agent(agent))
+
+    permanent = PermanentAgentSupervisor(
+        runtime, FakeRegistry(make_agent(mode=AgentMode.PERMANENT)), boot, interval=3600
+    )
+    permanent.start()
+    try:
+        await eventually(lambda: runtime_name("agent-1") in runtime.runtimes)
+    finally:
+        await permanent.stop()
+
+    assert attempts == 2
@@ -0,0 +1,109 @@
+import pytest
+from app.models import AgentStatus
+from app.runtime import warm_pool
+from app.runtime.exceptions import AgentSpawnError
+from app.runtime.warm_pool import MAX_BOOT_ATTEMPTS, WarmPool
+
+from tests.fakes import FakeRuntime, eventually
+
+pytestmark = pytest.mark.anyio
+
+IMAGE = "agent:latest"
+
+
+class StandbyRuntime(FakeRuntime):
+    """Fake runtime that boots standbys, failing the first ``failures`` boots."""
+
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__()
+        self.failures = failures
+        self.standbys = 0
+
+    async def create_standby(self, image: str) -> str | None:
+        self.calls.append(("create_standby", image))
+        if self.failures > 0:
+            self.failures -= 1
+            raise AgentSpawnError(f"Failed to boot a standby for {image}")
+        self.standbys += 1
+        standby_id = f"standby-{self.standbys}"
+        self.runtimes[standby_id] = AgentStatus.RUNNING
+        return standby_id
+
+
+@pytest.fixture
+async def create_pool():
+    pools = []
+
+    def create(runtime, size=1):
+        pool = WarmPool(runtime, size=size, images=[IMAGE])
+        pools.append(pool)
+        return pool
+
+    yield create
+    for pool in pools:
+        await pool.stop()
+
+
+async def test_claimed_standby_is_replaced(create_pool):
+    runtime = StandbyRuntime()
+    pool = create_pool(runtime)
+    pool.start()
+    await eventually(lambda: runtime.standbys == 1)
+
+    assert pool.claim(IMAGE) == "standby-1"
+    await eventually(lambda: runtime.standbys == 2)
+    assert pool.claim(IMAGE) == "standby-2"
+
+
+async def test_images_outside_the_pool_are_not_claimed(create_pool):
+    runtime = StandbyRuntime()
+    pool = create_pool(runtime)
+    pool.start()
+    await eventually(lambda: runtime.standbys == 1)
+
+    assert pool.claim("other:latest") is None
+    assert runtime.standbys == 1
+
+
+async def test_failed_standby_boot_is_retried(create_pool, monkeypatch):
+    monkeypatch.setattr(warm_pool, "BOOT_RETRY_DELAY", 0)
+    runtime = StandbyRuntime(failures=MAX_BOOT_ATTEMPTS - 1)
+    pool = create_pool(runtime)
+    pool.start()
+
+    await eventually(lambda: runtime.standbys == 1)
+    assert pool.claim(IMAGE) == "standby-1"
+
+
+async def test_standby_boot_gives_up_after_the_last_attempt(create_pool, monkeypatch):
+    monkeypatch.setattr(warm_pool, "BOOT_RETRY_DELAY", 0)
+    runtime = StandbyRuntime(failures=MAX_BOOT_ATTEMPTS)
+    pool = create_pool(runtime)
+    pool.start()
+
+    await eventually(lambda: not pool._tasks)
+    assert runtime.calls.count(("create_standby", IMAGE)) == MAX_BOOT_ATTEMPTS
+    assert pool.claim(IMAGE) is None
+
+
+async def test_pool_is_disabled_when_the_runtime_has_no_standbys(create_pool):
+    runtime = FakeRuntime()
+    pool = create_pool(runtime, size=2)
+    pool.start()
+    await eventually(lambda: not pool._tasks)
+
+    assert pool.claim(IMAGE) is None
+    # The claim does not start another boot
+    assert not pool._tasks
+
+
+async def test_stop_removes_unclaimed_standbys(create_pool):
+    runtime = StandbyRuntime()
+    pool = create_pool(runtime, size=2)
+    pool.start()
+    await eventually(lambda: runtime.standbys == 2)
+
+    claimed = pool.claim(IMAGE)
+    await pool.stop()
+
+    assert list(runtime.runtimes) == [claimed]